@@ -120,6 +120,5 @@ class AuthApplicationService:
         # user_cache_key = f"user:{user_id}"
         # await redis_service.delete(user_cache_key)
         
-        # 将令牌加入黑名单（暂时禁用）
-        # blacklist_key = f"blacklist:{token}"
-        # await redis_service.set(blacklist_key, "1", expire=1800)  # 30分钟过期
\ No newline at end of file
+        # 吊销令牌，直到过期前都不再通过验证
+        self.auth_service.revoke_token(token)
\ No newline at end of file
@@ -1,8 +1,10 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
-from app.domain.entities.models import Menu, RoleMenu
+from app.domain.menu.entities.menu import Menu
+from app.domain.role.entities.role import RoleMenu
 from app.presentation.schemas.menu import MenuCreate, MenuUpdate
 from typing import Optional, Tuple, List, Dict, Any
+from app.infrastructure.database.counting import paginate_with_total
 
 
 class MenuService:
@@ -23,9 +25,10 @@ class MenuService:
         page_size: int = 10,
         title: Optional[str] = None,
         name: Optional[str] = None,
-        menu_type: Optional[int] = None
-    ) -> Tuple[List[Menu], int]:
-        """获取分页菜单列表"""
+        menu_type: Optional[int] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Menu], Optional[int]]:
+        """获取分页菜单列表，total_mode 见 paginate_with_total"""
         query = self.db.query(Menu)
         
         # 添加过滤条件
@@ -36,14 +39,9 @@ class MenuService:
         if menu_type is not None:
             query = query.filter(Menu.menu_type == menu_type)
         
-        # 获取总数
-        total = query.count()
-        
-        # 分页
-        offset = (page - 1) * page_size
-        menus = query.order_by(Menu.rank.asc(), Menu.id.asc()).offset(offset).limit(page_size).all()
-        
-        return menus, total
+        # 分页并获取总数
+        query = query.order_by(Menu.rank.asc(), Menu.id.asc())
+        return paginate_with_total(query, page, page_size, total_mode)
 
     def get_all_menus(self) -> List[Menu]:
         """获取所有菜单"""
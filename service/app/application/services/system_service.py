@@ -1,11 +1,21 @@
 from sqlalchemy.orm import Session
-from app.domain.entities.models import User, Role, Menu, Department, UserRole, RoleMenu
+from app.domain.user.entities.user import User, UserRole
+from app.domain.role.entities.role import Role, RoleMenu
+from app.domain.menu.entities.menu import Menu
+from app.domain.organization.entities.department import Department
 from app.domain.audit.entities.log import LoginLog, OperationLog, SystemLog
 from app.domain.entities.online_user import OnlineUser
 from app.infrastructure.utils.auth import AuthService
+from app.infrastructure.database.counting import paginate_with_total
+from app.infrastructure.database.keyset import KeysetPage, SortKey, paginate_query
 from typing import Optional, Tuple, List
 import datetime
 
+# 日志表的游标分页排序键（对应 (created_time, id) 复合索引）
+LOGIN_LOG_SORT = SortKey([LoginLog.created_time, LoginLog.id])
+OPERATION_LOG_SORT = SortKey([OperationLog.created_time, OperationLog.id])
+SYSTEM_LOG_SORT = SortKey([SystemLog.created_time, SystemLog.id])
+
 
 class SystemService:
     def __init__(self, db: Session):
@@ -77,35 +87,38 @@ class SystemService:
         
         return online_users, total
 
-    def get_login_logs(self, page: int = 1, page_size: int = 10) -> Tuple[List[LoginLog], int]:
-        """获取登录日志列表"""
-        query = self.db.query(LoginLog).order_by(LoginLog.login_time.desc())
-        total = query.count()
-        
-        offset = (page - 1) * page_size
-        logs = query.offset(offset).limit(page_size).all()
-        
-        return logs, total
-
-    def get_operation_logs(self, page: int = 1, page_size: int = 10) -> Tuple[List[OperationLog], int]:
-        """获取操作日志列表"""
-        query = self.db.query(OperationLog).order_by(OperationLog.operate_time.desc())
-        total = query.count()
-        
-        offset = (page - 1) * page_size
-        logs = query.offset(offset).limit(page_size).all()
-        
-        return logs, total
-
-    def get_system_logs(self, page: int = 1, page_size: int = 10) -> Tuple[List[SystemLog], int]:
-        """获取系统日志列表"""
-        query = self.db.query(SystemLog).order_by(SystemLog.created_at.desc())
-        total = query.count()
-        
-        offset = (page - 1) * page_size
-        logs = query.offset(offset).limit(page_size).all()
-        
-        return logs, total
+    def get_login_logs(
+        self, page: int = 1, page_size: int = 10, total_mode: str = "exact"
+    ) -> Tuple[List[LoginLog], Optional[int]]:
+        """获取登录日志列表，total_mode 见 paginate_with_total"""
+        query = self.db.query(LoginLog).order_by(LoginLog.created_time.desc(), LoginLog.id.desc())
+        return paginate_with_total(query, page, page_size, total_mode)
+
+    def get_operation_logs(
+        self, page: int = 1, page_size: int = 10, total_mode: str = "exact"
+    ) -> Tuple[List[OperationLog], Optional[int]]:
+        """获取操作日志列表，total_mode 见 paginate_with_total"""
+        query = self.db.query(OperationLog).order_by(OperationLog.created_time.desc(), OperationLog.id.desc())
+        return paginate_with_total(query, page, page_size, total_mode)
+
+    def get_system_logs(
+        self, page: int = 1, page_size: int = 10, total_mode: str = "exact"
+    ) -> Tuple[List[SystemLog], Optional[int]]:
+        """获取系统日志列表，total_mode 见 paginate_with_total"""
+        query = self.db.query(SystemLog).order_by(SystemLog.created_time.desc(), SystemLog.id.desc())
+        return paginate_with_total(query, page, page_size, total_mode)
+
+    def get_login_logs_page(self, cursor: Optional[str] = None, page_size: int = 10) -> KeysetPage:
+        """按游标获取登录日志，最新的在前"""
+        return paginate_query(self.db.query(LoginLog), LOGIN_LOG_SORT, page_size, cursor)
+
+    def get_operation_logs_page(self, cursor: Optional[str] = None, page_size: int = 10) -> KeysetPage:
+        """按游标获取操作日志，最新的在前"""
+        return paginate_query(self.db.query(OperationLog), OPERATION_LOG_SORT, page_size, cursor)
+
+    def get_system_logs_page(self, cursor: Optional[str] = None, page_size: int = 10) -> KeysetPage:
+        """按游标获取系统日志，最新的在前"""
+        return paginate_query(self.db.query(SystemLog), SYSTEM_LOG_SORT, page_size, cursor)
 
     def get_system_log_detail(self, log_id: int) -> Optional[SystemLog]:
         """获取系统日志详情"""
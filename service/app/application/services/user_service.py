@@ -1,10 +1,12 @@
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 import uuid
 from datetime import datetime
 
 from app.domain.models.user import User
 from app.domain.repositories.user_repository import UserRepository
 from app.application.dto.user_dto import UserCreate, UserUpdate
+from loguru import logger
+
 from shared.kernel.exceptions import BusinessException
 from app.infrastructure.auth.password_handler import PasswordHandler
 
@@ -76,14 +78,41 @@ class UserService:
         """根据用户名查找用户"""
         return await self.user_repo.find_by_username(username)
 
-    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
-        """用户认证"""
-        user = await self.user_repo.find_by_username(username)
-        if not user or not user.is_active:
+    async def authenticate_user(
+        self,
+        username: str,
+        password: str,
+        defer: Optional[Callable[..., Any]] = None
+    ) -> Optional[User]:
+        """用户认证
+
+        defer 用于把重新哈希移出登录响应（如 BackgroundTasks.add_task），未传入时在认证内完成。
+        """
+        # 用户、密码哈希、角色与权限由一次查询加载
+        found = await self.user_repo.find_for_login(username)
+        if not found:
+            return None
+        user, hashed_password = found
+        if not user.is_active or not hashed_password:
             return None
         
-        # 密码验证逻辑需要在这里实现
-        # if not self.password_handler.verify_password(password, user.hashed_password):
-        #     return None
+        # 在哈希工作池中校验密码，避免阻塞事件循环
+        if not await self.password_handler.verify_password_async(password, hashed_password):
+            return None
         
-        return user
\ No newline at end of file
+        # 已存哈希成本与当前目标不一致时透明地重新哈希
+        if self.password_handler.needs_rehash(hashed_password):
+            if defer is not None:
+                defer(self._rehash_password, user.id, password)
+            else:
+                await self._rehash_password(user.id, password)
+        
+        return user
+
+    async def _rehash_password(self, user_id: str, password: str) -> None:
+        """按当前 bcrypt 成本重新计算并保存密码哈希，失败不影响登录"""
+        try:
+            new_hash = await self.password_handler.hash_password_async(password)
+            await self.user_repo.update_password(user_id, new_hash)
+        except Exception as e:
+            logger.warning(f"用户 {user_id} 密码重新哈希失败: {e}")
\ No newline at end of file
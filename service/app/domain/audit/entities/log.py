@@ -1,7 +1,7 @@
 """
 日志审计领域实体
 """
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, BigInteger, SmallInteger
+from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, BigInteger, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.infrastructure.database.database import Base
@@ -11,6 +11,7 @@ from sqlalchemy.dialects.mysql import JSON
 class LoginLog(Base):
     """登录日志实体"""
     __tablename__ = "system_userloginlog"
+    __table_args__ = (Index("idx_userloginlog_created_time_id", "created_time", "id"),)
 
     id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
     created_time = Column(DateTime(timezone=True), nullable=False, comment="创建时间")
@@ -27,7 +28,7 @@ class LoginLog(Base):
     modifier_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=True, comment="修改者ID")
 
     # 关系
-    user = relationship("User", back_populates="login_logs")
+    user = relationship("User", foreign_keys=[creator_id], back_populates="login_logs", overlaps="creator")
     creator = relationship("User", foreign_keys=[creator_id], remote_side="User.id")
     modifier = relationship("User", foreign_keys=[modifier_id], remote_side="User.id")
 
@@ -35,6 +36,7 @@ class LoginLog(Base):
 class OperationLog(Base):
     """操作日志实体"""
     __tablename__ = "system_operationlog"
+    __table_args__ = (Index("idx_operationlog_created_time_id", "created_time", "id"),)
 
     id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
     created_time = Column(DateTime(timezone=True), nullable=False, comment="创建时间")
@@ -55,7 +57,7 @@ class OperationLog(Base):
     modifier_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=True, comment="修改者ID")
 
     # 关系
-    user = relationship("User", back_populates="operation_logs")
+    user = relationship("User", foreign_keys=[creator_id], back_populates="operation_logs", overlaps="creator")
     creator = relationship("User", foreign_keys=[creator_id], remote_side="User.id")
     modifier = relationship("User", foreign_keys=[modifier_id], remote_side="User.id")
 
@@ -87,7 +89,7 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, comment="用户ID")
+    user_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=True, comment="用户ID")
     username = Column(String(50), nullable=True, comment="用户名")
     event_type = Column(String(50), nullable=False, comment="事件类型")
     resource_type = Column(String(50), nullable=False, comment="资源类型")
@@ -120,13 +122,13 @@ class SecurityEvent(Base):
     description = Column(Text, nullable=True, comment="事件描述")
     source_ip = Column(String(45), nullable=True, comment="来源IP")
     target_ip = Column(String(45), nullable=True, comment="目标IP")
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, comment="相关用户ID")
+    user_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=True, comment="相关用户ID")
     username = Column(String(50), nullable=True, comment="用户名")
     affected_resource = Column(String(255), nullable=True, comment="受影响资源")
     attack_vector = Column(String(100), nullable=True, comment="攻击向量")
     detection_method = Column(String(100), nullable=True, comment="检测方法")
     status = Column(String(20), default="new", comment="处理状态 new|investigating|resolved|false_positive")
-    handled_by = Column(Integer, ForeignKey("users.id"), nullable=True, comment="处理人")
+    handled_by = Column(String(32), ForeignKey("system_userinfo.id"), nullable=True, comment="处理人")
     handled_at = Column(DateTime(timezone=True), nullable=True, comment="处理时间")
     resolution = Column(Text, nullable=True, comment="处理结果")
     raw_data = Column(JSON, nullable=True, comment="原始数据")
@@ -12,7 +12,7 @@ class OnlineUser(Base):
     __tablename__ = "online_users"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, comment="用户ID")
+    user_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=False, comment="用户ID")
     username = Column(String(50), nullable=False, comment="用户名")
     nickname = Column(String(50), nullable=False, comment="昵称")
     token = Column(String(255), nullable=False, unique=True, comment="访问令牌")
@@ -1,5 +1,5 @@
 """菜单领域实体"""
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, SmallInteger
+from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.infrastructure.database.database import Base
@@ -9,6 +9,10 @@ from sqlalchemy.dialects.mysql import JSON
 class Menu(Base):
     """菜单实体"""
     __tablename__ = "system_menu"
+    __table_args__ = (
+        Index("idx_menu_rank_id", "rank", "id"),
+        Index("idx_menu_parent_id", "parent_id"),
+    )
 
     id = Column(String(32), primary_key=True, comment="菜单ID")
     created_time = Column(DateTime(timezone=True), nullable=False, comment="创建时间")
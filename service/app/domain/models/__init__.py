@@ -5,6 +5,14 @@ from app.domain.models.role import Role, DataPermission, FieldPermission
 from app.domain.models.dept import Department
 from app.domain.models.menu import Menu
 
+# 解析领域模型之间的前向引用
+Role.model_rebuild(_types_namespace={
+    "Menu": Menu,
+    "DataPermission": DataPermission,
+    "FieldPermission": FieldPermission,
+})
+User.model_rebuild(_types_namespace={"Role": Role})
+
 __all__ = [
     "User",
     "Role", 
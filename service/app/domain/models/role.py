@@ -8,6 +8,7 @@ class Role(BaseModel):
     """角色领域模型"""
     id: str
     name: str
+    code: str = ""
     description: str
     is_active: bool
     menus: List['Menu'] = []
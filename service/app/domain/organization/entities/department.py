@@ -1,6 +1,6 @@
 """
 部门/组织架构领域实体"""
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, SmallInteger
+from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.infrastructure.database.database import Base
@@ -10,6 +10,7 @@ from sqlalchemy.dialects.mysql import JSON
 class Department(Base):
     """部门实体"""
     __tablename__ = "system_deptinfo"
+    __table_args__ = (Index("idx_deptinfo_parent_id", "parent_id"),)
 
     mode_type = Column(SmallInteger, nullable=False, comment="模式类型")
     id = Column(String(32), primary_key=True, comment="部门ID")
@@ -30,6 +31,7 @@ class Department(Base):
     parent = relationship("Department", foreign_keys=[parent_id], remote_side=[id], back_populates="children")
     children = relationship("Department", foreign_keys=[parent_id], back_populates="parent")
     users = relationship("User", foreign_keys="User.dept_id", back_populates="dept")
+    positions = relationship("Position", back_populates="department")
     creator = relationship("User", foreign_keys=[creator_id], remote_side="User.id")
     modifier = relationship("User", foreign_keys=[modifier_id], remote_side="User.id")
 
@@ -41,7 +43,7 @@ class Position(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, comment="职位名称")
     code = Column(String(50), unique=True, nullable=False, comment="职位编码")
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False, comment="所属部门ID")
+    department_id = Column(String(32), ForeignKey("system_deptinfo.id"), nullable=False, comment="所属部门ID")
     level = Column(Integer, default=1, comment="职位级别")
     category = Column(String(50), nullable=True, comment="职位类别")
     description = Column(Text, nullable=True, comment="职位描述")
@@ -66,7 +68,7 @@ class UserPosition(Base):
     __tablename__ = "user_positions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, comment="用户ID")
+    user_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=False, comment="用户ID")
     position_id = Column(Integer, ForeignKey("positions.id"), nullable=False, comment="职位ID")
     is_primary = Column(Boolean, default=True, comment="是否主要职位")
     start_date = Column(DateTime, nullable=True, comment="开始日期")
@@ -84,11 +86,11 @@ class DepartmentHistory(Base):
     __tablename__ = "department_histories"
 
     id = Column(Integer, primary_key=True, index=True)
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False, comment="部门ID")
+    department_id = Column(String(32), ForeignKey("system_deptinfo.id"), nullable=False, comment="部门ID")
     operation_type = Column(String(20), nullable=False, comment="操作类型 create|update|delete|move")
     old_value = Column(JSON, nullable=True, comment="变更前的值")
     new_value = Column(JSON, nullable=True, comment="变更后的值")
-    operator_id = Column(Integer, ForeignKey("users.id"), nullable=False, comment="操作人ID")
+    operator_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=False, comment="操作人ID")
     reason = Column(String(255), nullable=True, comment="变更原因")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
 
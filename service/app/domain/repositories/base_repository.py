@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List, Dict, Any
+from typing import Generic, TypeVar, Optional, List, Dict, Any, Sequence, Union, AsyncIterator
 from uuid import UUID
 
 T = TypeVar('T')
@@ -23,8 +23,33 @@ class BaseRepository(Generic[T], ABC):
         pass
     
     @abstractmethod
-    async def filter_by(self, **kwargs) -> List[T]:
-        """根据条件过滤实体"""
+    async def filter_by(
+        self,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        **kwargs
+    ) -> List[T]:
+        """根据条件过滤实体
+
+        条件写法为 字段名__操作符=值（eq/ne/in/gt/gte/lt/lte/isnull/startswith/iexact/like），
+        order_by 为字段名列表，-字段 表示倒序；无索引可用的条件按 DATABASE_FILTER_UNINDEXED 处理
+        """
+        pass
+    
+    @abstractmethod
+    def iter_all(self, batch_size: Optional[int] = None) -> AsyncIterator[T]:
+        """流式遍历所有实体"""
+        pass
+    
+    @abstractmethod
+    def iter_filter(
+        self,
+        batch_size: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        **kwargs
+    ) -> AsyncIterator[T]:
+        """流式遍历符合条件的实体，条件写法同 filter_by"""
         pass
     
     @abstractmethod
@@ -40,4 +65,24 @@ class BaseRepository(Generic[T], ABC):
     @abstractmethod
     async def count(self) -> int:
         """统计数量"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    async def bulk_create(self, entities: Sequence[Union[T, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """批量创建实体，返回创建数量"""
+        pass
+    
+    @abstractmethod
+    async def bulk_update(self, rows: Sequence[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量更新（每行包含 id 与要更新的字段），返回更新数量"""
+        pass
+    
+    @abstractmethod
+    async def bulk_delete(self, ids: Sequence[str], chunk_size: Optional[int] = None) -> int:
+        """批量删除实体，返回删除数量"""
+        pass
+    
+    @abstractmethod
+    async def bulk_upsert(self, entities: Sequence[Union[T, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量插入或更新，返回写入数量"""
+        pass
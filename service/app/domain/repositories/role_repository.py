@@ -6,6 +6,14 @@ from app.domain.models.role import Role
 class RoleRepository(BaseRepository[Role], ABC):
     """角色仓储接口"""
     
+    @abstractmethod
+    async def get_by_id(self, id: str, hydration: str = "summary") -> Optional[Role]:
+        """根据ID获取角色
+
+        hydration 为 summary 时不加载关联，为 full 时加载菜单与数据/字段权限
+        """
+        pass
+    
     @abstractmethod
     async def find_by_name(self, name: str) -> Optional[Role]:
         """根据角色名查找角色"""
@@ -1,11 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from app.domain.repositories.base_repository import BaseRepository
 from app.domain.models.user import User
 
 class UserRepository(BaseRepository[User], ABC):
     """用户仓储接口"""
     
+    @abstractmethod
+    async def get_by_id(self, id: str, hydration: str = "summary") -> Optional[User]:
+        """根据ID获取用户
+
+        hydration 为 summary 时只加载角色，为 full 时同时加载角色的菜单与数据/字段权限
+        """
+        pass
+    
     @abstractmethod
     async def find_by_username(self, username: str) -> Optional[User]:
         """根据用户名查找用户"""
@@ -26,6 +34,21 @@ class UserRepository(BaseRepository[User], ABC):
         """查找活跃用户"""
         pass
     
+    @abstractmethod
+    async def find_for_login(self, username: str) -> Optional[Tuple[User, str]]:
+        """加载登录所需的用户（含角色与菜单权限）及密码哈希"""
+        pass
+    
+    @abstractmethod
+    async def get_password_hash(self, user_id: str) -> Optional[str]:
+        """获取用户密码哈希"""
+        pass
+    
+    @abstractmethod
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        """更新用户密码哈希"""
+        pass
+    
     @abstractmethod
     async def update_last_login(self, user_id: str) -> bool:
         """更新最后登录时间"""
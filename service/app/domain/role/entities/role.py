@@ -1,7 +1,7 @@
 """
 角色领域实体
 """
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, SmallInteger
+from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, SmallInteger, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.infrastructure.database.database import Base
@@ -25,6 +25,8 @@ class Role(Base):
     # 关系
     users = relationship("UserRole", back_populates="role")
     menus = relationship("RoleMenu", back_populates="role")
+    role_permissions = relationship("RolePermission", back_populates="role")
+    data_scopes = relationship("DataScope", back_populates="role")
     creator = relationship("User", foreign_keys=[creator_id], remote_side="User.id")
     modifier = relationship("User", foreign_keys=[modifier_id], remote_side="User.id")
 
@@ -32,6 +34,10 @@ class Role(Base):
 class RoleMenu(Base):
     """角色菜单关联表"""
     __tablename__ = "system_userrole_menu"
+    __table_args__ = (
+        Index("idx_userrole_menu_userrole_id_menu_id", "userrole_id", "menu_id", unique=True),
+        Index("idx_userrole_menu_menu_id", "menu_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     userrole_id = Column(String(32), ForeignKey("system_userrole.id"), nullable=False, comment="角色ID")
@@ -47,8 +53,8 @@ class RoleInheritance(Base):
     __tablename__ = "role_inheritances"
 
     id = Column(Integer, primary_key=True, index=True)
-    parent_role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, comment="父角色ID")
-    child_role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, comment="子角色ID")
+    parent_role_id = Column(String(32), ForeignKey("system_userrole.id"), nullable=False, comment="父角色ID")
+    child_role_id = Column(String(32), ForeignKey("system_userrole.id"), nullable=False, comment="子角色ID")
     inherit_type = Column(String(20), default="full", comment="继承类型 full|partial")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
 
@@ -81,7 +87,7 @@ class RolePermission(Base):
     __tablename__ = "role_permissions"
 
     id = Column(Integer, primary_key=True, index=True)
-    role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, comment="角色ID")
+    role_id = Column(String(32), ForeignKey("system_userrole.id"), nullable=False, comment="角色ID")
     permission_id = Column(Integer, ForeignKey("permissions.id"), nullable=False, comment="权限ID")
     granted = Column(Boolean, default=True, comment="是否授权")
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
@@ -117,7 +123,7 @@ class DataScope(Base):
     __tablename__ = "data_scopes"
 
     id = Column(Integer, primary_key=True, index=True)
-    role_id = Column(Integer, ForeignKey("roles.id"), nullable=False, comment="角色ID")
+    role_id = Column(String(32), ForeignKey("system_userrole.id"), nullable=False, comment="角色ID")
     scope_type = Column(String(50), nullable=False, comment="数据范围类型 all|custom|dept|dept_and_child|self")
     scope_value = Column(Text, nullable=True, comment="范围值，JSON格式")
     resource_type = Column(String(50), nullable=False, comment="资源类型")
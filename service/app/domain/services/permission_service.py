@@ -20,20 +20,16 @@ class PermissionService:
         self.menu_repo = menu_repo
     
     async def get_user_menus(self, user_id: str) -> List[Menu]:
-        """获取用户可访问的菜单"""
-        user = await self.user_repo.get_by_id(user_id)
+        """获取用户可访问的菜单（角色与菜单随用户一次加载）"""
+        user = await self.user_repo.get_by_id(user_id, hydration="full")
         if not user:
             return []
         
-        all_menus = []
-        for role in user.roles:
-            role_menus = await self.menu_repo.find_by_role_id(role.id)
-            all_menus.extend(role_menus)
-        
         # 去重
         unique_menus = {}
-        for menu in all_menus:
-            unique_menus[menu.id] = menu
+        for role in user.roles:
+            for menu in role.menus:
+                unique_menus[menu.id] = menu
         
         return list(unique_menus.values())
     
@@ -1,7 +1,7 @@
 """
 用户领域实体
 """
-from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Boolean, Text, ForeignKey, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.infrastructure.database.database import Base
@@ -14,6 +14,10 @@ if TYPE_CHECKING:
 class User(Base):
     """用户实体"""
     __tablename__ = "system_userinfo"
+    __table_args__ = (
+        Index("idx_userinfo_dept_id", "dept_id"),
+        Index("idx_userinfo_created_time_id", "created_time", "id"),
+    )
 
     id = Column(String(32), primary_key=True, comment="用户ID")
     password = Column(String(128), nullable=False, comment="密码")
@@ -44,13 +48,18 @@ class User(Base):
     roles = relationship("UserRole", back_populates="user")
     creator = relationship("User", foreign_keys=[creator_id], remote_side=[id])
     modifier = relationship("User", foreign_keys=[modifier_id], remote_side=[id])
-    login_logs = relationship("LoginLog", back_populates="user")
-    operation_logs = relationship("OperationLog", back_populates="user")
+    login_logs = relationship("LoginLog", foreign_keys="LoginLog.creator_id", back_populates="user", overlaps="creator")
+    operation_logs = relationship("OperationLog", foreign_keys="OperationLog.creator_id", back_populates="user", overlaps="creator")
+    sessions = relationship("UserSession", back_populates="user")
 
 
 class UserRole(Base):
     """用户角色关联表"""
     __tablename__ = "system_userinfo_roles"
+    __table_args__ = (
+        Index("idx_userinfo_roles_userinfo_id_userrole_id", "userinfo_id", "userrole_id", unique=True),
+        Index("idx_userinfo_roles_userrole_id", "userrole_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     userinfo_id = Column(String(32), ForeignKey("system_userinfo.id"), nullable=False, comment="用户ID")
@@ -0,0 +1 @@
+"""审计模块"""
\ No newline at end of file
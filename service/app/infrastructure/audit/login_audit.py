@@ -0,0 +1,203 @@
+"""
+登录审计后台写入
+登录日志与最后登录时间不在登录请求的关键路径上写库，
+由后台任务按批次合并写入，登录接口在密码校验通过后即可返回
+"""
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import bindparam, select, update
+
+from app.infrastructure.database.write_queue import run_write
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo, UserLoginLog
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+# 浏览器与操作系统的识别顺序（先匹配更具体的标识）
+_BROWSERS = (("Edg", "Edge"), ("OPR", "Opera"), ("Firefox", "Firefox"), ("Chrome", "Chrome"), ("Safari", "Safari"))
+_SYSTEMS = (("Windows", "Windows"), ("Android", "Android"), ("iPhone", "iOS"), ("iPad", "iOS"), ("Mac OS", "macOS"), ("Linux", "Linux"))
+
+
+def parse_user_agent(agent: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """从 User-Agent 中粗略识别浏览器与操作系统"""
+    if not agent:
+        return None, None
+    browser = next((name for token, name in _BROWSERS if token in agent), None)
+    system = next((name for token, name in _SYSTEMS if token in agent), None)
+    return browser, system
+
+
+@dataclass
+class LoginAuditRecord:
+    """一次登录的审计记录
+
+    登录失败时 user_id 可为空，写入时按 username 查出对应用户（用户不存在时日志不关联用户）。
+    """
+    user_id: Optional[str]
+    username: str
+    nickname: str = ""
+    ip: Optional[str] = None
+    agent: Optional[str] = None
+    status: bool = True
+    login_type: int = 0
+    login_time: datetime = field(default_factory=datetime.now)
+
+
+class LoginAuditWriter:
+    """登录审计后台写入器
+
+    - submit 只做内存入队，不访问数据库
+    - 后台任务凑满 batch_size 或等待 flush_interval 后在一个事务内写入整批记录
+    - 同一批次内同一用户只按最后一次登录更新最后登录时间
+    - 失败记录（status=False）只写登录日志，缺少用户ID的记录按用户名一次查出
+    - 队列达到 max_queue 时丢弃新记录并计数，避免拖垮登录接口
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000
+    ):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self._queue: Deque[LoginAuditRecord] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def session_factory(self) -> Callable[[], Any]:
+        """懒加载会话工厂，避免导入时创建引擎"""
+        if self._session_factory is None:
+            from app.infrastructure.persistence.sqlalchemy.database import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    def submit(self, record: LoginAuditRecord) -> bool:
+        """提交审计记录，队列已满时返回 False"""
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return False
+        self._queue.append(record)
+        self.submitted += 1
+        if self._wakeup is not None and len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        """启动后台写入任务"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台写入任务并写完剩余记录"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """写入队列中的全部记录，返回写入条数"""
+        total = 0
+        while self._queue:
+            batch: List[LoginAuditRecord] = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"登录审计记录写入失败（{len(batch)} 条）: {e}")
+                continue
+            self.batches += 1
+            self.written += len(batch)
+            total += len(batch)
+        return total
+
+    async def _write(self, batch: List[LoginAuditRecord]) -> None:
+        """在一个事务内写入一批登录日志与最后登录时间"""
+        latest: Dict[str, LoginAuditRecord] = {}
+        unresolved = {record.username for record in batch if record.user_id is None and record.username}
+        for record in batch:
+            if record.status and record.user_id is not None:
+                latest[record.user_id] = record
+
+        def unit(session):
+            user_ids: Dict[str, Any] = {}
+            if unresolved:
+                user_ids = dict(session.execute(
+                    select(UserInfo.username, UserInfo.id).where(UserInfo.username.in_(unresolved))
+                ).all())
+            logs = []
+            for record in batch:
+                browser, system = parse_user_agent(record.agent)
+                user_id = record.user_id if record.user_id is not None else user_ids.get(record.username)
+                logs.append(UserLoginLog(
+                    status=record.status,
+                    ipaddress=record.ip,
+                    browser=browser,
+                    system=system,
+                    agent=(record.agent or "")[:128] or None,
+                    login_type=record.login_type,
+                    creator_id=int(user_id) if user_id is not None else None,
+                    created_time=record.login_time,
+                    updated_time=record.login_time
+                ))
+            session.add_all(logs)
+            if latest:
+                session.execute(
+                    update(UserInfo.__table__)
+                    .where(UserInfo.__table__.c.id == bindparam("b_id"))
+                    .values(last_login=bindparam("b_time")),
+                    [{"b_id": int(uid), "b_time": record.login_time} for uid, record in latest.items()]
+                )
+
+        async with self.session_factory() as session:
+            await run_write(session, unit)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取写入器统计信息"""
+        return {
+            "queued": len(self._queue),
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+
+# 创建全局登录审计写入器
+login_audit_writer = LoginAuditWriter(
+    batch_size=settings.LOGIN_AUDIT_BATCH_SIZE,
+    flush_interval=settings.LOGIN_AUDIT_FLUSH_INTERVAL,
+    max_queue=settings.LOGIN_AUDIT_MAX_QUEUE
+)
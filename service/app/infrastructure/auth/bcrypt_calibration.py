@@ -0,0 +1,124 @@
+"""
+bcrypt 成本校准
+按本机实测的校验耗时选择满足目标延迟的 bcrypt 成本，使不同硬件上的登录耗时保持一致。
+
+多台主机各自校准时得到的成本可能相差一级（如 11 与 12），登录时成本不在
+[rounds - tolerance, rounds + tolerance] 内的哈希会被重新哈希。容差为 0 时同一密码会在
+两台主机之间每次登录都被来回重写，因此校准模式下容差至少为 1；
+需要各主机严格一致的成本时设置 PASSWORD_BCRYPT_ROUNDS 固定成本。
+
+命令行用法:
+    python -m app.infrastructure.auth.bcrypt_calibration --target-ms 250
+"""
+import argparse
+import statistics
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from passlib.context import CryptContext
+
+from app.infrastructure.auth.hash_pool import PASSWORD_CONTEXT_CONFIG, password_context, password_hash_pool
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+# 校准用的样例密码
+_SAMPLE_PASSWORD = "calibration-sample-password"
+
+
+def benchmark_rounds(rounds: int, samples: int = 3) -> float:
+    """测量指定成本下单次校验的耗时中位数（毫秒）"""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    hashed = context.hash(_SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(max(samples, 1)):
+        started_at = time.perf_counter()
+        context.verify(_SAMPLE_PASSWORD, hashed)
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_rounds(
+    target_ms: float,
+    min_rounds: int = 10,
+    max_rounds: int = 15,
+    samples: int = 3
+) -> int:
+    """选择校验耗时不超过目标的最大成本
+
+    bcrypt 成本每加 1 耗时翻倍，因此只需在最低成本上实测一次再外推，
+    最后实测选中的成本，超出目标过多时回退一级。
+    """
+    base_ms = benchmark_rounds(min_rounds, samples)
+    rounds = min_rounds
+    while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+        rounds += 1
+    if rounds > min_rounds and benchmark_rounds(rounds, samples) > target_ms * 1.5:
+        rounds -= 1
+    return rounds
+
+
+def bcrypt_policy(rounds: int, tolerance: int = 0) -> Dict[str, Any]:
+    """生成密码上下文的成本配置，成本超出 [rounds - tolerance, rounds + tolerance] 的哈希视为需要更新"""
+    return {
+        "bcrypt__rounds": rounds,
+        "bcrypt__min_rounds": rounds - tolerance,
+        "bcrypt__max_rounds": rounds + tolerance,
+    }
+
+
+def apply_rounds(rounds: int, tolerance: int = 0) -> None:
+    """将成本应用到共享密码上下文与哈希工作池"""
+    policy = bcrypt_policy(rounds, tolerance)
+    PASSWORD_CONTEXT_CONFIG.update(policy)
+    password_context.update(**policy)
+    password_hash_pool.configure(PASSWORD_CONTEXT_CONFIG)
+
+
+def effective_tolerance(tolerance: int, calibrated: bool) -> int:
+    """校准得到的成本因主机而异，容差至少为 1；固定成本时按配置"""
+    if calibrated and tolerance < 1:
+        logger.warning("bcrypt 成本按主机校准时容差至少为 1，已忽略 PASSWORD_BCRYPT_ROUNDS_TOLERANCE=0")
+        return 1
+    return tolerance
+
+
+def configure_bcrypt_cost() -> Optional[int]:
+    """启动时确定并应用 bcrypt 成本，未配置固定成本和目标耗时时保持默认"""
+    rounds = settings.PASSWORD_BCRYPT_ROUNDS
+    calibrated = not rounds
+    if calibrated:
+        if settings.PASSWORD_HASH_TARGET_MS <= 0:
+            return None
+        rounds = calibrate_rounds(
+            settings.PASSWORD_HASH_TARGET_MS,
+            min_rounds=settings.PASSWORD_BCRYPT_MIN_ROUNDS,
+            max_rounds=settings.PASSWORD_BCRYPT_MAX_ROUNDS
+        )
+        logger.info(f"bcrypt 成本校准完成: rounds={rounds}, 目标耗时 {settings.PASSWORD_HASH_TARGET_MS}ms")
+    apply_rounds(rounds, effective_tolerance(settings.PASSWORD_BCRYPT_ROUNDS_TOLERANCE, calibrated))
+    return rounds
+
+
+def main() -> None:
+    """命令行入口：输出各成本的实测耗时与推荐成本"""
+    parser = argparse.ArgumentParser(description="bcrypt 成本校准工具")
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS or 250)
+    parser.add_argument("--min-rounds", type=int, default=settings.PASSWORD_BCRYPT_MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=settings.PASSWORD_BCRYPT_MAX_ROUNDS)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        elapsed = benchmark_rounds(rounds, args.samples)
+        print(f"rounds={rounds:<3} verify={elapsed:.1f}ms")
+        if elapsed > args.target_ms * 2:
+            break
+
+    rounds = calibrate_rounds(args.target_ms, args.min_rounds, args.max_rounds, args.samples)
+    print(f"推荐成本: PASSWORD_BCRYPT_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+密码哈希工作池
+在专用线程池/进程池中执行 bcrypt 哈希与校验，避免阻塞事件循环
+"""
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional, Dict, Any, Tuple
+
+from passlib.context import CryptContext
+
+from shared.kernel.config import get_settings
+from shared.kernel.exceptions import TooManyRequestsError
+
+settings = get_settings()
+
+# 密码上下文默认配置，PasswordHandler 与工作池共用
+PASSWORD_CONTEXT_CONFIG: Dict[str, Any] = {"schemes": ["bcrypt"], "deprecated": "auto"}
+
+# 进程内共享的密码上下文，bcrypt 成本校准后原地更新
+password_context = CryptContext(**PASSWORD_CONTEXT_CONFIG)
+
+# 工作线程/进程内的密码上下文
+_worker_context: Optional[CryptContext] = None
+
+
+def _init_worker(context_config: Dict[str, Any]) -> None:
+    """初始化工作线程/进程的密码上下文"""
+    global _worker_context
+    _worker_context = CryptContext(**context_config)
+
+
+def _run_operation(operation: str, args: Tuple[Any, ...]) -> Tuple[Any, float, float]:
+    """在工作线程/进程中执行哈希操作，返回结果及起止时间"""
+    started_at = time.time()
+    method = getattr(_worker_context, operation)
+    result = method(*args)
+    return result, started_at, time.time()
+
+
+class HashPoolSaturatedError(TooManyRequestsError):
+    """哈希工作池排队已满"""
+    def __init__(self, message: str = "登录请求过多，请稍后再试"):
+        super().__init__(message)
+
+
+class PasswordHashPool:
+    """有界密码哈希工作池
+
+    - mode 为 thread 时使用线程池（bcrypt 计算期间释放 GIL），为 process 时使用进程池
+    - 排队与执行中的任务数超过 max_pending 时立即拒绝，形成背压
+    - 记录排队等待时间与哈希耗时
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_pending: int = 64,
+        mode: str = "thread",
+        context_config: Optional[Dict[str, Any]] = None
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"不支持的工作池模式: {mode}")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.mode = mode
+        self.context_config = dict(context_config or PASSWORD_CONTEXT_CONFIG)
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_wait_time = 0.0
+        self.total_hash_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_hash_time = 0.0
+
+    def _get_executor(self) -> Executor:
+        """懒加载执行器"""
+        if self._executor is None:
+            executor_class = ThreadPoolExecutor if self.mode == "thread" else ProcessPoolExecutor
+            self._executor = executor_class(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.context_config,)
+            )
+        return self._executor
+
+    def configure(self, context_config: Dict[str, Any]) -> None:
+        """更新密码上下文配置，已有工作线程/进程在下次使用时重建"""
+        self.context_config = dict(context_config)
+        self.shutdown(wait=False)
+
+    async def _submit(self, operation: str, *args: Any) -> Any:
+        """提交哈希操作"""
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HashPoolSaturatedError()
+
+        self._pending += 1
+        self.submitted += 1
+        submitted_at = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started_at, finished_at = await loop.run_in_executor(
+                self._get_executor(), _run_operation, operation, args
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        wait_time = max(started_at - submitted_at, 0.0)
+        hash_time = finished_at - started_at
+        self.completed += 1
+        self.total_wait_time += wait_time
+        self.total_hash_time += hash_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        self.max_hash_time = max(self.max_hash_time, hash_time)
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """异步校验密码"""
+        return await self._submit("verify", plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        """异步计算密码哈希"""
+        return await self._submit("hash", password)
+
+    @property
+    def pending(self) -> int:
+        """排队与执行中的任务数"""
+        return self._pending
+
+    def stats(self) -> Dict[str, Any]:
+        """获取工作池统计信息"""
+        completed = self.completed or 1
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "avg_wait_ms": self.total_wait_time / completed * 1000,
+            "max_wait_ms": self.max_wait_time * 1000,
+            "avg_hash_ms": self.total_hash_time / completed * 1000,
+            "max_hash_ms": self.max_hash_time * 1000,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+# 创建全局密码哈希工作池
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    mode=settings.PASSWORD_HASH_POOL_MODE
+)
@@ -3,11 +3,17 @@ from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import os
+import uuid
+
+from app.infrastructure.auth.token_cache import VerifiedTokenCache
+from app.infrastructure.auth.revocation import token_revocation_store
 
 # JWT 配置
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-here")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "30"))
+TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "4096"))
+EMBED_PERMISSIONS = os.getenv("JWT_EMBED_PERMISSIONS", "false").lower() in ("1", "true", "yes")
 
 class JWTHandler:
     """JWT 处理器"""
@@ -16,6 +22,9 @@ class JWTHandler:
         self.secret_key = SECRET_KEY
         self.algorithm = ALGORITHM
         self.expire_minutes = ACCESS_TOKEN_EXPIRE_MINUTES
+        self.token_cache = VerifiedTokenCache(maxsize=TOKEN_CACHE_SIZE)
+        self.embed_permissions = EMBED_PERMISSIONS
+        self.revocation_store = token_revocation_store
 
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """创建访问令牌"""
@@ -26,16 +35,36 @@ class JWTHandler:
             expire = datetime.utcnow() + timedelta(minutes=self.expire_minutes)
         
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", uuid.uuid4().hex)
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
 
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """验证令牌"""
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
-        except JWTError:
+        payload = self.token_cache.get(token)
+        if payload is None:
+            try:
+                payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            except JWTError:
+                return None
+            self.token_cache.put(token, payload)
+        jti = payload.get("jti")
+        if jti and self.revocation_store.is_revoked(jti):
             return None
+        return payload
+
+    def revoke_token(self, token: str) -> bool:
+        """吊销令牌，直到其过期前都不再通过验证"""
+        payload = self.verify_token(token)
+        if not payload or not payload.get("jti"):
+            return False
+        self.revocation_store.revoke(payload["jti"], float(payload["exp"]))
+        self.token_cache.invalidate(token)
+        return True
+
+    def get_token_cache_stats(self) -> Dict[str, Any]:
+        """获取令牌缓存统计"""
+        return self.token_cache.stats()
 
     def get_user_id_from_token(self, token: str) -> Optional[str]:
         """从令牌获取用户ID"""
@@ -0,0 +1,153 @@
+"""
+登录准入控制
+在密码哈希之前按用户名、IP 的滑动窗口计数和全局并发上限拒绝多余的登录尝试，
+防止撞库流量耗尽 bcrypt 计算资源
+"""
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Any, Optional, AsyncIterator
+
+from shared.kernel.config import get_settings
+from shared.kernel.exceptions import TooManyRequestsError
+
+settings = get_settings()
+
+
+class SlidingWindowCounter:
+    """按键计数的滑动窗口
+
+    每个键最多保存 limit 个时间戳，跟踪的键数超过 max_keys 时淘汰最久未活动的键。
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 100000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def _prune(self, hits: Deque[float], now: float) -> None:
+        boundary = now - self.window
+        while hits and hits[0] <= boundary:
+            hits.popleft()
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> float:
+        """距离该键可再次尝试的秒数，0 表示未超限"""
+        now = now or time.monotonic()
+        hits = self._hits.get(key)
+        if not hits:
+            return 0.0
+        self._prune(hits, now)
+        if len(hits) < self.limit:
+            return 0.0
+        return hits[0] + self.window - now
+
+    def hit(self, key: str, now: Optional[float] = None) -> None:
+        """记录一次尝试"""
+        now = now or time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = deque(maxlen=self.limit)
+            self._hits[key] = hits
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
+        hits.append(now)
+
+    def __len__(self) -> int:
+        return len(self._hits)
+
+
+class LoginAdmissionController:
+    """登录准入控制器
+
+    - 按用户名、按 IP 的滑动窗口限制尝试次数
+    - 全局并发上限按观测到的认证耗时自适应调整（超过目标耗时则乘性减小，否则加性增大）
+    - 所有拒绝都发生在哈希之前，并记录被削减的哈希工作量
+    """
+
+    def __init__(
+        self,
+        window: float = 60,
+        max_per_username: int = 10,
+        max_per_ip: int = 50,
+        max_concurrent: int = 8,
+        min_concurrent: int = 1,
+        target_latency: float = 0.5
+    ):
+        self.by_username = SlidingWindowCounter(max_per_username, window)
+        self.by_ip = SlidingWindowCounter(max_per_ip, window)
+        self.max_concurrent = max_concurrent
+        self.min_concurrent = min(min_concurrent, max_concurrent)
+        self.concurrency_limit = float(max_concurrent)
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed_username = 0
+        self.shed_ip = 0
+        self.shed_concurrency = 0
+
+    def _check(self, username: str, ip: Optional[str]) -> None:
+        """检查是否允许尝试，不允许时抛出 TooManyRequestsError"""
+        now = time.monotonic()
+        wait = self.by_username.retry_after(username, now)
+        if wait > 0:
+            self.shed_username += 1
+            raise TooManyRequestsError("该账号登录尝试过于频繁，请稍后再试", retry_after=math.ceil(wait))
+        if ip:
+            wait = self.by_ip.retry_after(ip, now)
+            if wait > 0:
+                self.shed_ip += 1
+                raise TooManyRequestsError("该地址登录尝试过于频繁，请稍后再试", retry_after=math.ceil(wait))
+        if self.in_flight >= int(self.concurrency_limit):
+            self.shed_concurrency += 1
+            raise TooManyRequestsError("登录请求过多，请稍后再试", retry_after=1)
+        self.by_username.hit(username, now)
+        if ip:
+            self.by_ip.hit(ip, now)
+
+    def _adapt(self, elapsed: float) -> None:
+        """根据认证耗时调整并发上限"""
+        if elapsed > self.target_latency:
+            self.concurrency_limit = max(float(self.min_concurrent), self.concurrency_limit * 0.75)
+        else:
+            self.concurrency_limit = min(float(self.max_concurrent), self.concurrency_limit + 1)
+
+    @asynccontextmanager
+    async def admit(self, username: str, ip: Optional[str] = None) -> AsyncIterator[None]:
+        """申请一次登录尝试的准入，在上下文内执行密码校验"""
+        self._check(username, ip)
+        self.in_flight += 1
+        self.admitted += 1
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._adapt(time.monotonic() - started_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取准入控制统计信息"""
+        return {
+            "admitted": self.admitted,
+            "in_flight": self.in_flight,
+            "concurrency_limit": int(self.concurrency_limit),
+            "shed_username": self.shed_username,
+            "shed_ip": self.shed_ip,
+            "shed_concurrency": self.shed_concurrency,
+            "shed_total": self.shed_username + self.shed_ip + self.shed_concurrency,
+            "tracked_usernames": len(self.by_username),
+            "tracked_ips": len(self.by_ip),
+        }
+
+
+# 创建全局登录准入控制器
+login_admission = LoginAdmissionController(
+    window=settings.LOGIN_RATE_WINDOW_SECONDS,
+    max_per_username=settings.LOGIN_MAX_ATTEMPTS_PER_USERNAME,
+    max_per_ip=settings.LOGIN_MAX_ATTEMPTS_PER_IP,
+    max_concurrent=settings.LOGIN_MAX_CONCURRENT_HASHES,
+    target_latency=settings.LOGIN_TARGET_LATENCY_MS / 1000
+)
@@ -1,10 +1,11 @@
-from passlib.context import CryptContext
+from app.infrastructure.auth.hash_pool import password_context, password_hash_pool
 
 class PasswordHandler:
     """密码处理器"""
     
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = password_context
+        self.hash_pool = password_hash_pool
 
     def hash_password(self, password: str) -> str:
         """加密密码"""
@@ -14,6 +15,22 @@ class PasswordHandler:
         """验证密码"""
         return self.pwd_context.verify(plain_password, hashed_password)
 
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """判断密码哈希是否需要按当前成本重新计算"""
+        try:
+            return self.pwd_context.needs_update(hashed_password)
+        except ValueError:
+            # 非 bcrypt 格式的历史哈希无法识别，保持原样
+            return False
+
+    async def hash_password_async(self, password: str) -> str:
+        """在哈希工作池中加密密码"""
+        return await self.hash_pool.hash(password)
+
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """在哈希工作池中验证密码"""
+        return await self.hash_pool.verify(plain_password, hashed_password)
+
     def generate_password_reset_token(self, email: str) -> str:
         """生成密码重置令牌"""
         # 简化实现，实际应该使用安全的令牌生成
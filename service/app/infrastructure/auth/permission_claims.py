@@ -0,0 +1,404 @@
+"""
+访问令牌权限声明
+在访问令牌中嵌入角色编码、压缩的权限摘要和权限版本号，
+使认证与权限判断在版本未变化时无需查询数据库。
+权限版本保存在各工作进程共用的存储中（默认 SQLite 文件，与令牌吊销后端相同的方式）
+"""
+import asyncio
+import base64
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.domain.models.role import Role
+from app.domain.models.user import User
+from app.infrastructure.cache.principal_cache import principal_cache
+from app.infrastructure.database.sqlite_profile import connect_sqlite
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+# 声明名称
+ROLES_CLAIM = "roles"
+PERMISSIONS_CLAIM = "perms"
+VERSION_CLAIM = "pv"
+
+
+def encode_permissions(permissions: Iterable[str]) -> str:
+    """将权限集合编码为紧凑摘要（排序去重后 zlib 压缩再 base64url 编码）"""
+    raw = "\n".join(sorted(set(permissions))).encode("utf-8")
+    return base64.urlsafe_b64encode(zlib.compress(raw, 9)).decode("ascii").rstrip("=")
+
+
+def decode_permissions(digest: str) -> FrozenSet[str]:
+    """解码权限摘要"""
+    if not digest:
+        return frozenset()
+    padded = digest + "=" * (-len(digest) % 4)
+    raw = zlib.decompress(base64.urlsafe_b64decode(padded)).decode("utf-8")
+    return frozenset(item for item in raw.split("\n") if item)
+
+
+GLOBAL_SCOPE = "*"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class PermissionVersionBackend(ABC):
+    """权限版本存储后端接口
+
+    每条记录为 (scope, version, seq)：scope 为 "*"（全局）或用户ID，
+    seq 在每次递增时取全表最大值加一，供各进程按 seq 增量读取变更。
+    """
+
+    @abstractmethod
+    def changes(self, after_seq: int) -> List[Tuple[str, int, int]]:
+        """读取 seq 大于 after_seq 的版本记录"""
+        pass
+
+    @abstractmethod
+    def bump(self, scope: str) -> int:
+        """原子地递增指定范围的版本，返回新版本
+
+        新版本不小于当前毫秒时间戳，用户版本同时不小于全局版本加一。
+        """
+        pass
+
+    def close(self) -> None:
+        """关闭后端"""
+        pass
+
+
+class MemoryPermissionVersionBackend(PermissionVersionBackend):
+    """内存后端（单进程或测试使用）
+
+    全局版本以创建时的毫秒时间戳为初值，进程重启后旧令牌中的版本号必然落后，从而回退到数据库校验。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, Tuple[int, int]] = {GLOBAL_SCOPE: (_now_ms(), 1)}
+        self._seq = 1
+
+    def changes(self, after_seq: int) -> List[Tuple[str, int, int]]:
+        with self._lock:
+            return [(scope, version, seq) for scope, (version, seq) in self._records.items() if seq > after_seq]
+
+    def bump(self, scope: str) -> int:
+        with self._lock:
+            version = self._records.get(scope, (0, 0))[0]
+            if scope != GLOBAL_SCOPE:
+                version = max(version, self._records[GLOBAL_SCOPE][0])
+            self._seq += 1
+            version = max(version + 1, _now_ms())
+            self._records[scope] = (version, self._seq)
+            return version
+
+
+class SQLitePermissionVersionBackend(PermissionVersionBackend):
+    """SQLite 后端（默认），同一主机上的多个工作进程共用一个数据库文件"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """懒加载连接并建表（调用方持有锁）"""
+        if self._conn is None:
+            db_dir = os.path.dirname(self.path)
+            if db_dir:
+                Path(db_dir).mkdir(parents=True, exist_ok=True)
+            conn = connect_sqlite(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS permission_versions ("
+                "scope TEXT PRIMARY KEY, version INTEGER NOT NULL, seq INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_permission_versions_seq ON permission_versions(seq)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def changes(self, after_seq: int) -> List[Tuple[str, int, int]]:
+        with self._lock:
+            return self._get_conn().execute(
+                "SELECT scope, version, seq FROM permission_versions WHERE seq > ?", (after_seq,)
+            ).fetchall()
+
+    def bump(self, scope: str) -> int:
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = dict(conn.execute(
+                    "SELECT scope, version FROM permission_versions WHERE scope IN (?, ?)",
+                    (GLOBAL_SCOPE, scope)
+                ).fetchall())
+                version = max(rows.values(), default=0)
+                version = max(version + 1, _now_ms())
+                conn.execute(
+                    "INSERT OR REPLACE INTO permission_versions (scope, version, seq) "
+                    "VALUES (?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM permission_versions))",
+                    (scope, version)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return version
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class PermissionVersionRegistry:
+    """服务端权限版本登记
+
+    全局版本在角色、菜单变更时递增，用户版本在用户自身的授权变更时递增。
+    版本保存在后端中，各进程每 ttl 秒按 seq 增量读取一次变更，
+    因此其他工作进程最多在 ttl 秒后拒绝旧版本的令牌声明；本进程的递增立即生效。
+
+    在事件循环中调用时不阻塞循环：增量读取与递增写入提交到默认线程池执行，
+    读取期间沿用已加载的版本（仅进程内首次读取在调用处同步完成，启动时由 lifespan 预先 sync）；
+    递增先在本进程登记不小于当前时间戳的版本，后端写入完成后再取两者的较大值。
+    """
+
+    def __init__(self, backend: Optional[PermissionVersionBackend] = None, ttl: float = 1.0):
+        self.backend = backend or MemoryPermissionVersionBackend()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._seq = 0
+        self._refreshed_at: Optional[float] = None
+        self._refreshing = False
+        self._pending: Set[asyncio.Future] = set()
+
+    def sync(self) -> int:
+        """从后端增量读取变更（阻塞），返回读取的记录数"""
+        with self._lock:
+            after_seq = self._seq
+        rows = self.backend.changes(after_seq)
+        with self._lock:
+            for scope, version, seq in rows:
+                self._versions[scope] = max(version, self._versions.get(scope, 0))
+                self._seq = max(self._seq, seq)
+            self._refreshed_at = time.monotonic()
+        return len(rows)
+
+    def _sync_in_background(self) -> None:
+        try:
+            self.sync()
+        except Exception as e:
+            logger.error(f"权限版本同步失败: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _refresh(self) -> None:
+        """距上次读取超过 ttl 时从后端增量读取变更，事件循环中提交到线程池"""
+        with self._lock:
+            if self._refreshed_at is None:
+                loaded = False
+            elif self._refreshing or time.monotonic() - self._refreshed_at < self.ttl:
+                return
+            else:
+                loaded = True
+            self._refreshing = True
+        loop = _running_loop()
+        if loop is None or not loaded:
+            self._sync_in_background()
+        else:
+            loop.run_in_executor(None, self._sync_in_background)
+
+    def current(self, user_id: Optional[str] = None) -> int:
+        """获取当前生效的权限版本"""
+        self._refresh()
+        with self._lock:
+            global_version = self._versions.get(GLOBAL_SCOPE, 0)
+            if user_id is None:
+                return global_version
+            return max(global_version, self._versions.get(str(user_id), 0))
+
+    def _persist(self, scope: str) -> int:
+        version = self.backend.bump(scope)
+        with self._lock:
+            self._versions[scope] = max(version, self._versions.get(scope, 0))
+        return version
+
+    def _bump(self, scope: str) -> int:
+        with self._lock:
+            version = self._versions.get(scope, 0)
+            if scope != GLOBAL_SCOPE:
+                version = max(version, self._versions.get(GLOBAL_SCOPE, 0))
+            version = max(version + 1, _now_ms())
+            self._versions[scope] = version
+        loop = _running_loop()
+        if loop is None:
+            return max(version, self._persist(scope))
+        future = loop.run_in_executor(None, self._persist, scope)
+        self._pending.add(future)
+        future.add_done_callback(self._persisted)
+        return version
+
+    def _persisted(self, future: asyncio.Future) -> None:
+        self._pending.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"权限版本写入失败: {future.exception()}")
+
+    def bump(self) -> int:
+        """递增全局权限版本（角色、菜单变更）"""
+        return self._bump(GLOBAL_SCOPE)
+
+    def bump_user(self, user_id: str) -> int:
+        """递增指定用户的权限版本（用户授权变更）"""
+        return self._bump(str(user_id))
+
+    def is_current(self, user_id: str, claimed_version: Any) -> bool:
+        """判断令牌中的权限版本是否仍然有效"""
+        if not isinstance(claimed_version, int):
+            return False
+        return claimed_version >= self.current(user_id)
+
+    async def drain(self) -> None:
+        """等待尚未完成的后端写入（关闭前调用）"""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def close(self) -> None:
+        """关闭存储后端"""
+        self.backend.close()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """当前线程正在运行的事件循环，没有时返回 None"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def create_permission_version_backend(url: Optional[str] = None) -> PermissionVersionBackend:
+    """根据配置创建权限版本后端，memory 表示仅在本进程内生效"""
+    url = url or settings.PERMISSION_VERSION_BACKEND
+    if url == "memory":
+        return MemoryPermissionVersionBackend()
+    return SQLitePermissionVersionBackend(url.replace("sqlite:///", ""))
+
+
+class AuthPrincipal(BaseModel):
+    """认证主体（角色与权限的只读视图）"""
+    user_id: str
+    username: Optional[str] = None
+    roles: List[str] = []
+    permissions: FrozenSet[str] = frozenset()
+    from_token: bool = False
+
+    def has_role(self, role_code: str) -> bool:
+        """检查是否拥有指定角色"""
+        return role_code in self.roles
+
+    def has_permission(self, permission: str) -> bool:
+        """检查是否拥有指定权限"""
+        return permission in self.permissions
+
+
+def collect_permissions(roles: Iterable[Role]) -> FrozenSet[str]:
+    """汇总角色的权限（菜单路径）"""
+    return frozenset(menu.path for role in roles for menu in role.menus)
+
+
+def build_permission_claims(user_id: str, roles: List[Role]) -> Dict[str, Any]:
+    """根据用户角色构建令牌权限声明"""
+    return {
+        ROLES_CLAIM: sorted({role.code or role.name for role in roles}),
+        PERMISSIONS_CLAIM: encode_permissions(collect_permissions(roles)),
+        VERSION_CLAIM: permission_versions.current(user_id),
+    }
+
+
+def principal_from_claims(payload: Dict[str, Any]) -> Optional[AuthPrincipal]:
+    """从令牌载荷构建认证主体，声明缺失或版本过期时返回 None"""
+    user_id = payload.get("sub")
+    if not user_id or VERSION_CLAIM not in payload:
+        return None
+    if not permission_versions.is_current(user_id, payload.get(VERSION_CLAIM)):
+        return None
+    try:
+        permissions = decode_permissions(payload.get(PERMISSIONS_CLAIM, ""))
+    except (ValueError, zlib.error):
+        return None
+    return AuthPrincipal(
+        user_id=str(user_id),
+        username=payload.get("username"),
+        roles=list(payload.get(ROLES_CLAIM, [])),
+        permissions=permissions,
+        from_token=True
+    )
+
+
+def principal_from_roles(user_id: str, username: Optional[str], roles: List[Role]) -> AuthPrincipal:
+    """根据数据库中的角色构建认证主体"""
+    return AuthPrincipal(
+        user_id=str(user_id),
+        username=username,
+        roles=sorted({role.code or role.name for role in roles}),
+        permissions=collect_permissions(roles)
+    )
+
+
+async def load_principal_user(
+    user_id: str,
+    load_user: Callable[[str], Awaitable[Optional[User]]]
+) -> Optional[User]:
+    """经主体缓存获取用户，未命中时由 load_user 加载（应同时加载角色与菜单）
+
+    缓存条目按加载前读取的权限版本登记，版本变化后重新加载。
+    """
+    user_id = str(user_id)
+    version = permission_versions.current(user_id)
+    user = principal_cache.get(user_id, version)
+    if user is None:
+        user = await load_user(user_id)
+        if user is None:
+            return None
+        principal_cache.set(user_id, user, version)
+    return user
+
+
+async def resolve_principal(
+    payload: Dict[str, Any],
+    load_user: Callable[[str], Awaitable[Optional[User]]]
+) -> Optional[AuthPrincipal]:
+    """由令牌载荷得出认证主体
+
+    令牌声明的权限版本仍然有效时直接使用声明，不访问数据库；
+    否则经主体缓存或 load_user 得到用户及其角色。用户不存在时返回 None。
+    """
+    principal = principal_from_claims(payload)
+    if principal is not None:
+        return principal
+    user = await load_principal_user(payload["sub"], load_user)
+    if user is None:
+        return None
+    return principal_from_roles(user.id, user.username, user.roles)
+
+
+# 创建全局权限版本登记实例
+permission_versions = PermissionVersionRegistry(
+    create_permission_version_backend(),
+    ttl=settings.PERMISSION_VERSION_TTL
+)
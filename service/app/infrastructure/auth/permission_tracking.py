@@ -0,0 +1,117 @@
+"""
+同步会话的权限变更跟踪
+旧版同步路由（users、roles、menus、depts 等）通过 get_db 会话直接提交，不经过异步仓储。
+在会话工厂上监听 flush、ORM 批量语句与事务结束:
+    flush           按实体所在的表收集受影响的用户，角色、菜单、部门及权限相关表的变更记为全局变更
+    批量语句        query(...).delete()/update() 无法得知影响的行，记为全局变更
+    提交之后        使受影响用户的主体缓存失效并递增其权限版本，全局变更递增全局版本
+    回滚            丢弃收集到的变更
+
+令牌声明与主体缓存都以权限版本判断是否过期，递增后被删除或降权的用户不再通过快速路径认证。
+"""
+import threading
+from typing import Any, Dict, Iterable
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import object_mapper
+
+from app.infrastructure.auth.permission_claims import permission_versions
+from app.infrastructure.cache.principal_cache import principal_cache
+
+# 用户表与用户角色关联表（按行得出用户ID）
+USER_TABLES = {
+    "system_userinfo": "id",
+    "system_userinfo_roles": "userinfo_id",
+}
+
+# 变更后影响所有用户权限的表
+GLOBAL_TABLES = frozenset({
+    "system_userrole",
+    "system_userrole_menu",
+    "system_menu",
+    "menus",
+    "system_fieldpermission",
+    "system_datapermission",
+    "system_datapermission_menu",
+    "system_deptinfo",
+    "system_deptinfo_roles",
+})
+
+# 会话 info 中记录本事务的权限变更
+CHANGES_KEY = "permission_changes"
+
+
+class PermissionChangeTracker:
+    """跟踪会话事务中的权限变更，提交后使主体缓存与权限版本失效"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.user_bumps = 0
+        self.global_bumps = 0
+
+    def install(self, session_factory: Any) -> None:
+        """监听会话工厂（sessionmaker）创建的会话"""
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "do_orm_execute", self._do_orm_execute)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    def _changes(self, session) -> Dict[str, Any]:
+        return session.info.setdefault(CHANGES_KEY, {"users": set(), "global": False})
+
+    def _record(self, session, objects: Iterable[Any], new: bool = False) -> None:
+        for obj in objects:
+            table = object_mapper(obj).local_table.name
+            if table in GLOBAL_TABLES:
+                self._changes(session)["global"] = True
+            elif table in USER_TABLES and not (new and table == "system_userinfo"):
+                # 新建的用户尚无令牌，无需失效；新建的用户角色关联按用户记录
+                user_id = getattr(obj, USER_TABLES[table], None)
+                if user_id is not None:
+                    self._changes(session)["users"].add(str(user_id))
+
+    def _after_flush(self, session, flush_context) -> None:
+        # after_flush 时 new/dirty/deleted 仍为 flush 前的状态
+        self._record(session, session.new, new=True)
+        self._record(session, session.dirty)
+        self._record(session, session.deleted)
+
+    def _do_orm_execute(self, orm_execute_state) -> None:
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        table = getattr(orm_execute_state.statement, "table", None)
+        name = getattr(table, "name", None)
+        if name in GLOBAL_TABLES or name in USER_TABLES:
+            if orm_execute_state.is_insert and name == "system_userinfo":
+                return
+            self._changes(orm_execute_state.session)["global"] = True
+
+    def _after_commit(self, session) -> None:
+        changes = session.info.pop(CHANGES_KEY, None)
+        if not changes:
+            return
+        try:
+            for user_id in changes["users"]:
+                principal_cache.invalidate(user_id)
+                permission_versions.bump_user(user_id)
+            if changes["global"]:
+                permission_versions.bump()
+        except Exception as e:
+            logger.error(f"递增权限版本失败: {e}")
+            return
+        with self._lock:
+            self.user_bumps += len(changes["users"])
+            self.global_bumps += int(changes["global"])
+
+    def _after_rollback(self, session) -> None:
+        session.info.pop(CHANGES_KEY, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            return {"user_bumps": self.user_bumps, "global_bumps": self.global_bumps}
+
+
+# 创建全局权限变更跟踪实例
+permission_tracker = PermissionChangeTracker()
@@ -0,0 +1,331 @@
+"""
+令牌吊销存储
+以令牌ID（jti）记录已吊销的令牌直到其过期。
+内存中使用布隆过滤器加精确集合完成 O(1) 判断，持久化后端保证重启后吊销仍然有效。
+多个工作进程共用持久化后端：每条记录带递增的 seq，各进程的后台任务按 seq 增量读取其他进程的吊销，
+因此其他进程最多在同步间隔（TOKEN_REVOCATION_SYNC_INTERVAL）后拒绝已登出的令牌。
+"""
+import asyncio
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Tuple, Optional, Any
+
+from loguru import logger
+
+from app.infrastructure.database.sqlite_profile import connect_sqlite
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+class BloomFilter:
+    """布隆过滤器"""
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.hash_count = max(int(round(self.size / capacity * math.log(2))), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        """添加元素"""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class RevocationBackend(ABC):
+    """吊销记录持久化后端接口"""
+
+    @abstractmethod
+    def load(self, now: float, after_seq: int = -1) -> Iterable[Tuple[str, float, int]]:
+        """加载 seq 大于 after_seq 且未过期的吊销记录 (jti, expires_at, seq)，默认加载全部（升级前的记录 seq 为 0）"""
+        pass
+
+    @abstractmethod
+    def add(self, jti: str, expires_at: float) -> None:
+        """保存吊销记录"""
+        pass
+
+    @abstractmethod
+    def purge(self, now: float) -> int:
+        """清理已过期的吊销记录"""
+        pass
+
+    def close(self) -> None:
+        """关闭后端"""
+        pass
+
+
+class MemoryRevocationBackend(RevocationBackend):
+    """内存后端（不持久化，用于测试或单进程临时部署）"""
+
+    def __init__(self):
+        self._records: Dict[str, Tuple[float, int]] = {}
+        self._seq = 0
+
+    def load(self, now: float, after_seq: int = -1) -> Iterable[Tuple[str, float, int]]:
+        return [(jti, exp, seq) for jti, (exp, seq) in self._records.items() if exp > now and seq > after_seq]
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._seq += 1
+        self._records[jti] = (expires_at, self._seq)
+
+    def purge(self, now: float) -> int:
+        expired = [jti for jti, (exp, _) in self._records.items() if exp <= now]
+        for jti in expired:
+            del self._records[jti]
+        return len(expired)
+
+
+class SQLiteRevocationBackend(RevocationBackend):
+    """SQLite 后端（默认），同一主机上的多个工作进程共用一个数据库文件
+
+    seq 取全表最大值加一（在 IMMEDIATE 事务中分配，不会重复）；
+    清理过期记录时保留 seq 最大的一行，使 seq 不会因删除而回退重用。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """懒加载连接并建表（调用方持有锁）"""
+        if self._conn is None:
+            db_dir = os.path.dirname(self.path)
+            if db_dir:
+                Path(db_dir).mkdir(parents=True, exist_ok=True)
+            conn = connect_sqlite(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+                "jti TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(revoked_tokens)")}
+            if "seq" not in columns:
+                conn.execute("ALTER TABLE revoked_tokens ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires_at "
+                "ON revoked_tokens(expires_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_seq "
+                "ON revoked_tokens(seq)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def load(self, now: float, after_seq: int = -1) -> Iterable[Tuple[str, float, int]]:
+        with self._lock:
+            return self._get_conn().execute(
+                "SELECT jti, expires_at, seq FROM revoked_tokens WHERE seq > ? AND expires_at > ?",
+                (after_seq, now)
+            ).fetchall()
+
+    def add(self, jti: str, expires_at: float) -> None:
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO revoked_tokens (jti, expires_at, seq) "
+                    "VALUES (?, ?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM revoked_tokens))",
+                    (jti, expires_at)
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def purge(self, now: float) -> int:
+        with self._lock:
+            conn = self._get_conn()
+            cursor = conn.execute(
+                "DELETE FROM revoked_tokens WHERE expires_at <= ? "
+                "AND seq < (SELECT MAX(seq) FROM revoked_tokens)", (now,)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class TokenRevocationStore:
+    """令牌吊销存储
+
+    判断时先查布隆过滤器，绝大多数未吊销的令牌在此直接返回；
+    布隆过滤器命中后再查精确集合以排除误判。
+    判断只读内存，其他进程的吊销由 start() 启动的后台任务按 seq 增量同步。
+    """
+
+    def __init__(
+        self,
+        backend: RevocationBackend,
+        capacity: int = 100000,
+        error_rate: float = 0.001
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._revoked: Dict[str, float] = {}
+        self._loaded = False
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self.synced = 0
+        self.checks = 0
+        self.bloom_negatives = 0
+        self.revoked_hits = 0
+
+    def load(self) -> int:
+        """从持久化后端加载未过期的吊销记录"""
+        now = time.time()
+        records = list(self.backend.load(now))
+        with self._lock:
+            self._revoked = {jti: exp for jti, exp, _ in records}
+            self._seq = max((seq for _, _, seq in records), default=0)
+            self._rebuild_bloom()
+            self._loaded = True
+        logger.info(f"已加载 {len(records)} 条令牌吊销记录")
+        return len(records)
+
+    def sync(self) -> int:
+        """从持久化后端增量读取上次同步之后新增的吊销记录（包括其他进程写入的）"""
+        self._ensure_loaded()
+        with self._lock:
+            after_seq = self._seq
+        records = list(self.backend.load(time.time(), after_seq))
+        with self._lock:
+            for jti, exp, seq in records:
+                self._revoked[jti] = exp
+                self._bloom.add(jti)
+                self._seq = max(self._seq, seq)
+            self.synced += len(records)
+        return len(records)
+
+    async def start(self, interval: float) -> None:
+        """启动后台同步任务"""
+        if self._task is None and interval > 0:
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """停止后台同步任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, interval: float) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(None, self.sync)
+            except Exception as e:
+                logger.error(f"令牌吊销记录同步失败: {e}")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _rebuild_bloom(self) -> None:
+        """按当前记录重建布隆过滤器（调用方持有锁）"""
+        self._bloom = BloomFilter(max(self.capacity, len(self._revoked) * 2), self.error_rate)
+        for jti in self._revoked:
+            self._bloom.add(jti)
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """吊销令牌，记录保留到令牌过期（写持久化后端，异步代码中应在线程池中调用）"""
+        if expires_at <= time.time():
+            return
+        self._ensure_loaded()
+        self.backend.add(jti, expires_at)
+        with self._lock:
+            self._revoked[jti] = expires_at
+            self._bloom.add(jti)
+            if len(self._revoked) > self.capacity:
+                self._purge_locked(time.time())
+
+    def is_revoked(self, jti: str) -> bool:
+        """判断令牌是否已被吊销"""
+        self._ensure_loaded()
+        self.checks += 1
+        if jti not in self._bloom:
+            self.bloom_negatives += 1
+            return False
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+        if expires_at is None:
+            return False
+        self.revoked_hits += 1
+        return True
+
+    def _purge_locked(self, now: float) -> int:
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+        if expired:
+            self._rebuild_bloom()
+        return len(expired)
+
+    def purge(self) -> int:
+        """清理已过期的吊销记录"""
+        now = time.time()
+        self.backend.purge(now)
+        with self._lock:
+            return self._purge_locked(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取吊销存储统计信息"""
+        with self._lock:
+            size = len(self._revoked)
+        return {
+            "revoked": size,
+            "synced": self.synced,
+            "checks": self.checks,
+            "bloom_negatives": self.bloom_negatives,
+            "revoked_hits": self.revoked_hits,
+        }
+
+    def close(self) -> None:
+        """关闭持久化后端"""
+        self.backend.close()
+
+
+def create_revocation_backend(url: Optional[str] = None) -> RevocationBackend:
+    """根据配置创建吊销后端，memory 表示不持久化"""
+    url = url or settings.TOKEN_REVOCATION_BACKEND
+    if url == "memory":
+        return MemoryRevocationBackend()
+    return SQLiteRevocationBackend(url.replace("sqlite:///", ""))
+
+
+# 创建全局令牌吊销存储
+token_revocation_store = TokenRevocationStore(
+    create_revocation_backend(),
+    capacity=settings.TOKEN_REVOCATION_CAPACITY
+)
@@ -0,0 +1,91 @@
+"""
+已验证令牌缓存
+对 JWT 验签结果做有界 LRU 缓存，命中时跳过 HMAC 校验和 JSON 解码
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+
+class VerifiedTokenCache:
+    """已验证令牌的 LRU 缓存
+
+    - 以令牌的 SHA-256 摘要作为键，不在内存中保留原始令牌
+    - 每个条目在令牌的 exp 时刻失效
+    - 超出容量时淘汰最久未使用的条目
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        """计算令牌摘要"""
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """获取已验证的载荷，未命中或已过期返回 None"""
+        if self.maxsize <= 0:
+            return None
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """缓存已验证的载荷，没有 exp 声明的令牌不缓存"""
+        if self.maxsize <= 0:
+            return
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)):
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, token: str) -> None:
+        """移除指定令牌"""
+        with self._lock:
+            self._entries.pop(self._digest(token), None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
@@ -0,0 +1 @@
+"""缓存模块"""
\ No newline at end of file
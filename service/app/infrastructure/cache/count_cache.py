@@ -0,0 +1,159 @@
+"""
+分页总数缓存
+按表名与过滤条件缓存 COUNT 结果，表上执行 INSERT/UPDATE/DELETE 时整表失效
+
+失效时机:
+    执行写语句时          立即失效，同一事务中的读取不会命中旧值
+    会话事务提交之后      再次失效（并递增表的代次），提交前由其他连接读出的旧总数写不回缓存
+    事务回滚时            失效，丢弃事务内读出的未提交总数
+
+缓存是进程内的，其他工作进程中该表的总数最多在 ttl 秒后才反映本进程的写入。
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+# 连接 info 中记录本事务写过的表、正在提交的表；会话 info 中记录参与事务的连接 info
+WRITTEN_TABLES_KEY = "count_cache_written"
+COMMITTING_TABLES_KEY = "count_cache_committing"
+SESSION_CONNECTIONS_KEY = "count_cache_connections"
+
+
+class CountCache:
+    """带 TTL 的总数缓存
+
+    键为 (表名, 过滤条件)；引擎执行写语句后按表名失效，
+    直接执行的原生 SQL 无法识别目标表，依赖 TTL 过期。
+    每张表有一个代次，失效时递增；写入时传入查询前读取的代次，代次已变化的结果不缓存。
+    """
+
+    def __init__(self, ttl: float = 30, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[int, float]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._session_events_installed = False
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, table: str, key: str = "") -> Optional[int]:
+        """获取缓存的总数，未命中或已过期返回 None"""
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get((table, key))
+            if entry is None or time.monotonic() >= entry[1]:
+                if entry is not None:
+                    del self._entries[(table, key)]
+                self.misses += 1
+                return None
+            self._entries.move_to_end((table, key))
+            self.hits += 1
+            return entry[0]
+
+    def generation(self, table: str) -> int:
+        """获取表的当前代次（在执行计数查询之前读取）"""
+        with self._lock:
+            return self._generations.get(table, 0)
+
+    def set(self, table: str, key: str, total: int, generation: Optional[int] = None) -> None:
+        """写入总数，generation 与表的当前代次不一致时（计数期间有写入提交）不缓存"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and self._generations.get(table, 0) != generation:
+                return
+            self._entries[(table, key)] = (total, time.monotonic() + self.ttl)
+            self._entries.move_to_end((table, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, table: str) -> None:
+        """使指定表的全部总数失效"""
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [entry_key for entry_key in self._entries if entry_key[0] == table]
+            for entry_key in stale:
+                del self._entries[entry_key]
+            if stale:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def install(self, engine: Engine) -> None:
+        """监听引擎执行的写语句与事务结束（异步引擎传入 sync_engine），以及会话提交"""
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine, "rollback", self._on_rollback)
+        with self._lock:
+            if self._session_events_installed:
+                return
+            self._session_events_installed = True
+        event.listen(Session, "after_begin", self._after_session_begin)
+        event.listen(Session, "after_commit", self._after_session_commit)
+        event.listen(Session, "after_rollback", self._after_session_rollback)
+
+    def _invalidate_all(self, tables) -> None:
+        for table in tables:
+            self.invalidate(table)
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+            return
+        table = getattr(getattr(context.compiled, "statement", None), "table", None)
+        if table is not None:
+            self.invalidate(table.name)
+            conn.info.setdefault(WRITTEN_TABLES_KEY, set()).add(table.name)
+
+    def _on_commit(self, conn) -> None:
+        """提交前触发：失效写过的表，并留给会话在提交完成后再次失效"""
+        tables = conn.info.pop(WRITTEN_TABLES_KEY, set())
+        self._invalidate_all(tables)
+        conn.info[COMMITTING_TABLES_KEY] = tables
+
+    def _on_rollback(self, conn) -> None:
+        self._invalidate_all(conn.info.pop(WRITTEN_TABLES_KEY, set()))
+
+    def _after_session_begin(self, session, transaction, connection) -> None:
+        session.info.setdefault(SESSION_CONNECTIONS_KEY, []).append(connection.info)
+
+    def _after_session_commit(self, session) -> None:
+        """会话事务提交完成后触发（此时其他连接已能读到新数据）"""
+        for info in session.info.pop(SESSION_CONNECTIONS_KEY, []):
+            self._invalidate_all(info.pop(COMMITTING_TABLES_KEY, ()))
+
+    def _after_session_rollback(self, session) -> None:
+        session.info.pop(SESSION_CONNECTIONS_KEY, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+# 创建全局总数缓存实例
+count_cache = CountCache(
+    ttl=settings.COUNT_CACHE_TTL,
+    maxsize=settings.COUNT_CACHE_SIZE
+)
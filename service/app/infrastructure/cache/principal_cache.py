@@ -0,0 +1,87 @@
+"""
+认证主体快照缓存
+按用户ID缓存认证依赖加载的领域用户对象（含角色与菜单），避免每个请求都查询数据库
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+
+from app.domain.models.user import User
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+class PrincipalCache:
+    """带 TTL 的用户快照缓存
+
+    条目在 ttl 秒后过期；用户被更新或删除时由仓储显式失效。
+    条目记录写入时的权限版本，读取时传入当前版本，角色、菜单变更后旧条目不再命中。
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[User, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str, version: int = 0) -> Optional[User]:
+        """获取用户快照，未命中、已过期或权限版本早于 version 时返回 None"""
+        if self.ttl <= 0:
+            return None
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry[1] or entry[2] < version:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].model_copy(deep=True)
+
+    def set(self, user_id: str, user: User, version: int = 0) -> None:
+        """写入用户快照，version 为加载前读取的权限版本"""
+        if self.ttl <= 0:
+            return
+        key = str(user_id)
+        with self._lock:
+            self._entries[key] = (user.model_copy(deep=True), time.monotonic() + self.ttl, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """使指定用户的快照失效"""
+        with self._lock:
+            if self._entries.pop(str(user_id), None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+# 创建全局主体缓存实例
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    maxsize=settings.PRINCIPAL_CACHE_SIZE
+)
@@ -0,0 +1,147 @@
+"""
+批量写入
+行数据按 chunk_size 分块，每块作为一个写工作单元执行（经 run_write，一块一个事务），
+块内用 executemany / 多行 INSERT 一次写入。
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database.write_queue import run_write
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+Row = Dict[str, Any]
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """按固定大小分块"""
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def group_by_keys(rows: Sequence[Row]) -> List[List[Row]]:
+    """按字段集合分组（executemany 要求同一批参数的字段一致），组内保持原顺序"""
+    groups: Dict[frozenset, List[Row]] = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+    return list(groups.values())
+
+
+def model_row(model: Any, entity: Any) -> Row:
+    """把模型实例转换为行数据，值为 None 的字段交给列默认值处理"""
+    if isinstance(entity, dict):
+        return {key: value for key, value in entity.items() if key in model.__table__.columns}
+    return {
+        column.key: getattr(entity, column.key)
+        for column in model.__table__.columns
+        if getattr(entity, column.key, None) is not None
+    }
+
+
+def _primary_key(model: Any) -> List[str]:
+    return [column.key for column in model.__table__.primary_key.columns]
+
+
+def insert_rows(session: Session, model: Any, rows: Sequence[Row]) -> int:
+    """插入一块数据"""
+    table = model.__table__
+    for group in group_by_keys(rows):
+        session.execute(insert(table), group)
+    return len(rows)
+
+
+def update_rows(session: Session, model: Any, rows: Sequence[Row]) -> int:
+    """按主键更新一块数据，返回实际更新的行数"""
+    table = model.__table__
+    keys = _primary_key(model)
+    affected = 0
+    for group in group_by_keys(rows):
+        fields = [key for key in group[0] if key not in keys]
+        if not fields:
+            continue
+        # SET 子句由参数中的字段名推导，主键用不同的参数名绑定到 WHERE
+        statement = update(table).where(*[table.c[key] == bindparam(f"pk_{key}") for key in keys])
+        params = [
+            {**{field: row[field] for field in fields}, **{f"pk_{key}": row[key] for key in keys}}
+            for row in group
+        ]
+        affected += session.execute(statement, params).rowcount
+    return affected
+
+
+def delete_ids(session: Session, model: Any, ids: Sequence[Any]) -> int:
+    """按主键删除一块数据，返回实际删除的行数"""
+    column = model.__table__.primary_key.columns[0]
+    return session.execute(delete(model.__table__).where(column.in_(ids))).rowcount
+
+
+def upsert_rows(session: Session, model: Any, rows: Sequence[Row]) -> int:
+    """按主键插入或更新一块数据
+
+    SQLite / PostgreSQL 使用 ON CONFLICT DO UPDATE，MySQL 使用 ON DUPLICATE KEY UPDATE，
+    其他数据库先查出已存在的主键再分别更新和插入。
+    """
+    table = model.__table__
+    keys = _primary_key(model)
+    dialect = session.get_bind().dialect.name
+    for group in group_by_keys(rows):
+        fields = [key for key in group[0] if key not in keys]
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(table)
+            if fields:
+                statement = statement.on_conflict_do_update(
+                    index_elements=keys, set_={field: statement.excluded[field] for field in fields}
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=keys)
+            session.execute(statement, group)
+        elif dialect in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+            statement = dialect_insert(table)
+            update_fields = fields or keys[:1]
+            statement = statement.on_duplicate_key_update(
+                {field: statement.inserted[field] for field in update_fields}
+            )
+            session.execute(statement, group)
+        else:
+            column = table.c[keys[0]]
+            existing = set(session.execute(
+                select(column).where(column.in_([row[keys[0]] for row in group]))
+            ).scalars())
+            updates = [row for row in group if row[keys[0]] in existing]
+            inserts = [row for row in group if row[keys[0]] not in existing]
+            if updates:
+                update_rows(session, model, updates)
+            if inserts:
+                insert_rows(session, model, inserts)
+    return len(rows)
+
+
+async def run_chunked(
+    session: AsyncSession,
+    items: Sequence[Any],
+    work: Callable[[Session, List[Any]], int],
+    chunk_size: Optional[int] = None
+) -> int:
+    """分块执行批量写入，每块一个事务，返回累计影响行数
+
+    某一块失败时抛出异常，之前的块已经提交。
+    """
+    affected = 0
+    for chunk in chunked(items, chunk_size or settings.DATABASE_BULK_CHUNK_SIZE):
+        affected += await run_write(session, lambda sync_session, chunk=chunk: work(sync_session, chunk))
+    return affected
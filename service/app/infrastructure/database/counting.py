@@ -0,0 +1,98 @@
+"""
+分页总数
+客户端通过 total 参数选择总数的计算方式:
+    exact     精确总数：命中缓存时只查当前页，否则用 COUNT(*) OVER() 在同一条语句中取回当前页与总数
+    estimate  估算总数：无过滤条件时按主键范围或数据库统计信息估算，有过滤条件时退回 exact
+    none      不计算总数
+"""
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import Integer, func, select, text
+from sqlalchemy.sql import Select
+
+from app.infrastructure.cache.count_cache import count_cache
+from shared.kernel.exceptions import ValidationException
+
+TOTAL_MODES = ("exact", "estimate", "none")
+
+TOTAL_COLUMN = "_total_count"
+
+
+def check_total_mode(total_mode: str) -> str:
+    """校验总数模式"""
+    if total_mode not in TOTAL_MODES:
+        raise ValidationException(f"total 只能是 {'/'.join(TOTAL_MODES)}")
+    return total_mode
+
+
+def cache_key(statement: Select) -> Tuple[str, str]:
+    """由查询生成缓存键: (表名, 过滤条件及参数)"""
+    tables = ",".join(sorted(getattr(table, "name", str(table)) for table in statement.get_final_froms()))
+    where = statement.whereclause
+    if where is None:
+        return tables, ""
+    compiled = where.compile()
+    return tables, f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])!r}"
+
+
+def _estimate_statement(table, dialect_name: str):
+    """估算整表行数的语句：MySQL 读统计信息，整数单列主键按主键范围，否则精确计数"""
+    if dialect_name == "mysql":
+        return text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ).bindparams(table_name=table.name)
+    primary_key = list(table.primary_key.columns)
+    if len(primary_key) == 1 and isinstance(primary_key[0].type, Integer):
+        column = primary_key[0]
+        return select(func.coalesce(func.max(column) - func.min(column) + 1, 0))
+    return select(func.count()).select_from(table)
+
+
+def estimate_total(session, model: Any) -> int:
+    """估算整表行数（同步会话）"""
+    table = model.__table__
+    statement = _estimate_statement(table, session.get_bind().dialect.name)
+    return int(session.execute(statement).scalar() or 0)
+
+
+def paginate_with_total(query, page: int, page_size: int, total_mode: str = "exact") -> Tuple[List[Any], Optional[int]]:
+    """按页码分页并按 total_mode 返回总数（参数为 session.query(...) 返回的查询对象）"""
+    check_total_mode(total_mode)
+    offset = (page - 1) * page_size
+    page_query = query.offset(offset).limit(page_size)
+    if total_mode == "none":
+        return page_query.all(), None
+
+    if total_mode == "estimate" and query.whereclause is None:
+        entity = query.column_descriptions[0]["entity"]
+        return page_query.all(), estimate_total(query.session, entity)
+
+    table, key = cache_key(query.statement)
+    total = count_cache.get(table, key)
+    if total is not None:
+        return page_query.all(), total
+    generation = count_cache.generation(table)
+
+    rows = page_query.add_columns(func.count().over().label(TOTAL_COLUMN)).all()
+    if rows:
+        items = [row[0] for row in rows]
+        total = rows[0][-1]
+    else:
+        # 页码超出范围时窗口函数没有返回行，单独计数
+        items = []
+        total = query.order_by(None).count() if offset else 0
+    count_cache.set(table, key, total, generation)
+    return items, total
+
+
+async def cached_count(session, statement: Select) -> int:
+    """带缓存的精确计数（异步会话），statement 为不带分页的实体查询"""
+    table, key = cache_key(statement)
+    total = count_cache.get(table, key)
+    if total is None:
+        generation = count_cache.generation(table)
+        count_statement = select(func.count()).select_from(statement.order_by(None).subquery())
+        total = (await session.execute(count_statement)).scalar_one()
+        count_cache.set(table, key, total, generation)
+    return total
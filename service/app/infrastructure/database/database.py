@@ -1,20 +1,17 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import settings
+from app.infrastructure.database.engine_registry import engine_registry
+from app.infrastructure.auth.permission_tracking import permission_tracker
 
-# 创建数据库引擎
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True
-)
+# 数据库引擎由引擎注册表统一创建
+engine = engine_registry.get_sync_engine()
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 同步路由提交用户、角色、菜单变更后使主体缓存与权限版本失效
+permission_tracker.install(SessionLocal)
+
 # 创建基础模型类
 Base = declarative_base()
 
@@ -22,6 +19,16 @@ Base = declarative_base()
 def get_db():
     """获取数据库会话"""
     db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db():
+    """获取只读数据库会话（配置了只读副本时绑定到副本）"""
+    db = SessionLocal(bind=engine_registry.get_sync_engine(engine_registry.route(read_only=True)))
+    db.info["read_only"] = True
     try:
         yield db
     finally:
@@ -0,0 +1,248 @@
+"""
+数据库引擎注册表
+统一创建和持有同步、异步引擎，连接池参数来自配置，并统计连接池的实时使用情况
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import create_engine, event, exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.infrastructure.cache.count_cache import count_cache
+from app.infrastructure.database.loop_guard import event_loop_guard
+from app.infrastructure.database.query_stats import query_instrumentation
+from app.infrastructure.database.sqlite_profile import install_sqlite_profile
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+class PoolMetrics:
+    """连接池获取连接的等待统计"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": self.total_wait / attempts * 1000 if attempts else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+def _instrumented(pool_class: Type[QueuePool]) -> Type[QueuePool]:
+    """为连接池类增加获取连接的等待时间与超时统计"""
+
+    class InstrumentedPool(pool_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.metrics = PoolMetrics()
+
+        def _do_get(self):
+            started_at = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except sa_exc.TimeoutError:
+                self.metrics.record(time.perf_counter() - started_at, timed_out=True)
+                raise
+            self.metrics.record(time.perf_counter() - started_at, timed_out=False)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+InstrumentedQueuePool = _instrumented(QueuePool)
+InstrumentedAsyncQueuePool = _instrumented(AsyncAdaptedQueuePool)
+
+
+def to_async_url(url: str) -> str:
+    """将同步驱动的数据库地址转换为异步驱动"""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.endswith(":memory:") or url.split("://", 1)[1] in ("", "/"))
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """获取连接池的实时状态"""
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
+
+
+class EngineRegistry:
+    """数据库引擎注册表
+
+    同一名称与地址的同步、异步引擎只创建一次；基于文件的数据库使用带统计的 QueuePool，
+    内存 SQLite 保持 SQLAlchemy 默认的单连接池。SQLite 引擎在连接时应用调优 PRAGMA。
+
+    登记了 replica 时，只读请求路由到副本；主库最近一次提交后的 replica_max_lag 秒内
+    只读请求仍走主库，避免读到副本尚未同步的数据。
+    """
+
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_timeout: float = 30,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        isolation_level: Optional[str] = None,
+        replica_max_lag: float = 0
+    ):
+        self.url = url
+        self.echo = echo
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self.isolation_level = isolation_level
+        self.replica_max_lag = replica_max_lag
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+        self._sync_engines: Dict[str, Engine] = {}
+        self._async_engines: Dict[str, AsyncEngine] = {}
+        self._urls: Dict[str, str] = {"default": url}
+
+    def register(self, name: str, url: str) -> None:
+        """登记额外的数据库地址（如只读副本）"""
+        with self._lock:
+            self._urls[name] = url
+
+    def has(self, name: str) -> bool:
+        """是否登记了指定名称的数据库"""
+        return name in self._urls
+
+    def record_write(self) -> None:
+        """记录主库提交时间"""
+        self._last_write = time.monotonic()
+
+    def route(self, read_only: bool = False) -> str:
+        """按读写意图选择引擎名称"""
+        if not read_only or not self.has("replica"):
+            return "default"
+        if time.monotonic() - self._last_write < self.replica_max_lag:
+            return "default"
+        return "replica"
+
+    def _prepare(self, name: str, engine: Engine) -> None:
+        """应用 SQLite 调优与 SQL 统计；主库记录提交时间并在写入时使总数缓存失效"""
+        install_sqlite_profile(engine, read_only=name != "default")
+        query_instrumentation.install(engine)
+        if name == "default":
+            event.listen(engine, "commit", lambda connection: self.record_write())
+            count_cache.install(engine)
+
+    def engine_options(self, url: str, is_async: bool = False) -> Dict[str, Any]:
+        """生成引擎参数"""
+        options: Dict[str, Any] = {
+            "echo": self.echo,
+            "pool_pre_ping": self.pool_pre_ping,
+            "pool_recycle": self.pool_recycle,
+        }
+        if self.isolation_level:
+            options["isolation_level"] = self.isolation_level
+        if not _is_memory_sqlite(url):
+            options.update(
+                poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+            )
+        return options
+
+    def get_sync_engine(self, name: str = "default") -> Engine:
+        """获取同步引擎（在事件循环线程中执行查询会被阻塞检测记录）"""
+        with self._lock:
+            engine = self._sync_engines.get(name)
+            if engine is None:
+                url = self._urls[name]
+                engine = create_engine(url, **self.engine_options(url))
+                self._prepare(name, engine)
+                event_loop_guard.install(engine)
+                self._sync_engines[name] = engine
+            return engine
+
+    def get_async_engine(self, name: str = "default") -> AsyncEngine:
+        """获取异步引擎"""
+        with self._lock:
+            engine = self._async_engines.get(name)
+            if engine is None:
+                url = to_async_url(self._urls[name])
+                engine = create_async_engine(url, **self.engine_options(url, is_async=True))
+                self._prepare(name, engine.sync_engine)
+                self._async_engines[name] = engine
+            return engine
+
+    def stats(self) -> Dict[str, Any]:
+        """获取所有引擎的连接池状态"""
+        with self._lock:
+            sync_engines = dict(self._sync_engines)
+            async_engines = dict(self._async_engines)
+        result: Dict[str, Any] = {}
+        for name, engine in sync_engines.items():
+            result[f"{name}:sync"] = pool_stats(engine.pool)
+        for name, engine in async_engines.items():
+            result[f"{name}:async"] = pool_stats(engine.sync_engine.pool)
+        return result
+
+    async def dispose(self) -> None:
+        """释放所有引擎的连接"""
+        with self._lock:
+            sync_engines = list(self._sync_engines.values())
+            async_engines = list(self._async_engines.values())
+        for engine in async_engines:
+            await engine.dispose()
+        for engine in sync_engines:
+            engine.dispose()
+
+
+# 创建全局引擎注册表
+engine_registry = EngineRegistry(
+    settings.DATABASE_URL,
+    echo=settings.DATABASE_ECHO,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    isolation_level=settings.DATABASE_ISOLATION_LEVEL,
+    replica_max_lag=settings.DATABASE_REPLICA_MAX_LAG
+)
+
+# 配置了只读副本时登记副本地址
+if settings.DATABASE_REPLICA_URL:
+    engine_registry.register("replica", settings.DATABASE_REPLICA_URL)
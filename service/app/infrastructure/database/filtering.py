@@ -0,0 +1,210 @@
+"""
+仓储过滤引擎
+把 filter_by 的条件（字段名__操作符=值）转换为查询，并根据表上的索引判断条件能否走索引。
+
+操作符:
+    （无）/eq  等于              ne  不等于
+    in         属于列表          gt/gte/lt/lte  范围比较
+    isnull     为空/不为空       startswith  前缀匹配（转换为范围条件，可使用普通索引）
+    iexact     忽略大小写等于（MySQL 默认排序规则本身忽略大小写，直接比较；其他数据库需要 lower(列) 表达式索引）
+    like       包含（%值%），任何索引都无法使用，仅为兼容保留
+
+无索引可用的条件与排序按 mode 处理: allow 放行, warn 记录日志（同一条件只记录一次）, reject 抛出 ValidationException
+"""
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import Column, UniqueConstraint, and_, func, select
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.functions import FunctionElement
+
+from shared.kernel.config import get_settings
+from shared.kernel.exceptions import ValidationException
+
+settings = get_settings()
+
+MODES = ("allow", "warn", "reject")
+
+CASE_INSENSITIVE_DIALECTS = ("mysql", "mariadb")
+
+
+@dataclass(frozen=True)
+class IndexCatalog:
+    """表上可用的索引：leading 为某个索引的首列，lowered 为有 lower(列) 表达式索引的列"""
+    leading: frozenset
+    lowered: frozenset
+
+
+def _ddl_applies(index: Any, dialect: Optional[str]) -> bool:
+    """索引是否会在该数据库上创建（Index.ddl_if 限定了数据库时）"""
+    ddl_if = getattr(index, "_ddl_if", None)
+    if ddl_if is None or ddl_if.dialect is None or dialect is None:
+        return True
+    dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+    return dialect in dialects
+
+
+@lru_cache(maxsize=None)
+def index_catalog(table: Any, dialect: Optional[str] = None) -> IndexCatalog:
+    """收集表上的索引首列与 lower() 表达式索引（按表和数据库缓存）"""
+    leading: Set[str] = set()
+    lowered: Set[str] = set()
+    primary_key = list(table.primary_key.columns)
+    if primary_key:
+        leading.add(primary_key[0].key)
+    for column in table.columns:
+        if column.index or column.unique:
+            leading.add(column.key)
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and len(constraint.columns):
+            leading.add(list(constraint.columns)[0].key)
+    for index in table.indexes:
+        if not _ddl_applies(index, dialect) or not index.expressions:
+            continue
+        first = index.expressions[0]
+        if isinstance(first, Column):
+            leading.add(first.key)
+        elif isinstance(first, str):
+            leading.add(first)
+        elif isinstance(first, FunctionElement) and first.name.lower() == "lower":
+            columns = [c for c in first.clauses if isinstance(c, Column)]
+            if columns:
+                lowered.add(columns[0].key)
+    return IndexCatalog(frozenset(leading), frozenset(lowered))
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """前缀范围的上界：最后一个字符加一"""
+    if not prefix or ord(prefix[-1]) >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class FilterEngine:
+    """按模型构建过滤、排序与分页查询"""
+
+    def __init__(self, model: Any, dialect: Optional[str] = None, mode: Optional[str] = None):
+        mode = mode or settings.DATABASE_FILTER_UNINDEXED
+        if mode not in MODES:
+            raise ValueError(f"不支持的无索引条件处理方式: {mode}")
+        self.model = model
+        self.table = model.__table__
+        self.dialect = dialect
+        self.mode = mode
+        self.catalog = index_catalog(self.table, dialect)
+
+    def _column(self, name: str) -> Any:
+        if name not in self.table.columns:
+            raise ValidationException(f"不支持的过滤字段: {name}")
+        return getattr(self.model, name)
+
+    def _predicate(self, key: str, value: Any) -> Tuple[Any, bool]:
+        """生成单个过滤条件，返回 (表达式, 是否能走索引)"""
+        name, _, operator = key.partition("__")
+        operator = operator or "eq"
+        column = self._column(name)
+        indexed = name in self.catalog.leading
+
+        if operator == "eq":
+            return column == value, indexed
+        if operator == "ne":
+            return column != value, False
+        if operator == "in":
+            return column.in_(value), indexed
+        if operator == "gt":
+            return column > value, indexed
+        if operator == "gte":
+            return column >= value, indexed
+        if operator == "lt":
+            return column < value, indexed
+        if operator == "lte":
+            return column <= value, indexed
+        if operator == "isnull":
+            return (column.is_(None) if value else column.is_not(None)), indexed
+        if operator == "startswith":
+            upper = _prefix_upper_bound(value)
+            if upper is None:
+                return column >= value, indexed
+            return and_(column >= value, column < upper), indexed
+        if operator == "iexact":
+            if self.dialect in CASE_INSENSITIVE_DIALECTS:
+                return column == value, indexed
+            return func.lower(column) == str(value).lower(), name in self.catalog.lowered
+        if operator == "like":
+            return column.like(f"%{value}%"), False
+        raise ValidationException(f"不支持的过滤操作符: {operator}")
+
+    def _check(self, description: str) -> None:
+        """处理无索引可用的条件"""
+        if self.mode == "reject":
+            raise ValidationException(f"{self.table.name}.{description} 无可用索引")
+        if self.mode == "warn":
+            _warn_once(self.table.name, description)
+
+    def where(self, conditions: Dict[str, Any]) -> List[Any]:
+        """转换过滤条件"""
+        predicates = []
+        for key, value in conditions.items():
+            predicate, indexed = self._predicate(key, value)
+            if not indexed:
+                self._check(key)
+            predicates.append(predicate)
+        return predicates
+
+    def order(self, order_by: Sequence[str]) -> List[Any]:
+        """转换排序字段（-字段 表示倒序）"""
+        clauses = []
+        for field_name in order_by:
+            descending = field_name.startswith("-")
+            name = field_name.lstrip("-")
+            column = self._column(name)
+            if name not in self.catalog.leading:
+                self._check(f"order_by {name}")
+            clauses.append(column.desc() if descending else column.asc())
+        return clauses
+
+    def statement(
+        self,
+        conditions: Dict[str, Any],
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Select:
+        """构建查询"""
+        statement = select(self.model).where(*self.where(conditions))
+        if order_by:
+            statement = statement.order_by(*self.order(order_by))
+        if offset:
+            statement = statement.offset(offset)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
+
+
+_warned: Set[Tuple[str, str]] = set()
+_warned_lock = threading.Lock()
+
+
+def _warn_once(table: str, description: str) -> None:
+    with _warned_lock:
+        if (table, description) in _warned:
+            return
+        _warned.add((table, description))
+    logger.warning(f"{table}.{description} 无可用索引，将扫描全表")
+
+
+def filter_statement(
+    session: Any,
+    model: Any,
+    conditions: Dict[str, Any],
+    order_by: Optional[Sequence[str]] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None
+) -> Select:
+    """按会话绑定的数据库构建过滤查询"""
+    bind = session.bind
+    dialect = bind.dialect.name if bind is not None else None
+    return FilterEngine(model, dialect).statement(conditions, order_by, limit, offset)
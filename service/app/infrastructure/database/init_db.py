@@ -2,6 +2,7 @@ import os
 import sqlite3
 from sqlalchemy.orm import Session
 from app.infrastructure.database.database import SessionLocal, engine, Base
+from app.infrastructure.database.sqlite_profile import connect_sqlite
 from app.domain.user.entities.user import User, UserRole, UserSession, UserProfile
 from app.domain.role.entities.role import Role, RoleMenu
 from app.domain.menu.entities.menu import Menu, MenuMeta
@@ -24,7 +25,7 @@ def execute_sql_file(db_path: str, sql_file_path: str):
         return
     
     try:
-        with sqlite3.connect(db_path) as conn:
+        with connect_sqlite(db_path) as conn:
             with open(sql_file_path, 'r', encoding='utf-8') as file:
                 sql_content = file.read()
                 # 执行多条SQL语句
@@ -55,7 +56,7 @@ def init_database_with_sql():
     if os.path.exists(db_path):
         # 检查数据库是否有数据
         try:
-            with sqlite3.connect(db_path) as conn:
+            with connect_sqlite(db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM system_userinfo")
                 user_count = cursor.fetchone()[0]
@@ -98,7 +99,7 @@ def init_database_with_sql():
         admin_hash = auth_service.get_password_hash(admin_password)
         common_hash = auth_service.get_password_hash(common_password)
         
-        with sqlite3.connect(db_path) as conn:
+        with connect_sqlite(db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("UPDATE system_userinfo SET password = ? WHERE username = 'admin'", (admin_hash,))
             cursor.execute("UPDATE system_userinfo SET password = ? WHERE username = 'common'", (common_hash,))
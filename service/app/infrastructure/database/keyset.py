@@ -0,0 +1,146 @@
+"""
+游标（keyset）分页
+按稳定的排序键（如 created_time, id）定位下一页，查询代价与翻页深度无关。
+游标是排序键值的 base64 编码，对客户端不透明。
+"""
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import Select
+
+from shared.kernel.exceptions import ValidationException
+
+NEXT = "n"
+PREV = "p"
+
+
+@dataclass
+class KeysetPage:
+    """游标分页结果"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+@dataclass
+class SortKey:
+    """排序键
+
+    columns 为排序列（最后一列必须唯一，通常是主键），descending 表示整体倒序。
+    """
+    columns: Sequence[Any]
+    descending: bool = True
+    names: List[str] = field(init=False)
+
+    def __post_init__(self):
+        self.names = [column.key for column in self.columns]
+
+    def values(self, item: Any) -> Tuple[Any, ...]:
+        """取出实体的排序键值"""
+        return tuple(getattr(item, name) for name in self.names)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any], direction: str = NEXT) -> str:
+    """编码游标"""
+    payload = json.dumps([direction, [_encode_value(v) for v in values]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[str, Tuple[Any, ...]]:
+    """解码游标，格式不正确时抛出 ValidationException"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if direction not in (NEXT, PREV) or len(values) != size:
+            raise ValueError
+        return direction, tuple(_decode_value(v) for v in values)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise ValidationException("无效的分页游标")
+
+
+def _after(key: SortKey, values: Tuple[Any, ...], forward: bool):
+    """生成位于游标之后（按遍历方向）的条件: (a, b) > (x, y) 展开为 a > x OR (a = x AND b > y)"""
+    ascending = key.descending != forward
+    clauses = []
+    for i, column in enumerate(key.columns):
+        equal = [key.columns[j] == values[j] for j in range(i)]
+        compare = column > values[i] if ascending else column < values[i]
+        clauses.append(and_(*equal, compare))
+    return or_(*clauses)
+
+
+def _plan(key: SortKey, cursor: Optional[str]) -> Tuple[str, Optional[Any], List[Any]]:
+    """解析游标，返回方向、过滤条件与排序"""
+    direction = NEXT
+    condition = None
+    if cursor:
+        direction, values = decode_cursor(cursor, len(key.columns))
+        condition = _after(key, values, direction == NEXT)
+    ascending = key.descending != (direction == NEXT)
+    order = [column.asc() if ascending else column.desc() for column in key.columns]
+    return direction, condition, order
+
+
+def keyset_statement(stmt: Select, key: SortKey, limit: int, cursor: Optional[str] = None) -> Tuple[Select, str]:
+    """为查询加上游标条件、排序和 limit（多取一行用于判断是否还有下一页），返回查询与方向"""
+    direction, condition, order = _plan(key, cursor)
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return stmt.order_by(None).order_by(*order).limit(limit + 1), direction
+
+
+def keyset_page(rows: Sequence[Any], key: SortKey, limit: int, cursor: Optional[str], direction: str) -> KeysetPage:
+    """根据多取一行的查询结果生成分页结果与前后游标"""
+    items = list(rows[:limit])
+    more = len(rows) > limit
+    if direction == PREV:
+        items.reverse()
+    if not items:
+        return KeysetPage(items=[])
+    has_next = more if direction == NEXT else True
+    has_prev = bool(cursor) if direction == NEXT else more
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(key.values(items[-1]), NEXT) if has_next else None,
+        prev_cursor=encode_cursor(key.values(items[0]), PREV) if has_prev else None
+    )
+
+
+def paginate_query(query, key: SortKey, limit: int, cursor: Optional[str] = None) -> KeysetPage:
+    """同步会话的游标分页（参数为 session.query(...) 返回的查询对象）"""
+    direction, condition, order = _plan(key, cursor)
+    if condition is not None:
+        query = query.filter(condition)
+    rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+    return keyset_page(rows, key, limit, cursor, direction)
+
+
+async def paginate_async(session, stmt: Select, key: SortKey, limit: int, cursor: Optional[str] = None) -> KeysetPage:
+    """异步会话的游标分页"""
+    stmt, direction = keyset_statement(stmt, key, limit, cursor)
+    rows = (await session.execute(stmt)).scalars().all()
+    return keyset_page(rows, key, limit, cursor, direction)
@@ -0,0 +1,92 @@
+"""
+事件循环阻塞检测
+同步引擎执行 SQL 时检查当前线程是否正在运行事件循环，在事件循环线程中执行同步查询会阻塞所有并发请求。
+
+mode 取值:
+    off    不检测
+    warn   记录调用位置（同一位置只记录一次日志）
+    raise  抛出 BlockingDatabaseCallError，用于开发与测试环境
+"""
+import asyncio
+import threading
+import traceback
+from collections import Counter
+from typing import Any, Dict
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+MODES = ("off", "warn", "raise")
+
+
+class BlockingDatabaseCallError(RuntimeError):
+    """在事件循环线程中执行了同步数据库调用"""
+
+
+def in_event_loop() -> bool:
+    """当前线程是否正在运行事件循环"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _call_site() -> str:
+    """定位触发查询的应用代码位置（跳过 SQLAlchemy 与本模块的栈帧）"""
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        if frame.filename == __file__ or "/sqlalchemy/" in frame.filename.replace("\\", "/"):
+            continue
+        return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class EventLoopGuard:
+    """同步引擎的事件循环阻塞检测"""
+
+    def __init__(self, mode: str = "warn"):
+        if mode not in MODES:
+            raise ValueError(f"不支持的检测模式: {mode}")
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._violations: Counter = Counter()
+
+    def install(self, engine: Engine) -> None:
+        """为同步引擎注册检测（异步引擎的 sync_engine 本身就运行在事件循环中，不要注册）"""
+        if self.mode == "off":
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if not in_event_loop():
+            return
+        site = _call_site()
+        with self._lock:
+            self._violations[site] += 1
+            first = self._violations[site] == 1
+        if self.mode == "raise":
+            raise BlockingDatabaseCallError(f"事件循环中执行了同步数据库调用: {site}")
+        if first:
+            logger.warning(f"事件循环中执行了同步数据库调用（{site}）: {statement[:200]}")
+
+    def stats(self) -> Dict[str, Any]:
+        """获取检测统计"""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "blocking_calls": sum(self._violations.values()),
+                "call_sites": dict(self._violations.most_common(20)),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._violations.clear()
+
+
+# 创建全局事件循环阻塞检测
+event_loop_guard = EventLoopGuard(settings.DATABASE_LOOP_GUARD)
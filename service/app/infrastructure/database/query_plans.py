@@ -0,0 +1,233 @@
+"""
+热点查询执行计划检查
+对仓储和服务中的热点查询执行 EXPLAIN QUERY PLAN（SQLite），出现以下情况视为未走索引:
+    SCAN 表名              全表扫描（SCAN 表名 USING INDEX/COVERING INDEX 为按索引顺序遍历，不算）
+    USE TEMP B-TREE        排序或去重没有可用的索引
+
+仓储查询由仓储实际使用的构造生成，不手写 SQL:
+    过滤      FilterEngine.statement（filter_by / find_by_*）
+    游标分页  keyset_statement + SortKey（get_page）
+    关联加载  user_options(FULL) 的 selectinload，在回滚的事务中执行并捕获实际发出的语句
+前两类按 SQLite 方言以 literal_binds 编译；仍使用原生 SQL 的旧服务（菜单、部门、日志、会话）保留手写查询，
+修改这些服务或索引（db/init/03_create_indexes.sql）时同步更新。
+"""
+import re
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.database.filtering import FilterEngine
+from app.infrastructure.database.keyset import SortKey, encode_cursor, keyset_statement
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.menu import MenuModel
+from app.infrastructure.persistence.sqlalchemy.models.role import (
+    DataPermission,
+    FieldPermission,
+    UserRole,
+    datapermission_menu_association,
+    role_menu_association,
+)
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo, user_role_association
+from app.infrastructure.persistence.sqlalchemy.repositories.hydration import FULL, user_options
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+TEMP_B_TREE = "USE TEMP B-TREE"
+TABLES = re.compile(r"(?:FROM|JOIN) (\w+)")
+PAGE_SIZE = 20
+SAMPLE_ID = "query_plans"
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """热点查询：name 为查询名，source 为发出该查询的仓储/服务方法，params 为 sql 中占位符的参数"""
+    name: str
+    source: str
+    sql: str
+    params: Tuple[Any, ...] = ()
+
+
+def compiled_sql(statement: Any) -> str:
+    """按 SQLite 方言编译查询，参数以字面量内联"""
+    return str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _filter(name: str, source: str, model: Any, conditions: dict) -> HotQuery:
+    return HotQuery(name, source, compiled_sql(FilterEngine(model, "sqlite", mode="allow").statement(conditions)))
+
+
+def _page(name: str, source: str, cursor: Optional[str] = None) -> HotQuery:
+    key = SortKey([UserInfo.created_time, UserInfo.id])
+    statement, _ = keyset_statement(select(UserInfo), key, PAGE_SIZE, cursor)
+    return HotQuery(name, source, compiled_sql(statement))
+
+
+REPOSITORY_QUERIES: Tuple[HotQuery, ...] = (
+    # 用户
+    _filter("user_by_id", "SQLAlchemyUserRepository.get_by_id", UserInfo, {"id": "1"}),
+    _filter("user_by_username", "SQLAlchemyUserRepository.find_by_username / find_for_login",
+            UserInfo, {"username": "admin"}),
+    _filter("user_by_email", "SQLAlchemyUserRepository.find_by_email", UserInfo, {"email": "admin@example.com"}),
+    _filter("user_by_phone", "SQLAlchemyUserRepository.filter_by(phone=)", UserInfo, {"phone": "15888886789"}),
+    _filter("user_by_username_iexact", "SQLAlchemyUserRepository.filter_by(username__iexact=)",
+            UserInfo, {"username__iexact": "admin"}),
+    _filter("user_by_username_prefix", "SQLAlchemyUserRepository.filter_by(username__startswith=)",
+            UserInfo, {"username__startswith": "ad"}),
+    _filter("user_by_dept", "SQLAlchemyUserRepository.find_by_dept", UserInfo, {"dept_id": "d1"}),
+    _page("user_page", "SQLAlchemyBaseRepository.get_page"),
+    _page("user_page_after_cursor", "SQLAlchemyBaseRepository.get_page(cursor=)",
+          encode_cursor([datetime(2026, 1, 1), "9"])),
+
+    # 角色
+    _filter("role_by_name", "SQLAlchemyRoleRepository.find_by_name", UserRole, {"name": "超级管理员"}),
+)
+
+SERVICE_QUERIES: Tuple[HotQuery, ...] = (
+    HotQuery("user_sessions_by_user", "UserApplicationService.delete_user / lock_user / reset_password",
+             "UPDATE user_sessions SET is_active = 0 WHERE user_id = '1'"),
+
+    # 角色
+    HotQuery("role_by_code", "SystemService.create_role",
+             "SELECT * FROM system_userrole WHERE code = 'admin'"),
+    HotQuery("roles_of_user", "SQLAlchemyRoleRepository.find_by_user_id",
+             "SELECT system_userrole.* FROM system_userrole "
+             "JOIN system_userinfo_roles ON system_userrole.id = system_userinfo_roles.userrole_id "
+             "WHERE system_userinfo_roles.userinfo_id = '1'"),
+    HotQuery("role_in_use", "SystemService.delete_role",
+             "SELECT * FROM system_userinfo_roles WHERE userrole_id = 'r1' LIMIT 1"),
+    HotQuery("role_menu_ids", "SystemService.get_role_menu_ids",
+             "SELECT menu_id FROM system_userrole_menu WHERE userrole_id = 'r1'"),
+
+    # 菜单
+    HotQuery("menu_by_name", "MenuService.get_menu_by_name",
+             "SELECT * FROM system_menu WHERE name = 'SystemUser'"),
+    HotQuery("menu_list", "MenuService.get_all_menus / get_menus_paginated",
+             "SELECT * FROM system_menu ORDER BY rank ASC, id ASC LIMIT 10 OFFSET 0"),
+    HotQuery("menu_children", "MenuService.has_children",
+             "SELECT count(*) FROM system_menu WHERE parent_id = 'm1'"),
+    HotQuery("menu_in_use", "MenuService.check_menu_in_use",
+             "SELECT count(*) FROM system_userrole_menu WHERE menu_id = 'm1'"),
+
+    # 部门
+    HotQuery("dept_children", "PermissionDomainService._get_dept_and_children_ids",
+             "SELECT * FROM system_deptinfo WHERE parent_id = 'd1'"),
+
+    # 日志
+    HotQuery("login_log_page", "SystemService.get_login_logs",
+             "SELECT * FROM system_userloginlog ORDER BY created_time DESC, id DESC LIMIT 21"),
+    HotQuery("operation_log_page", "SystemService.get_operation_logs",
+             "SELECT * FROM system_operationlog ORDER BY created_time DESC, id DESC LIMIT 21"),
+)
+
+HOT_QUERIES: Tuple[HotQuery, ...] = REPOSITORY_QUERIES + SERVICE_QUERIES
+
+
+def _sample_value(column: Any) -> Any:
+    """按列类型生成样例值"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type is datetime:
+        return datetime(2026, 1, 1)
+    if python_type is bool:
+        return True
+    if python_type is int:
+        return 0
+    if python_type in (dict, list):
+        return {}
+    if python_type is str:
+        return f"{SAMPLE_ID}_{column.name}"[:getattr(column.type, "length", None) or None]
+    return None
+
+
+def _insert_sample(connection: Any, table: Any, **values: Any) -> None:
+    """写入一行样例数据，未指定的列按类型填充，自增主键由数据库生成"""
+    row = {
+        column.name: _sample_value(column) for column in table.columns
+        if column is not table.autoincrement_column
+    }
+    row.update(values)
+    connection.execute(insert(table).prefix_with("OR IGNORE").values(**row))
+
+
+def _seed_samples(connection: Any) -> None:
+    """写入一条 用户-角色-菜单-数据权限/字段权限 的关联链，使 selectinload 逐层发出查询"""
+    _insert_sample(connection, UserInfo.__table__, id=SAMPLE_ID, dept_id=None)
+    _insert_sample(connection, UserRole.__table__, id=SAMPLE_ID)
+    _insert_sample(connection, MenuModel.__table__, id=SAMPLE_ID, parent_id=None)
+    _insert_sample(connection, DataPermission.__table__, id=SAMPLE_ID)
+    _insert_sample(connection, FieldPermission.__table__, id=SAMPLE_ID, menu_id=SAMPLE_ID, role_id=SAMPLE_ID)
+    _insert_sample(connection, user_role_association, userinfo_id=SAMPLE_ID, userrole_id=SAMPLE_ID)
+    _insert_sample(connection, role_menu_association, userrole_id=SAMPLE_ID, menu_id=SAMPLE_ID)
+    _insert_sample(connection, datapermission_menu_association, datapermission_id=SAMPLE_ID, menu_id=SAMPLE_ID)
+
+
+def _hydration_queries(connection: Any) -> List[HotQuery]:
+    """执行 user_options(FULL) 的查询，捕获主查询之后 selectinload 发出的语句"""
+    statements: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, tuple(parameters)))
+
+    session = Session(bind=connection)
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        session.execute(select(UserInfo).where(UserInfo.id == SAMPLE_ID).options(*user_options(FULL))).scalars().all()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    queries = []
+    for sql, params in statements[1:]:
+        name = "->".join(TABLES.findall(sql))
+        queries.append(HotQuery(f"load {name}", "hydration.user_options(FULL)", sql, params))
+    return queries
+
+
+@contextmanager
+def hot_queries(conn: sqlite3.Connection) -> Iterator[List[HotQuery]]:
+    """全部热点查询（含关联加载）
+
+    关联加载需要实际执行：在一个事务中补建仅由模型定义的表（create_all）、写入样例数据并捕获语句，
+    退出时回滚，对传入的数据库不留任何改动；检查执行计划须在 with 块内完成。
+    """
+    engine = create_engine("sqlite://", creator=lambda: conn, poolclass=StaticPool)
+    with engine.connect() as connection:
+        conn.execute("BEGIN")
+        try:
+            Base.metadata.create_all(connection)
+            _seed_samples(connection)
+            yield list(HOT_QUERIES) + _hydration_queries(connection)
+        finally:
+            conn.rollback()
+
+
+def explain(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[str]:
+    """返回执行计划每一步的描述"""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params))]
+
+
+def plan_problems(plan: Sequence[str]) -> List[str]:
+    """执行计划中未走索引的步骤"""
+    return [step for step in plan if FULL_SCAN.match(step) or step.startswith(TEMP_B_TREE)]
+
+
+def check_query_plans(
+    conn: sqlite3.Connection,
+    queries: Optional[Sequence[HotQuery]] = None
+) -> List[Tuple[HotQuery, List[str]]]:
+    """检查热点查询的执行计划，返回未走索引的查询及其执行计划；queries 为空时检查全部热点查询"""
+    if queries is None:
+        with hot_queries(conn) as queries:
+            return check_query_plans(conn, queries)
+    failures = []
+    for query in queries:
+        plan = explain(conn, query.sql, query.params)
+        if plan_problems(plan):
+            failures.append((query, plan))
+    return failures
@@ -0,0 +1,166 @@
+"""
+请求级 SQL 统计
+引擎执行语句时把语句数、耗时和语句指纹记入当前请求的统计（contextvar），
+请求结束后汇总到全局指标；同一语句形状在一次请求中执行超过阈值次数时记录警告（通常是 N+1 查询）。
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMS = re.compile(r"\(\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+_current: ContextVar[Optional["RequestQueryStats"]] = ContextVar("request_query_stats", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """语句形状：去掉字面量、合并 IN 参数列表与空白"""
+    text = _STRING.sub("?", statement)
+    text = _NUMBER.sub("?", text)
+    text = _PARAMS.sub("(?)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+@dataclass
+class RequestQueryStats:
+    """一次请求的 SQL 统计"""
+    statements: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest: Optional[str] = None
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.total_ms += elapsed_ms
+        self.shapes[fingerprint(statement)] += 1
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """执行次数超过阈值的语句形状"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def server_timing(self) -> str:
+        """Server-Timing 响应头"""
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.statements} queries", '
+            f"db-slowest;dur={self.slowest_ms:.2f}"
+        )
+
+
+class QueryInstrumentation:
+    """SQL 统计
+
+    - install 为引擎注册 before/after_cursor_execute 事件
+    - begin/end 由请求中间件调用，界定一次请求的统计范围；请求之外执行的语句（后台任务、写线程）不统计
+    - 汇总指标记录请求数、语句数、数据库耗时分布以及触发重复告警的语句形状
+    """
+
+    def __init__(self, repeat_threshold: int = 10, enabled: bool = True):
+        self.repeat_threshold = repeat_threshold
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.statements = 0
+        self.total_ms = 0.0
+        self.max_statements = 0
+        self.slowest_ms = 0.0
+        self.slowest: Optional[str] = None
+        self.repeat_warnings = 0
+        self._repeated: Counter = Counter()
+
+    def install(self, engine: Engine) -> None:
+        """为引擎注册统计事件（异步引擎传入 sync_engine）"""
+        if not self.enabled:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        # 开始时间记在本次执行的上下文上：语句抛出异常时随上下文一起丢弃，不会残留在池化连接中
+        if _current.get() is not None and context is not None:
+            context.query_started_at = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        stats = _current.get()
+        started = getattr(context, "query_started_at", None)
+        if stats is None or started is None:
+            return
+        stats.record(statement, (time.perf_counter() - started) * 1000)
+
+    def begin(self) -> Token:
+        """开始统计当前请求"""
+        return _current.set(RequestQueryStats())
+
+    def end(self, token: Token, label: str = "") -> RequestQueryStats:
+        """结束统计，汇总到全局指标并检查重复语句"""
+        stats = _current.get()
+        _current.reset(token)
+        repeated = stats.repeated(self.repeat_threshold)
+        for shape, count in repeated:
+            logger.warning(f"{label} 同一语句执行了 {count} 次，可能存在 N+1 查询: {shape[:200]}")
+        with self._lock:
+            self.requests += 1
+            self.statements += stats.statements
+            self.total_ms += stats.total_ms
+            self.max_statements = max(self.max_statements, stats.statements)
+            if stats.slowest_ms > self.slowest_ms:
+                self.slowest_ms = stats.slowest_ms
+                self.slowest = stats.slowest
+            if repeated:
+                self.repeat_warnings += 1
+                for shape, _ in repeated:
+                    self._repeated[shape] += 1
+        return stats
+
+    @staticmethod
+    def current() -> Optional[RequestQueryStats]:
+        """当前请求的统计"""
+        return _current.get()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取汇总指标"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "requests": self.requests,
+                "statements": self.statements,
+                "avg_statements": self.statements / self.requests if self.requests else 0.0,
+                "max_statements": self.max_statements,
+                "avg_db_ms": self.total_ms / self.requests if self.requests else 0.0,
+                "slowest_ms": self.slowest_ms,
+                "slowest": self.slowest[:500] if self.slowest else None,
+                "repeat_threshold": self.repeat_threshold,
+                "repeat_warnings": self.repeat_warnings,
+                "repeated_shapes": dict(self._repeated.most_common(20)),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = self.statements = self.max_statements = self.repeat_warnings = 0
+            self.total_ms = self.slowest_ms = 0.0
+            self.slowest = None
+            self._repeated.clear()
+
+
+# 创建全局 SQL 统计
+query_instrumentation = QueryInstrumentation(
+    repeat_threshold=settings.SQL_REPEAT_WARN_THRESHOLD,
+    enabled=settings.SQL_INSTRUMENTATION_ENABLED
+)
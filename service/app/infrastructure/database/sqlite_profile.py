@@ -0,0 +1,89 @@
+"""
+SQLite 连接调优
+在每个新连接上执行 PRAGMA，适用于同步引擎、异步引擎和直接使用 sqlite3 的初始化路径。
+
+profile 取值:
+    performance  WAL 日志、synchronous=NORMAL、内存映射、较大的页缓存、内存临时表、忙等待
+    default      不修改 SQLite 默认设置
+"""
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+PROFILES = ("performance", "default")
+
+
+def sqlite_pragmas(profile: Optional[str] = None, read_only: bool = False) -> List[Tuple[str, Any]]:
+    """按配置生成 PRAGMA 列表（busy_timeout 放在最前，切换 WAL 时也能等待锁）
+
+    只读连接不修改日志模式（由主库决定），并开启 query_only 拒绝写入。
+    """
+    profile = profile or settings.SQLITE_PROFILE
+    if profile not in PROFILES:
+        raise ValueError(f"不支持的 SQLite 调优方案: {profile}")
+    if profile == "default":
+        return [("query_only", "ON")] if read_only else []
+    pragmas = [
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        ("journal_mode", "WAL"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        ("cache_size", settings.SQLITE_CACHE_SIZE),
+        ("temp_store", "MEMORY"),
+    ]
+    if read_only:
+        pragmas = [(name, value) for name, value in pragmas if name not in ("journal_mode", "synchronous")]
+        pragmas.append(("query_only", "ON"))
+    return pragmas
+
+
+def apply_pragmas(dbapi_connection: Any, pragmas: List[Tuple[str, Any]]) -> None:
+    """在 DBAPI 连接上执行 PRAGMA"""
+    if not pragmas:
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def install_sqlite_profile(engine: Engine, profile: Optional[str] = None, read_only: bool = False) -> None:
+    """为 SQLite 引擎注册连接时调优（异步引擎传入 sync_engine）"""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(profile, read_only)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
+
+
+def connect_sqlite(path: str, profile: Optional[str] = None, **kwargs: Any) -> sqlite3.Connection:
+    """打开已调优的 sqlite3 连接"""
+    conn = sqlite3.connect(path, **kwargs)
+    apply_pragmas(conn, sqlite_pragmas(profile))
+    return conn
+
+
+def read_pragmas(dbapi_connection: Any) -> Dict[str, Any]:
+    """读取当前连接的调优相关 PRAGMA，便于核对"""
+    cursor = dbapi_connection.cursor()
+    try:
+        result = {}
+        for name in ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout"):
+            cursor.execute(f"PRAGMA {name}")
+            row = cursor.fetchone()
+            result[name] = row[0] if row else None
+        return result
+    finally:
+        cursor.close()
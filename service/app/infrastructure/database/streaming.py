@@ -0,0 +1,27 @@
+"""
+流式读取
+用 AsyncSession.stream() 配合 yield_per 按批取回结果（服务端游标），遍历大表时内存占用与总行数无关。
+"""
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+async def stream_scalars(session: AsyncSession, statement: Select, batch_size: Optional[int] = None) -> AsyncIterator[Any]:
+    """逐个产出查询结果中的实体，每次从数据库取回 batch_size 行
+
+    遍历期间会话的连接被占用，不要在同一会话中穿插执行其他语句。
+    """
+    statement = statement.execution_options(yield_per=batch_size or settings.DATABASE_STREAM_BATCH_SIZE)
+    result = await session.stream(statement)
+    try:
+        async for partition in result.scalars().partitions():
+            for item in partition:
+                yield item
+    finally:
+        await result.close()
@@ -0,0 +1,82 @@
+"""
+请求级工作单元
+一个请求内的所有仓储写操作共用会话上的同一个事务：仓储只执行语句/flush，不再各自提交，
+请求处理完成时统一提交一次；发生异常时整体回滚。需要局部回滚的流程使用 savepoint()。
+
+缓存失效等副作用通过 after_commit 登记，在事务提交后执行，回滚时丢弃。
+"""
+from typing import Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    """请求级工作单元
+
+    用法:
+        async with UnitOfWork(session) as uow:
+            await repo.update(...)
+            async with uow.savepoint():
+                ...
+            await uow.commit()  # 可省略，正常退出时自动提交
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.commits = 0
+        self._callbacks: List[Callable[[], None]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self.session.info[UNIT_OF_WORK_KEY] = self
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            self.session.info.pop(UNIT_OF_WORK_KEY, None)
+
+    def savepoint(self) -> AsyncSessionTransaction:
+        """开启嵌套事务（SAVEPOINT），块内异常只回滚到该保存点"""
+        return self.session.begin_nested()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """登记提交后执行的回调"""
+        self._callbacks.append(callback)
+
+    async def flush(self) -> None:
+        await self.session.flush()
+
+    async def commit(self) -> None:
+        """提交当前事务并执行提交后回调（没有未提交的事务时只执行回调）"""
+        if self.session.in_transaction():
+            await self.session.commit()
+            self.commits += 1
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    async def rollback(self) -> None:
+        """回滚当前事务并丢弃提交后回调"""
+        self._callbacks.clear()
+        if self.session.in_transaction():
+            await self.session.rollback()
+
+
+def current_unit_of_work(session: AsyncSession) -> Optional[UnitOfWork]:
+    """会话所属的工作单元"""
+    return session.info.get(UNIT_OF_WORK_KEY)
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """在工作单元中时登记到提交之后执行，否则立即执行（写操作已各自提交）"""
+    uow = current_unit_of_work(session)
+    if uow is None:
+        callback()
+    else:
+        uow.on_commit(callback)
@@ -0,0 +1,208 @@
+"""
+启动预热
+部署后的首批请求要承担建立连接池连接、配置映射器、编译语句和填充缓存的开销，
+在负载均衡后表现为明显的延迟尖峰。lifespan 在 yield 之前执行预热，完成后才开始接收请求:
+    connections       并发打开 N 个异步连接池连接（不超过 pool_size），全部建立后归还，留作空闲连接
+    sync_connections  同样为同步引擎（主库与只读副本）打开 N 个连接，旧版同步路由使用这些连接池
+    mappers           configure_mappers() 一次性完成所有模型（含旧版同步实体）的关系配置
+    queries           通过仓储执行一次热点查询（按 ID 查用户、角色列表、用户总数），
+                      填充 SQLAlchemy 编译缓存与分页总数缓存
+    sync_queries      直接调用同步路由的处理函数（菜单树、用户列表），执行与真实请求相同的语句
+
+同步步骤在线程池中执行，不阻塞事件循环。
+
+单个步骤失败只记录日志，不阻止启动；超过 timeout 时放弃剩余步骤。
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+class DatabaseWarmup:
+    """数据库连接与缓存预热"""
+
+    def __init__(self, connections: int = 5, timeout: float = 30.0, enabled: bool = True):
+        self.connections = connections
+        self.timeout = timeout
+        self.enabled = enabled
+        self.ready = not enabled
+        self._steps: Dict[str, float] = {}
+        self._errors: List[str] = []
+        self._duration: Optional[float] = None
+
+    async def run(
+        self,
+        engine: Optional[AsyncEngine] = None,
+        sync_engines: Optional[Dict[str, Engine]] = None
+    ) -> bool:
+        """执行预热，返回是否全部步骤成功；无论成败结束后都标记为就绪
+
+        未传入引擎时预热引擎注册表中的异步主库与全部同步引擎；
+        传入 engine 时只预热传入的引擎（sync_engines 为名称到同步引擎的映射，replica 用于只读路由）。
+        """
+        if not self.enabled:
+            self.ready = True
+            return True
+        if engine is None:
+            from app.infrastructure.database.engine_registry import engine_registry
+            engine = engine_registry.get_async_engine()
+            if sync_engines is None:
+                sync_engines = {"default": engine_registry.get_sync_engine()}
+                if engine_registry.has("replica"):
+                    sync_engines["replica"] = engine_registry.get_sync_engine("replica")
+        sync_engines = sync_engines or {}
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._run_steps(engine, sync_engines), self.timeout)
+        except asyncio.TimeoutError:
+            self._errors.append(f"预热超时（{self.timeout}s）")
+            logger.warning(f"数据库预热超过 {self.timeout}s，跳过剩余步骤")
+        finally:
+            self._duration = time.perf_counter() - started
+            self.ready = True
+        logger.info(f"数据库预热完成，耗时 {self._duration * 1000:.0f}ms: {self._steps}")
+        return not self._errors
+
+    async def _run_steps(self, engine: AsyncEngine, sync_engines: Dict[str, Engine]) -> None:
+        loop = asyncio.get_running_loop()
+        await self._step("connections", self._open_connections(engine))
+        await self._step("sync_connections", asyncio.gather(*(
+            loop.run_in_executor(None, self._open_sync_connections, sync_engine)
+            for sync_engine in sync_engines.values()
+        )))
+        await self._step("mappers", self._configure_mappers())
+        await self._step("queries", self._run_hot_queries(engine))
+        if sync_engines:
+            await self._step("sync_queries", loop.run_in_executor(None, self._run_sync_hot_queries, sync_engines))
+
+    async def _step(self, name: str, coro) -> None:
+        started = time.perf_counter()
+        try:
+            await coro
+        except Exception as e:
+            self._errors.append(f"{name}: {e}")
+            logger.warning(f"数据库预热步骤 {name} 失败: {e}")
+        finally:
+            self._steps[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _open_connections(self, engine: AsyncEngine) -> None:
+        """并发打开连接并同时持有，确保连接池中留下 N 个不同的空闲连接
+
+        打开失败的任务同样计入已到达，其余任务不会一直等待而占住连接。
+        """
+        pool_size = getattr(engine.sync_engine.pool, "size", None)
+        count = min(self.connections, pool_size()) if callable(pool_size) else self.connections
+        if count <= 0:
+            return
+        arrived = asyncio.Event()
+        pending = [count]
+
+        def arrive():
+            pending[0] -= 1
+            if pending[0] == 0:
+                arrived.set()
+
+        async def hold():
+            try:
+                conn = await engine.connect()
+            except BaseException:
+                arrive()
+                raise
+            try:
+                await conn.execute(text("SELECT 1"))
+            finally:
+                arrive()
+                try:
+                    await arrived.wait()
+                finally:
+                    await conn.close()
+
+        results = await asyncio.gather(*(hold() for _ in range(count)), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    def _open_sync_connections(self, engine: Engine) -> None:
+        """同步引擎：依次打开连接并同时持有，全部建立后归还"""
+        pool_size = getattr(engine.pool, "size", None)
+        count = min(self.connections, pool_size()) if callable(pool_size) else self.connections
+        connections = []
+        try:
+            for _ in range(count):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+
+    async def _configure_mappers(self) -> None:
+        from app.infrastructure.persistence.sqlalchemy.models import user, role, dept, menu  # noqa: F401 注册全部模型
+        from app.domain.user.entities import user as legacy_user  # noqa: F401 注册旧版同步实体
+        from app.domain.role.entities import role as legacy_role  # noqa: F401
+        from app.domain.menu.entities import menu as legacy_menu  # noqa: F401
+        from app.domain.organization.entities import department  # noqa: F401
+        from app.domain.audit.entities import log  # noqa: F401
+        from app.domain.entities import online_user  # noqa: F401
+        configure_mappers()
+
+    async def _run_hot_queries(self, engine: AsyncEngine) -> None:
+        """按请求中的写法执行热点查询，使编译缓存命中与真实请求相同的语句形状"""
+        from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+        from app.infrastructure.persistence.sqlalchemy.repositories.hydration import FULL
+        from app.infrastructure.persistence.sqlalchemy.repositories.role_repo_impl import SQLAlchemyRoleRepository
+        from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            user_repo = SQLAlchemyUserRepository(session, read_only=True)
+            user_id = (await session.execute(select(UserInfo.id).limit(1))).scalar_one_or_none()
+            if user_id is not None:
+                await user_repo.get_by_id(user_id)
+                await user_repo.get_by_id(user_id, hydration=FULL)
+            await user_repo.count()
+
+            role_repo = SQLAlchemyRoleRepository(session, read_only=True)
+            await role_repo.get_all()
+            await role_repo.get_all(hydration=FULL)
+
+    def _run_sync_hot_queries(self, sync_engines: Dict[str, Engine]) -> None:
+        """按同步路由的写法执行热点查询：菜单树走主库，用户列表走只读会话（有副本时为副本）"""
+        from app.infrastructure.database.database import SessionLocal
+        from app.presentation.api.v1 import menus, users
+
+        with SessionLocal(bind=sync_engines["default"]) as db:
+            menus.get_menu_tree(current_user=None, db=db)
+
+        with SessionLocal(bind=sync_engines.get("replica", sync_engines["default"])) as db:
+            db.info["read_only"] = True
+            users.list_users(page=1, page_size=10, total_mode="exact", cursor=None, db=db, current_user=None)
+            users.list_users(page=1, page_size=10, total_mode="none", cursor="", db=db, current_user=None)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取预热状态"""
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "duration_ms": round(self._duration * 1000, 2) if self._duration is not None else None,
+            "steps_ms": dict(self._steps),
+            "errors": list(self._errors),
+        }
+
+
+# 创建全局数据库预热
+database_warmup = DatabaseWarmup(
+    settings.WARMUP_CONNECTIONS,
+    timeout=settings.WARMUP_TIMEOUT,
+    enabled=settings.WARMUP_ENABLED
+)
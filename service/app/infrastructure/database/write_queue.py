@@ -0,0 +1,213 @@
+"""
+SQLite 单写入者队列
+SQLite 同一时刻只允许一个写事务。写操作以工作单元（接收同步 Session 的函数）的形式提交到 asyncio 队列，
+由专用线程持有的唯一写连接按批执行：每个工作单元包在 SAVEPOINT 中，整批只提交一次（组提交）。
+读操作继续使用连接池。
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.cache.count_cache import count_cache
+from app.infrastructure.database.engine_registry import engine_registry
+from app.infrastructure.database.sqlite_profile import install_sqlite_profile
+from app.infrastructure.database.unit_of_work import current_unit_of_work
+from shared.kernel.config import get_settings
+from shared.kernel.exceptions import ReadOnlyError
+
+settings = get_settings()
+
+WriteUnit = Callable[[Session], Any]
+
+
+@dataclass
+class _PendingWrite:
+    """排队中的工作单元"""
+    unit: WriteUnit
+    future: asyncio.Future
+
+
+class SQLiteWriteQueue:
+    """SQLite 单写入者队列
+
+    - submit 把工作单元放入队列并等待其所在批次提交
+    - 后台任务每次取出队列中已有的工作单元（最多 batch_size 个），交给写线程执行
+    - 单个工作单元失败只回滚它自己的 SAVEPOINT；整批提交失败时批内所有调用方都收到异常
+    - 写连接使用 BEGIN IMMEDIATE，事务开始即持有写锁，不会在提交时才发现锁冲突
+    """
+
+    def __init__(self, url: str, batch_size: int = 100, max_queue: int = 10000):
+        self.url = url
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._engine: Optional[Engine] = None
+        self._connection: Optional[Connection] = None
+        self.units = 0
+        self.failed_units = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.max_batch = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def accepts(self, session: AsyncSession) -> bool:
+        """会话指向的数据库与写连接相同时才走队列"""
+        if not self.running or session.bind is None:
+            return False
+        return session.bind.url.database == self._engine.url.database
+
+    def _create_engine(self) -> Engine:
+        engine = create_engine(
+            self.url, poolclass=StaticPool, connect_args={"check_same_thread": False}
+        )
+        install_sqlite_profile(engine)
+        count_cache.install(engine)
+
+        # pysqlite 默认自行管理事务，SAVEPOINT 无法正确嵌套，改为显式 BEGIN IMMEDIATE
+        @event.listens_for(engine, "connect")
+        def _disable_implicit_begin(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+        return engine
+
+    async def start(self) -> None:
+        """打开写连接并启动后台任务"""
+        if self._task is not None:
+            return
+        if make_url(self.url).get_backend_name() != "sqlite":
+            logger.info("非 SQLite 数据库，不启用单写入者队列")
+            return
+        loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._engine = self._create_engine()
+        self._connection = await loop.run_in_executor(self._executor, self._engine.connect)
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """执行完队列中剩余的工作单元后关闭写连接"""
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._connection.close)
+        self._engine.dispose()
+        self._executor.shutdown(wait=True)
+        self._connection = None
+        self._engine = None
+        self._executor = None
+
+    async def submit(self, unit: WriteUnit) -> Any:
+        """提交工作单元，返回其结果（提交后对象已脱离会话，已加载的属性可直接读取）"""
+        if self._task is None:
+            raise RuntimeError("单写入者队列未启动")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingWrite(unit, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(self._executor, self._execute, [p.unit for p in batch])
+            except Exception as e:
+                self.failed_batches += 1
+                logger.error(f"单写入者批次提交失败（{len(batch)} 个工作单元）: {e}")
+                results = [(False, e)] * len(batch)
+            for pending, (ok, value) in zip(batch, results):
+                if pending.future.done():
+                    continue
+                if ok:
+                    pending.future.set_result(value)
+                else:
+                    pending.future.set_exception(value)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _execute(self, units: List[WriteUnit]) -> List[Tuple[bool, Any]]:
+        """在写线程中执行一批工作单元并提交一次"""
+        results: List[Tuple[bool, Any]] = []
+        with Session(bind=self._connection, expire_on_commit=False) as session:
+            try:
+                for unit in units:
+                    try:
+                        with session.begin_nested():
+                            results.append((True, unit(session)))
+                    except Exception as e:
+                        self.failed_units += 1
+                        results.append((False, e))
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        engine_registry.record_write()
+        self.batches += 1
+        self.units += len(units)
+        self.max_batch = max(self.max_batch, len(units))
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """获取队列统计信息"""
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "units": self.units,
+            "failed_units": self.failed_units,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "avg_batch": self.units / self.batches if self.batches else 0.0,
+            "max_batch": self.max_batch,
+        }
+
+
+async def run_write(session: AsyncSession, unit: WriteUnit) -> Any:
+    """执行写工作单元
+
+    会话处于工作单元中时在其事务内执行、不提交（由工作单元统一提交）；
+    否则单写入者队列已启动且会话指向同一数据库时交给队列执行，再否则在当前会话中执行并提交。
+    只读会话直接拒绝。
+    """
+    if session.info.get("read_only"):
+        raise ReadOnlyError()
+    if current_unit_of_work(session) is not None:
+        return await session.run_sync(unit)
+    if sqlite_write_queue.accepts(session):
+        return await sqlite_write_queue.submit(unit)
+    result = await session.run_sync(unit)
+    await session.commit()
+    return result
+
+
+# 创建全局单写入者队列
+sqlite_write_queue = SQLiteWriteQueue(
+    settings.DATABASE_URL,
+    batch_size=settings.SQLITE_WRITE_BATCH_SIZE,
+    max_queue=settings.SQLITE_WRITE_MAX_QUEUE
+)
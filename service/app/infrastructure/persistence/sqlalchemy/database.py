@@ -1,5 +1,4 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -7,6 +6,7 @@ from typing import AsyncGenerator
 from pathlib import Path
 from shared.kernel.config import get_settings
 from loguru import logger
+from app.infrastructure.database.engine_registry import engine_registry
 
 # 获取配置
 settings = get_settings()
@@ -22,16 +22,9 @@ if settings.DATABASE_URL.startswith('sqlite'):
         if db_dir:
             Path(db_dir).mkdir(parents=True, exist_ok=True)
 
-# 同步引擎（用于创建表）
-engine = create_engine(settings.DATABASE_URL, echo=settings.DATABASE_ECHO)
-
-# 异步引擎
-if settings.DATABASE_URL.startswith("sqlite"):
-    async_database_url = settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://")
-else:
-    async_database_url = settings.DATABASE_URL.replace("mysql+pymysql://", "mysql+aiomysql://")
-
-async_engine = create_async_engine(async_database_url, echo=settings.DATABASE_ECHO)
+# 同步引擎（用于创建表）与异步引擎均由引擎注册表统一创建
+engine = engine_registry.get_sync_engine()
+async_engine = engine_registry.get_async_engine()
 
 # 会话工厂
 AsyncSessionLocal = async_sessionmaker(
@@ -49,6 +42,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取只读异步数据库会话（配置了只读副本时绑定到副本）"""
+    bind = engine_registry.get_async_engine(engine_registry.route(read_only=True))
+    async with AsyncSessionLocal(bind=bind, info={"read_only": True}) as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
 def get_sync_db():
     """获取同步数据库会话"""
     db = SessionLocal()
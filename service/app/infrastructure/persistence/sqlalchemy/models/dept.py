@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Integer, SmallInteger, ForeignKey, BigInteger
+from sqlalchemy import Column, String, Boolean, Integer, SmallInteger, ForeignKey, BigInteger, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from .role import dept_role_association, dept_rule_association
@@ -7,6 +7,7 @@ from .role import dept_role_association, dept_rule_association
 class DeptInfo(BaseModel):
     """部门信息表"""
     __tablename__ = "system_deptinfo"
+    __table_args__ = (Index("idx_deptinfo_parent_id", "parent_id"),)
     
     id = Column(String(32), primary_key=True)
     mode_type = Column(SmallInteger, nullable=False, default=0)
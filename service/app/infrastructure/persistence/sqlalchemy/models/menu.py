@@ -17,7 +17,8 @@ class MenuModel(BaseModel):
     # 关系
     parent = relationship("MenuModel", remote_side="MenuModel.id", back_populates="children")
     children = relationship("MenuModel", back_populates="parent")
-    roles = relationship("RoleModel", secondary="role_menu_association", back_populates="menus")
+    roles = relationship("UserRole", secondary="system_userrole_menu", back_populates="menus")
+    data_permissions = relationship("DataPermission", secondary="system_datapermission_menu", back_populates="menus")
     
     def __repr__(self):
         return f"<Menu(id='{self.id}', name='{self.name}', path='{self.path}')>"
\ No newline at end of file
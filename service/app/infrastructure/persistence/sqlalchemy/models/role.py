@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Table, BigInteger, SmallInteger, JSON
+from sqlalchemy import Column, String, Boolean, Text, ForeignKey, Table, BigInteger, SmallInteger, JSON, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 from .user import user_role_association
@@ -9,7 +9,9 @@ role_menu_association = Table(
     BaseModel.metadata,
     Column('id', BigInteger, primary_key=True, autoincrement=True),
     Column('userrole_id', String(32), ForeignKey('system_userrole.id')),
-    Column('menu_id', String(32), ForeignKey('menus.id'))
+    Column('menu_id', String(32), ForeignKey('menus.id')),
+    Index('idx_userrole_menu_userrole_id_menu_id', 'userrole_id', 'menu_id', unique=True),
+    Index('idx_userrole_menu_menu_id', 'menu_id')
 )
 
 # 部门角色关联表
@@ -27,7 +29,8 @@ datapermission_menu_association = Table(
     BaseModel.metadata,
     Column('id', BigInteger, primary_key=True, autoincrement=True),
     Column('datapermission_id', String(32), ForeignKey('system_datapermission.id')),
-    Column('menu_id', String(32), ForeignKey('menus.id'))
+    Column('menu_id', String(32), ForeignKey('menus.id')),
+    Index('idx_datapermission_menu_menu_id', 'menu_id')
 )
 
 # 部门数据权限关联表
@@ -63,6 +66,7 @@ class UserRole(BaseModel):
     users = relationship("UserInfo", secondary=user_role_association, back_populates="roles")
     menus = relationship("MenuModel", secondary=role_menu_association, back_populates="roles")
     departments = relationship("DeptInfo", secondary=dept_role_association, back_populates="roles")
+    field_permissions = relationship("FieldPermission", foreign_keys="FieldPermission.role_id", back_populates="role")
     
     def __repr__(self):
         return f"<UserRole(id={self.id}, name={self.name}, code={self.code})>"
@@ -100,6 +104,7 @@ class DataPermission(BaseModel):
 class FieldPermission(BaseModel):
     """字段权限表"""
     __tablename__ = "system_fieldpermission"
+    __table_args__ = (Index("idx_fieldpermission_role_id", "role_id"),)
     
     id = Column(String(128), primary_key=True)
     
@@ -115,7 +120,7 @@ class FieldPermission(BaseModel):
     modifier = relationship("UserInfo", foreign_keys=[modifier_id])
     dept_belong = relationship("DeptInfo", foreign_keys=[dept_belong_id])
     menu = relationship("MenuModel", foreign_keys=[menu_id])
-    role = relationship("UserRole", foreign_keys=[role_id])
+    role = relationship("UserRole", foreign_keys=[role_id], back_populates="field_permissions")
     
     def __repr__(self):
         return f"<FieldPermission(id={self.id})>"
\ No newline at end of file
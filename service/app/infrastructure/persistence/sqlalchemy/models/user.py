@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, BigInteger, SmallInteger, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, BigInteger, SmallInteger, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import BaseModel
@@ -9,7 +9,9 @@ user_role_association = Table(
     BaseModel.metadata,
     Column('id', BigInteger, primary_key=True, autoincrement=True),
     Column('userinfo_id', BigInteger, ForeignKey('system_userinfo.id')),
-    Column('userrole_id', String(32), ForeignKey('system_userrole.id'))
+    Column('userrole_id', String(32), ForeignKey('system_userrole.id')),
+    Index('idx_userinfo_roles_userinfo_id_userrole_id', 'userinfo_id', 'userrole_id', unique=True),
+    Index('idx_userinfo_roles_userrole_id', 'userrole_id')
 )
 
 # 用户数据权限关联表
@@ -25,6 +27,11 @@ user_rule_association = Table(
 class UserInfo(BaseModel):
     """用户信息表"""
     __tablename__ = "system_userinfo"
+    # 按部门查找、游标分页的索引（lower() 表达式索引需要列对象，定义在类之后）
+    __table_args__ = (
+        Index("idx_userinfo_dept_id", "dept_id"),
+        Index("idx_userinfo_created_time_id", "created_time", "id"),
+    )
     
     id = Column(BigInteger, primary_key=True, autoincrement=True)
     password = Column(String(128), nullable=False)
@@ -63,11 +70,17 @@ class UserInfo(BaseModel):
         return f"<UserInfo(id={self.id}, username={self.username})>"
 
 
+# 忽略大小写查找（iexact）使用的 lower() 表达式索引，MySQL 默认排序规则本身忽略大小写，不需要
+Index("idx_userinfo_username_lower", func.lower(UserInfo.__table__.c.username)).ddl_if(dialect=("sqlite", "postgresql"))
+Index("idx_userinfo_email_lower", func.lower(UserInfo.__table__.c.email)).ddl_if(dialect=("sqlite", "postgresql"))
+
+
 class UserLoginLog(BaseModel):
     """用户登录日志表"""
     __tablename__ = "system_userloginlog"
+    __table_args__ = (Index("idx_userloginlog_created_time_id", "created_time", "id"),)
     
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
     status = Column(Boolean, nullable=False)
     ipaddress = Column(String(39), nullable=True)
     browser = Column(String(64), nullable=True)
@@ -86,6 +99,23 @@ class UserLoginLog(BaseModel):
     dept_belong = relationship("DeptInfo", foreign_keys=[dept_belong_id])
 
 
+class UserOnline(BaseModel):
+    """在线用户表"""
+    __tablename__ = "online_users"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey('system_userinfo.id'), nullable=False, index=True)
+    username = Column(String(150), nullable=False)
+    nickname = Column(String(150), nullable=False, default="")
+    token = Column(String(255), nullable=False, unique=True)  # 访问令牌ID（jti），不保存令牌明文
+    ip = Column(String(45), nullable=True)
+    location = Column(String(255), nullable=True)
+    browser = Column(String(100), nullable=True)
+    os = Column(String(100), nullable=True)
+    login_time = Column(DateTime, nullable=False, default=func.now())
+    last_access_time = Column(DateTime, nullable=False, default=func.now())
+
+
 class UserPersonalConfig(BaseModel):
     """用户个人配置表"""
     __tablename__ = "system_userpersonalconfig"
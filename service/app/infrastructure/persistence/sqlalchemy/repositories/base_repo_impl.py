@@ -1,26 +1,44 @@
-from typing import Type, TypeVar, Generic, List, Optional, Dict, Any
+from typing import Type, TypeVar, Generic, List, Optional, Dict, Any, Sequence, Union, AsyncIterator
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, update, delete
+from sqlalchemy import select, and_, or_, update, delete
 from sqlalchemy.orm import InstrumentedAttribute
 
 from app.domain.repositories.base_repository import BaseRepository
+from app.infrastructure.database.bulk import delete_ids, insert_rows, model_row, run_chunked, update_rows, upsert_rows
+from app.infrastructure.database.keyset import KeysetPage, SortKey, paginate_async
+from app.infrastructure.database.counting import cached_count
+from app.infrastructure.database.filtering import filter_statement
+from app.infrastructure.database.streaming import stream_scalars
+from app.infrastructure.database.write_queue import run_write
+from shared.kernel.exceptions import ReadOnlyError
 from app.infrastructure.persistence.sqlalchemy.models.base import BaseModel
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+
 class SQLAlchemyBaseRepository(BaseRepository[ModelType], Generic[ModelType]):
     """通用仓储SQLAlchemy实现"""
 
-    def __init__(self, session: AsyncSession, model: Type[ModelType]):
+    def __init__(self, session: AsyncSession, model: Type[ModelType], read_only: bool = False):
         self.session = session
         self.model = model
+        self.read_only = read_only or session.info.get("read_only", False)
+
+    def _ensure_writable(self) -> None:
+        """只读模式下拒绝写操作"""
+        if self.read_only:
+            raise ReadOnlyError()
 
     async def create(self, entity: ModelType) -> ModelType:
         """创建实体"""
-        self.session.add(entity)
-        await self.session.commit()
-        await self.session.refresh(entity)
-        return entity
+        self._ensure_writable()
+        def unit(session):
+            session.add(entity)
+            session.flush()
+            session.refresh(entity)
+            return entity
+
+        return await run_write(self.session, unit)
 
     async def get_by_id(self, id: str) -> Optional[ModelType]:
         """根据ID获取实体"""
@@ -36,56 +54,92 @@ class SQLAlchemyBaseRepository(BaseRepository[ModelType], Generic[ModelType]):
         )
         return list(result.scalars().all())
 
-    async def filter_by(self, **kwargs) -> List[ModelType]:
-        """根据条件过滤实体"""
-        filters = []
-        for key, value in kwargs.items():
-            field_name, *modifiers = key.split("__")
-            column = getattr(self.model, field_name, None)
-            if not column:
-                continue
-
-            if not modifiers:
-                filters.append(column == value)
-            elif modifiers[0] == "like":
-                filters.append(column.like(f"%{value}%"))
-            elif modifiers[0] == "in":
-                filters.append(column.in_(value))
-            elif modifiers[0] == "isnull":
-                if value:
-                    filters.append(column.is_(None))
-                else:
-                    filters.append(column.is_not(None))
-            elif modifiers[0] == "gte":
-                filters.append(column >= value)
-            elif modifiers[0] == "lte":
-                filters.append(column <= value)
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None) -> KeysetPage:
+        """按游标分页获取实体（按创建时间、ID 倒序）"""
+        key = SortKey([self.model.created_time, self.model.id])
+        return await paginate_async(self.session, select(self.model), key, limit, cursor)
 
+    async def filter_by(
+        self,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        **kwargs
+    ) -> List[ModelType]:
+        """根据条件过滤实体，条件写法见 filtering"""
         result = await self.session.execute(
-            select(self.model).where(and_(*filters))
+            filter_statement(self.session, self.model, kwargs, order_by, limit, offset)
         )
         return list(result.scalars().all())
 
+    async def iter_all(self, batch_size: Optional[int] = None) -> AsyncIterator[ModelType]:
+        """流式遍历所有实体，每次取回 batch_size 行"""
+        async for entity in stream_scalars(self.session, select(self.model), batch_size):
+            yield entity
+
+    async def iter_filter(
+        self,
+        batch_size: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        **kwargs
+    ) -> AsyncIterator[ModelType]:
+        """流式遍历符合条件的实体，条件写法同 filter_by"""
+        statement = filter_statement(self.session, self.model, kwargs, order_by)
+        async for entity in stream_scalars(self.session, statement, batch_size):
+            yield entity
+
     async def update(self, id: str, **updates) -> Optional[ModelType]:
         """更新实体"""
-        # 使用update语句更新
-        stmt = update(self.model).where(self.model.id == id).values(**updates)
-        await self.session.execute(stmt)
-        await self.session.commit()
-        
-        # 返回更新后的实体
-        return await self.get_by_id(id)
+        self._ensure_writable()
+        def unit(session):
+            # 使用update语句更新，并在同一事务内读回更新后的实体
+            session.execute(update(self.model).where(self.model.id == id).values(**updates))
+            return session.execute(
+                select(self.model).where(self.model.id == id)
+                .execution_options(populate_existing=True)
+            ).scalar_one_or_none()
+
+        return await run_write(self.session, unit)
 
     async def delete(self, id: str) -> bool:
         """删除实体"""
-        stmt = delete(self.model).where(self.model.id == id)
-        result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.rowcount > 0
+        self._ensure_writable()
+        def unit(session):
+            return session.execute(delete(self.model).where(self.model.id == id)).rowcount
+
+        return await run_write(self.session, unit) > 0
 
     async def count(self) -> int:
-        """统计数量"""
-        result = await self.session.execute(
-            select(func.count()).select_from(self.model)
+        """统计数量（经总数缓存，写入该表时失效）"""
+        return await cached_count(self.session, select(self.model))
+
+    async def bulk_create(self, entities: Sequence[Union[ModelType, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """批量创建实体（模型实例或字段字典），每 chunk_size 行一个事务，返回创建数量"""
+        self._ensure_writable()
+        rows = [model_row(self.model, entity) for entity in entities]
+        return await run_chunked(
+            self.session, rows, lambda session, chunk: insert_rows(session, self.model, chunk), chunk_size
+        )
+
+    async def bulk_update(self, rows: Sequence[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量更新，每行包含 id 与要更新的字段，返回实际更新数量"""
+        self._ensure_writable()
+        rows = [model_row(self.model, row) for row in rows]
+        return await run_chunked(
+            self.session, rows, lambda session, chunk: update_rows(session, self.model, chunk), chunk_size
+        )
+
+    async def bulk_delete(self, ids: Sequence[str], chunk_size: Optional[int] = None) -> int:
+        """批量删除实体，返回实际删除数量"""
+        self._ensure_writable()
+        return await run_chunked(
+            self.session, list(ids), lambda session, chunk: delete_ids(session, self.model, chunk), chunk_size
+        )
+
+    async def bulk_upsert(self, entities: Sequence[Union[ModelType, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量插入或更新，返回写入数量"""
+        self._ensure_writable()
+        rows = [model_row(self.model, entity) for entity in entities]
+        return await run_chunked(
+            self.session, rows, lambda session, chunk: upsert_rows(session, self.model, chunk), chunk_size
         )
-        return result.scalar_one()
\ No newline at end of file
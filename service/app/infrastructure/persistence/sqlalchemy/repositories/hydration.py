@@ -0,0 +1,149 @@
+"""
+领域模型装配
+按调用选择关联的加载深度，关联通过 selectinload 按页加载（每个关联一条 IN 查询，与实体数量无关）:
+    summary  用户只加载角色（不含菜单），角色不加载关联，用于列表
+    full     角色加载菜单、字段权限及菜单上的数据权限；用户在此基础上加载全部角色
+
+转换时只读取已加载的关联，未加载的关联映射为空列表，不会在异步会话中触发懒加载。
+角色本身不关联数据权限（数据权限挂在用户、部门与菜单上），角色的 data_permissions 取其菜单上的数据权限。
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+
+from app.domain.models.menu import Menu
+from app.domain.models.role import DataPermission, FieldPermission, Role
+from app.domain.models.user import User
+from app.infrastructure.persistence.sqlalchemy.models.menu import MenuModel
+from app.infrastructure.persistence.sqlalchemy.models.role import (
+    DataPermission as DataPermissionModel,
+    FieldPermission as FieldPermissionModel,
+    UserRole,
+)
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from shared.kernel.exceptions import ValidationException
+
+SUMMARY = "summary"
+FULL = "full"
+HYDRATIONS = (SUMMARY, FULL)
+
+
+def check_hydration(hydration: str) -> str:
+    """校验加载方式"""
+    if hydration not in HYDRATIONS:
+        raise ValidationException(f"不支持的加载方式: {hydration}")
+    return hydration
+
+
+def role_options(hydration: str = SUMMARY) -> List[Any]:
+    """角色查询的加载选项"""
+    if check_hydration(hydration) == SUMMARY:
+        return []
+    return [
+        selectinload(UserRole.menus).selectinload(MenuModel.data_permissions),
+        selectinload(UserRole.field_permissions).selectinload(FieldPermissionModel.menu),
+    ]
+
+
+def user_options(hydration: str = SUMMARY) -> List[Any]:
+    """用户查询的加载选项"""
+    roles = selectinload(UserInfo.roles)
+    if check_hydration(hydration) == SUMMARY:
+        return [roles]
+    return [roles.options(*role_options(FULL))]
+
+
+def _loaded(model: Any, relationship: str) -> bool:
+    return relationship not in inspect(model).unloaded
+
+
+def menu_to_domain(menu_model: MenuModel) -> Menu:
+    """转换菜单为领域模型"""
+    return Menu(
+        id=str(menu_model.id),
+        name=menu_model.name,
+        path=menu_model.path,
+        component=menu_model.component,
+        menu_type=menu_model.menu_type,
+        parent_id=menu_model.parent_id,
+        rank=menu_model.rank,
+        is_active=bool(menu_model.is_active),
+        meta=menu_model.meta or {}
+    )
+
+
+def data_permission_to_domain(rule_model: DataPermissionModel) -> DataPermission:
+    """转换数据权限为领域模型，规则以 JSON 文本保存在 rule_value"""
+    return DataPermission(
+        id=str(rule_model.id),
+        name=rule_model.name,
+        description="",
+        rule_type="custom",
+        rule_value=json.dumps(rule_model.rules, ensure_ascii=False) if rule_model.rules is not None else None
+    )
+
+
+def field_permission_to_domain(field_model: FieldPermissionModel) -> FieldPermission:
+    """转换字段权限为领域模型（表中只记录角色与菜单，按菜单整体只读映射）"""
+    menu = field_model.menu if _loaded(field_model, "menu") else None
+    name = menu.name if menu is not None else ""
+    return FieldPermission(
+        id=str(field_model.id),
+        name=name,
+        description="",
+        model_name=name,
+        field_name="",
+        permission_type="read"
+    )
+
+
+def role_to_domain(role_model: UserRole) -> Role:
+    """转换角色为领域模型，只转换已加载的关联"""
+    menus: List[Menu] = []
+    data_permissions: Dict[str, DataPermission] = {}
+    if _loaded(role_model, "menus"):
+        for menu_model in role_model.menus:
+            if not menu_model.is_active:
+                continue
+            menus.append(menu_to_domain(menu_model))
+            if _loaded(menu_model, "data_permissions"):
+                for rule_model in menu_model.data_permissions:
+                    if rule_model.is_active:
+                        data_permissions.setdefault(rule_model.id, data_permission_to_domain(rule_model))
+    field_permissions = []
+    if _loaded(role_model, "field_permissions"):
+        field_permissions = [field_permission_to_domain(field) for field in role_model.field_permissions]
+
+    return Role(
+        id=str(getattr(role_model, 'id', '')),
+        name=getattr(role_model, 'name', ''),
+        code=getattr(role_model, 'code', '') or "",
+        description=getattr(role_model, 'description', '') or "",
+        is_active=bool(getattr(role_model, 'is_active', False)),
+        menus=menus,
+        data_permissions=list(data_permissions.values()),
+        field_permissions=field_permissions
+    )
+
+
+def user_to_domain(user_model: UserInfo) -> User:
+    """转换用户为领域模型，只转换已加载的角色"""
+    roles = []
+    if _loaded(user_model, "roles"):
+        roles = [role_to_domain(role_model) for role_model in user_model.roles]
+
+    return User(
+        id=str(getattr(user_model, 'id', '')),
+        username=getattr(user_model, 'username', ''),
+        nickname=getattr(user_model, 'nickname', ''),
+        email=getattr(user_model, 'email', ''),
+        phone=getattr(user_model, 'phone', '') or "",
+        is_active=bool(getattr(user_model, 'is_active', False)),
+        dept_id=getattr(user_model, 'dept_id', None),
+        roles=roles,
+        created_time=getattr(user_model, 'created_time', datetime.now()),
+        updated_time=getattr(user_model, 'updated_time', datetime.now())
+    )
@@ -1,41 +1,62 @@
-from typing import Optional, List
-from sqlalchemy import select, func
+from typing import Optional, List, AsyncIterator, Sequence, Union, Dict, Any
+from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.domain.repositories.role_repository import RoleRepository
 from app.domain.models.role import Role
 from app.infrastructure.persistence.sqlalchemy.models.role import UserRole
+from app.infrastructure.auth.permission_claims import permission_versions
+from app.infrastructure.database.bulk import delete_ids, insert_rows, model_row, run_chunked, update_rows, upsert_rows
+from app.infrastructure.database.counting import cached_count
+from app.infrastructure.database.streaming import stream_scalars
+from app.infrastructure.database.unit_of_work import after_commit
+from app.infrastructure.database.write_queue import run_write
+from app.infrastructure.database.filtering import filter_statement
+from app.infrastructure.persistence.sqlalchemy.repositories.hydration import FULL, SUMMARY, role_options, role_to_domain
+from shared.kernel.exceptions import ReadOnlyError
 
 class SQLAlchemyRoleRepository(RoleRepository):
     """SQLAlchemy 角色仓储实现"""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_only: bool = False):
         self.session = session
+        self.read_only = read_only or session.info.get("read_only", False)
+
+    def _ensure_writable(self) -> None:
+        """只读模式下拒绝写操作"""
+        if self.read_only:
+            raise ReadOnlyError()
 
     async def create(self, entity: Role) -> Role:
         """创建实体"""
+        self._ensure_writable()
         role_model = self._to_model(entity)
-        self.session.add(role_model)
-        await self.session.commit()
-        await self.session.refresh(role_model)
+
+        def unit(session):
+            session.add(role_model)
+            session.flush()
+            session.refresh(role_model)
+            return role_model
+
+        role_model = await run_write(self.session, unit)
+        after_commit(self.session, permission_versions.bump)
         role = self._to_domain(role_model)
         if role is None:
             raise ValueError("无法创建角色")
         return role
 
-    async def get_by_id(self, id: str) -> Optional[Role]:
-        """根据ID获取实体"""
+    async def get_by_id(self, id: str, hydration: str = SUMMARY) -> Optional[Role]:
+        """根据ID获取实体，hydration 见 hydration 模块"""
         result = await self.session.execute(
-            select(UserRole).where(UserRole.id == id)
+            select(UserRole).options(*role_options(hydration)).where(UserRole.id == id)
         )
         role_model = result.scalar_one_or_none()
         return self._to_domain(role_model) if role_model else None
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Role]:
+    async def get_all(self, skip: int = 0, limit: int = 100, hydration: str = SUMMARY) -> List[Role]:
         """获取所有实体"""
         result = await self.session.execute(
-            select(UserRole).offset(skip).limit(limit)
+            select(UserRole).options(*role_options(hydration)).offset(skip).limit(limit)
         )
         role_models = result.scalars().all()
         roles = []
@@ -45,10 +66,19 @@ class SQLAlchemyRoleRepository(RoleRepository):
                 roles.append(role)
         return roles
 
-    async def filter_by(self, **kwargs) -> List[Role]:
-        """根据条件过滤实体"""
-        # 简化实现
-        result = await self.session.execute(select(UserRole))
+    async def filter_by(
+        self,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        hydration: str = SUMMARY,
+        **kwargs
+    ) -> List[Role]:
+        """根据条件过滤实体，条件写法见 filtering"""
+        result = await self.session.execute(
+            filter_statement(self.session, UserRole, kwargs, order_by, limit, offset)
+            .options(*role_options(hydration))
+        )
         role_models = result.scalars().all()
         roles = []
         for model in role_models:
@@ -57,31 +87,97 @@ class SQLAlchemyRoleRepository(RoleRepository):
                 roles.append(role)
         return roles
 
+    async def iter_all(self, batch_size: Optional[int] = None, hydration: str = SUMMARY) -> AsyncIterator[Role]:
+        """流式遍历所有角色，每次取回 batch_size 行（关联按批加载）"""
+        statement = select(UserRole).options(*role_options(hydration))
+        async for model in stream_scalars(self.session, statement, batch_size):
+            yield self._to_domain(model)
+
+    async def iter_filter(
+        self,
+        batch_size: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        hydration: str = SUMMARY,
+        **kwargs
+    ) -> AsyncIterator[Role]:
+        """流式遍历符合条件的角色，条件写法同 filter_by"""
+        statement = filter_statement(self.session, UserRole, kwargs, order_by).options(*role_options(hydration))
+        async for model in stream_scalars(self.session, statement, batch_size):
+            yield self._to_domain(model)
+
     async def update(self, id: str, **updates) -> Optional[Role]:
         """更新实体"""
-        # 简化实现
-        role = await self.get_by_id(id)
-        return role
+        self._ensure_writable()
+        values = {
+            key: value for key, value in updates.items()
+            if key in UserRole.__table__.columns and key != 'id'
+        }
+        if values:
+            await run_write(
+                self.session,
+                lambda session: session.execute(update(UserRole).where(UserRole.id == id).values(**values))
+            )
+            after_commit(self.session, permission_versions.bump)
+        return await self.get_by_id(id)
 
     async def delete(self, id: str) -> bool:
         """删除实体"""
-        role_model = await self.get_by_id(id)
-        if role_model:
-            await self.session.delete(role_model)
-            await self.session.commit()
-            return True
-        return False
+        self._ensure_writable()
+        rowcount = await run_write(
+            self.session,
+            lambda session: session.execute(delete(UserRole).where(UserRole.id == id)).rowcount
+        )
+        after_commit(self.session, permission_versions.bump)
+        return rowcount > 0
 
     async def count(self) -> int:
-        """统计数量"""
-        result = await self.session.execute(select(func.count()).select_from(UserRole))
-        return result.scalar_one()
+        """统计数量（经总数缓存，写入该表时失效）"""
+        return await cached_count(self.session, select(UserRole))
+
+    async def bulk_create(self, entities: Sequence[Union[Role, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """批量创建角色，每 chunk_size 行一个事务，返回创建数量"""
+        self._ensure_writable()
+        rows = [self._to_row(entity) for entity in entities]
+        affected = await run_chunked(
+            self.session, rows, lambda session, chunk: insert_rows(session, UserRole, chunk), chunk_size
+        )
+        after_commit(self.session, permission_versions.bump)
+        return affected
+
+    async def bulk_update(self, rows: Sequence[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量更新角色，返回实际更新数量"""
+        self._ensure_writable()
+        rows = [model_row(UserRole, row) for row in rows]
+        affected = await run_chunked(
+            self.session, rows, lambda session, chunk: update_rows(session, UserRole, chunk), chunk_size
+        )
+        after_commit(self.session, permission_versions.bump)
+        return affected
+
+    async def bulk_delete(self, ids: Sequence[str], chunk_size: Optional[int] = None) -> int:
+        """批量删除角色，返回实际删除数量"""
+        self._ensure_writable()
+        affected = await run_chunked(
+            self.session, list(ids), lambda session, chunk: delete_ids(session, UserRole, chunk), chunk_size
+        )
+        after_commit(self.session, permission_versions.bump)
+        return affected
+
+    async def bulk_upsert(self, entities: Sequence[Union[Role, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量插入或更新角色，返回写入数量"""
+        self._ensure_writable()
+        rows = [self._to_row(entity) for entity in entities]
+        affected = await run_chunked(
+            self.session, rows, lambda session, chunk: upsert_rows(session, UserRole, chunk), chunk_size
+        )
+        after_commit(self.session, permission_versions.bump)
+        return affected
 
     async def find_by_name(self, name: str) -> Optional[Role]:
         """根据角色名查找角色"""
         result = await self.session.execute(
             select(UserRole)
-            .options(selectinload(UserRole.menus))
+            .options(*role_options(FULL))
             .where(UserRole.name == name)
         )
         role_model = result.scalar_one_or_none()
@@ -91,7 +187,7 @@ class SQLAlchemyRoleRepository(RoleRepository):
         """查找活跃角色"""
         result = await self.session.execute(
             select(UserRole)
-            .options(selectinload(UserRole.menus))
+            .options(*role_options(FULL))
             .where(UserRole.is_active == True)
         )
         role_models = result.scalars().all()
@@ -106,7 +202,7 @@ class SQLAlchemyRoleRepository(RoleRepository):
         """根据用户ID查找角色"""
         result = await self.session.execute(
             select(UserRole)
-            .options(selectinload(UserRole.menus))
+            .options(*role_options(FULL))
             .join(UserRole.users)
             .where(UserRole.users.any(id=user_id))
         )
@@ -120,30 +216,33 @@ class SQLAlchemyRoleRepository(RoleRepository):
 
     async def assign_menus(self, role_id: str, menu_ids: List[str]) -> bool:
         """为角色分配菜单"""
+        self._ensure_writable()
         # 这里需要实现菜单分配逻辑
         # 简化实现
+        after_commit(self.session, permission_versions.bump)
         return True
 
     def _to_domain(self, role_model: UserRole) -> Optional[Role]:
-        """转换为领域模型"""
+        """转换为领域模型（只转换已加载的菜单与权限）"""
         if not role_model:
             return None
-            
-        return Role(
-            id=getattr(role_model, 'id', ''),
-            name=getattr(role_model, 'name', ''),
-            description=getattr(role_model, 'description', '') or "",
-            is_active=bool(getattr(role_model, 'is_active', False)),
-            menus=[],  # TODO: 转换菜单
-            data_permissions=[],  # TODO: 转换数据权限
-            field_permissions=[]  # TODO: 转换字段权限
-        )
+        return role_to_domain(role_model)
 
     def _to_model(self, role: Role) -> UserRole:
         """转换为数据库模型"""
         return UserRole(
             id=role.id,
             name=role.name,
+            code=role.code,
             description=role.description,
             is_active=role.is_active
-        )
\ No newline at end of file
+        )
+
+    def _to_row(self, role: Union[Role, Dict[str, Any]]) -> Dict[str, Any]:
+        """转换为批量写入的行数据"""
+        if isinstance(role, dict):
+            return model_row(UserRole, role)
+        return {
+            key: value for key, value in model_row(UserRole, role.model_dump()).items()
+            if value is not None
+        }
@@ -1,42 +1,64 @@
-from typing import Optional, List
-from sqlalchemy import select, func
+from typing import Optional, List, AsyncIterator, Tuple, Sequence, Union, Dict, Any
+from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 from app.domain.repositories.user_repository import UserRepository
 from app.domain.models.user import User
 from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from app.infrastructure.persistence.sqlalchemy.models.role import UserRole
+from app.infrastructure.cache.principal_cache import principal_cache
+from app.infrastructure.database.bulk import delete_ids, insert_rows, model_row, run_chunked, update_rows, upsert_rows
+from app.infrastructure.database.counting import cached_count
+from app.infrastructure.database.streaming import stream_scalars
+from app.infrastructure.database.unit_of_work import after_commit
+from app.infrastructure.database.write_queue import run_write
+from app.infrastructure.database.filtering import filter_statement
+from app.infrastructure.persistence.sqlalchemy.repositories.hydration import SUMMARY, role_to_domain, user_options, user_to_domain
+from shared.kernel.exceptions import ReadOnlyError
+from app.infrastructure.auth.permission_claims import permission_versions
 
 class SQLAlchemyUserRepository(UserRepository):
     """SQLAlchemy 用户仓储实现"""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, read_only: bool = False):
         self.session = session
+        self.read_only = read_only or session.info.get("read_only", False)
+
+    def _ensure_writable(self) -> None:
+        """只读模式下拒绝写操作"""
+        if self.read_only:
+            raise ReadOnlyError()
 
     async def create(self, entity: User) -> User:
         """创建实体"""
+        self._ensure_writable()
         user_model = self._to_model(entity)
-        self.session.add(user_model)
-        await self.session.commit()
-        await self.session.refresh(user_model)
-        user = self._to_domain(user_model)
+
+        def unit(session):
+            session.add(user_model)
+            session.flush()
+            session.refresh(user_model)
+            return user_model
+
+        user = self._to_domain(await run_write(self.session, unit))
         if user is None:
             raise ValueError("无法创建用户")
         return user
 
-    async def get_by_id(self, id: str) -> Optional[User]:
-        """根据ID获取实体"""
+    async def get_by_id(self, id: str, hydration: str = SUMMARY) -> Optional[User]:
+        """根据ID获取实体，hydration 见 hydration 模块"""
         result = await self.session.execute(
-            select(UserInfo).where(UserInfo.id == id)
+            select(UserInfo).options(*user_options(hydration)).where(UserInfo.id == id)
         )
         user_model = result.scalar_one_or_none()
         return self._to_domain(user_model) if user_model else None
 
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_all(self, skip: int = 0, limit: int = 100, hydration: str = SUMMARY) -> List[User]:
         """获取所有实体"""
         result = await self.session.execute(
-            select(UserInfo).offset(skip).limit(limit)
+            select(UserInfo).options(*user_options(hydration)).offset(skip).limit(limit)
         )
         user_models = result.scalars().all()
         users = []
@@ -46,10 +68,19 @@ class SQLAlchemyUserRepository(UserRepository):
                 users.append(user)
         return users
 
-    async def filter_by(self, **kwargs) -> List[User]:
-        """根据条件过滤实体"""
-        # 简化实现
-        result = await self.session.execute(select(UserInfo))
+    async def filter_by(
+        self,
+        order_by: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        hydration: str = SUMMARY,
+        **kwargs
+    ) -> List[User]:
+        """根据条件过滤实体，条件写法见 filtering"""
+        result = await self.session.execute(
+            filter_statement(self.session, UserInfo, kwargs, order_by, limit, offset)
+            .options(*user_options(hydration))
+        )
         user_models = result.scalars().all()
         users = []
         for model in user_models:
@@ -58,31 +89,109 @@ class SQLAlchemyUserRepository(UserRepository):
                 users.append(user)
         return users
 
+    async def iter_all(self, batch_size: Optional[int] = None, hydration: str = SUMMARY) -> AsyncIterator[User]:
+        """流式遍历所有用户，每次取回 batch_size 行（关联按批加载）"""
+        statement = select(UserInfo).options(*user_options(hydration))
+        async for model in stream_scalars(self.session, statement, batch_size):
+            yield self._to_domain(model)
+
+    async def iter_filter(
+        self,
+        batch_size: Optional[int] = None,
+        order_by: Optional[Sequence[str]] = None,
+        hydration: str = SUMMARY,
+        **kwargs
+    ) -> AsyncIterator[User]:
+        """流式遍历符合条件的用户，条件写法同 filter_by"""
+        statement = filter_statement(self.session, UserInfo, kwargs, order_by).options(*user_options(hydration))
+        async for model in stream_scalars(self.session, statement, batch_size):
+            yield self._to_domain(model)
+
     async def update(self, id: str, **updates) -> Optional[User]:
         """更新实体"""
-        # 简化实现
-        user = await self.get_by_id(id)
-        return user
+        self._ensure_writable()
+        values = {
+            key: value for key, value in updates.items()
+            if key in UserInfo.__table__.columns and key != 'id'
+        }
+        if values:
+            await run_write(
+                self.session,
+                lambda session: session.execute(update(UserInfo).where(UserInfo.id == id).values(**values))
+            )
+        self._invalidate([id])
+        return await self.get_by_id(id)
 
     async def delete(self, id: str) -> bool:
         """删除实体"""
-        user_model = await self.get_by_id(id)
-        if user_model:
-            await self.session.delete(user_model)
-            await self.session.commit()
-            return True
-        return False
+        self._ensure_writable()
+        rowcount = await run_write(
+            self.session,
+            lambda session: session.execute(delete(UserInfo).where(UserInfo.id == id)).rowcount
+        )
+        self._invalidate([id])
+        return rowcount > 0
 
     async def count(self) -> int:
-        """统计数量"""
-        result = await self.session.execute(select(func.count()).select_from(UserInfo))
-        return result.scalar_one()
+        """统计数量（经总数缓存，写入该表时失效）"""
+        return await cached_count(self.session, select(UserInfo))
+
+    async def bulk_create(self, entities: Sequence[Union[User, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """批量创建用户，每 chunk_size 行一个事务，返回创建数量
+
+        领域模型不含密码，导入用户时传入包含 password（哈希）字段的字典。
+        """
+        self._ensure_writable()
+        rows = [self._to_row(entity) for entity in entities]
+        return await run_chunked(
+            self.session, rows, lambda session, chunk: insert_rows(session, UserInfo, chunk), chunk_size
+        )
+
+    async def bulk_update(self, rows: Sequence[Dict[str, Any]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量更新用户，返回实际更新数量"""
+        self._ensure_writable()
+        rows = [model_row(UserInfo, row) for row in rows]
+        affected = await run_chunked(
+            self.session, rows, lambda session, chunk: update_rows(session, UserInfo, chunk), chunk_size
+        )
+        self._invalidate(row["id"] for row in rows)
+        return affected
+
+    async def bulk_delete(self, ids: Sequence[str], chunk_size: Optional[int] = None) -> int:
+        """批量删除用户，返回实际删除数量"""
+        self._ensure_writable()
+        affected = await run_chunked(
+            self.session, list(ids), lambda session, chunk: delete_ids(session, UserInfo, chunk), chunk_size
+        )
+        self._invalidate(ids)
+        return affected
+
+    async def bulk_upsert(self, entities: Sequence[Union[User, Dict[str, Any]]], chunk_size: Optional[int] = None) -> int:
+        """按 id 批量插入或更新用户，返回写入数量"""
+        self._ensure_writable()
+        rows = [self._to_row(entity) for entity in entities]
+        affected = await run_chunked(
+            self.session, rows, lambda session, chunk: upsert_rows(session, UserInfo, chunk), chunk_size
+        )
+        self._invalidate(row["id"] for row in rows if "id" in row)
+        return affected
+
+    def _invalidate(self, ids) -> None:
+        """写入提交后使用户的主体缓存与权限版本失效"""
+        user_ids = [str(user_id) for user_id in ids]
+
+        def invalidate():
+            for user_id in user_ids:
+                principal_cache.invalidate(user_id)
+                permission_versions.bump_user(user_id)
+
+        after_commit(self.session, invalidate)
 
     async def find_by_username(self, username: str) -> Optional[User]:
         """根据用户名查找用户"""
         result = await self.session.execute(
             select(UserInfo)
-            .options(selectinload(UserInfo.roles))
+            .options(*user_options())
             .where(UserInfo.username == username)
         )
         user_model = result.scalar_one_or_none()
@@ -92,7 +201,7 @@ class SQLAlchemyUserRepository(UserRepository):
         """根据邮箱查找用户"""
         result = await self.session.execute(
             select(UserInfo)
-            .options(selectinload(UserInfo.roles))
+            .options(*user_options())
             .where(UserInfo.email == email)
         )
         user_model = result.scalar_one_or_none()
@@ -102,7 +211,7 @@ class SQLAlchemyUserRepository(UserRepository):
         """根据部门ID查找用户"""
         result = await self.session.execute(
             select(UserInfo)
-            .options(selectinload(UserInfo.roles))
+            .options(*user_options())
             .where(UserInfo.dept_id == dept_id)
         )
         user_models = result.scalars().all()
@@ -117,7 +226,7 @@ class SQLAlchemyUserRepository(UserRepository):
         """查找活跃用户"""
         result = await self.session.execute(
             select(UserInfo)
-            .options(selectinload(UserInfo.roles))
+            .options(*user_options())
             .where(UserInfo.is_active == True)
         )
         user_models = result.scalars().all()
@@ -128,28 +237,54 @@ class SQLAlchemyUserRepository(UserRepository):
                 users.append(user)
         return users
 
+    async def find_for_login(self, username: str) -> Optional[Tuple[User, str]]:
+        """一次查询加载登录所需的用户、密码哈希、角色及菜单权限"""
+        result = await self.session.execute(
+            select(UserInfo)
+            .options(joinedload(UserInfo.roles).joinedload(UserRole.menus))
+            .where(UserInfo.username == username)
+        )
+        user_model = result.unique().scalar_one_or_none()
+        if user_model is None:
+            return None
+        user = self._to_domain(user_model)
+        user.roles = [role_to_domain(role_model) for role_model in user_model.roles if role_model.is_active]
+        return user, user_model.password
+
+    async def get_password_hash(self, user_id: str) -> Optional[str]:
+        """获取用户密码哈希"""
+        result = await self.session.execute(
+            select(UserInfo.password).where(UserInfo.id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        """更新用户密码哈希"""
+        self._ensure_writable()
+        rowcount = await run_write(
+            self.session,
+            lambda session: session.execute(
+                update(UserInfo).where(UserInfo.id == user_id).values(password=hashed_password)
+            ).rowcount
+        )
+        return rowcount > 0
+
     async def update_last_login(self, user_id: str) -> bool:
         """更新最后登录时间"""
-        # 简化实现，实际需要添加last_login字段
-        return True
+        self._ensure_writable()
+        rowcount = await run_write(
+            self.session,
+            lambda session: session.execute(
+                update(UserInfo).where(UserInfo.id == user_id).values(last_login=datetime.now())
+            ).rowcount
+        )
+        return rowcount > 0
 
     def _to_domain(self, user_model: UserInfo) -> Optional[User]:
-        """转换为领域模型"""
+        """转换为领域模型（只转换已加载的角色）"""
         if not user_model:
             return None
-            
-        return User(
-            id=str(getattr(user_model, 'id', '')),
-            username=getattr(user_model, 'username', ''),
-            nickname=getattr(user_model, 'nickname', ''),
-            email=getattr(user_model, 'email', ''),
-            phone=getattr(user_model, 'phone', '') or "",
-            is_active=bool(getattr(user_model, 'is_active', False)),
-            dept_id=getattr(user_model, 'dept_id', None),
-            roles=[],  # TODO: 转换角色
-            created_time=getattr(user_model, 'created_time', datetime.now()),
-            updated_time=getattr(user_model, 'updated_time', datetime.now())
-        )
+        return user_to_domain(user_model)
 
     def _to_model(self, user: User) -> UserInfo:
         """转换为数据库模型"""
@@ -163,4 +298,16 @@ class SQLAlchemyUserRepository(UserRepository):
             dept_id=user.dept_id,
             created_time=user.created_time,
             updated_time=user.updated_time
-        )
\ No newline at end of file
+        )
+
+    def _to_row(self, user: Union[User, Dict[str, Any]]) -> Dict[str, Any]:
+        """转换为批量写入的行数据，非数字 id 交给数据库生成"""
+        if isinstance(user, dict):
+            return model_row(UserInfo, user)
+        row = {
+            key: value for key, value in model_row(UserInfo, user.model_dump()).items()
+            if value is not None
+        }
+        if not user.id.isdigit():
+            row.pop("id", None)
+        return row
@@ -0,0 +1 @@
+"""会话模块"""
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+在线会话最后访问时间写回缓冲
+每个请求只在内存中记录会话的最后访问时间，按固定间隔合并为一次批量 UPDATE，
+写库次数随活跃会话数而不是请求数增长
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+from sqlalchemy import bindparam, update
+
+from app.infrastructure.database.write_queue import run_write
+from app.infrastructure.persistence.sqlalchemy.models.user import UserOnline
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+class LastAccessBuffer:
+    """最后访问时间写回缓冲
+
+    - touch 只更新内存字典，同一会话多次访问合并为一条
+    - 后台任务每 flush_interval 秒执行一次批量 UPDATE
+    - 写库失败时把记录合并回缓冲，下一次刷新重试
+    - 停止时写完剩余记录
+    """
+
+    def __init__(self, session_factory: Optional[Callable[[], Any]] = None, flush_interval: float = 30):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.touches = 0
+        self.flushes = 0
+        self.written = 0
+        self.failed_flushes = 0
+
+    @property
+    def session_factory(self) -> Callable[[], Any]:
+        """懒加载会话工厂，避免导入时创建引擎"""
+        if self._session_factory is None:
+            from app.infrastructure.persistence.sqlalchemy.database import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    def touch(self, session_id: Optional[str], at: Optional[datetime] = None) -> None:
+        """记录会话访问"""
+        if not session_id:
+            return
+        self.touches += 1
+        self._pending[session_id] = at or datetime.now()
+
+    async def start(self) -> None:
+        """启动定时刷新任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止定时刷新任务并写完剩余记录"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """将缓冲的访问时间批量写入数据库，返回写入的会话数"""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        params = [{"b_token": token, "b_time": at} for token, at in pending.items()]
+        statement = (
+            update(UserOnline.__table__)
+            .where(UserOnline.__table__.c.token == bindparam("b_token"))
+            .values(last_access_time=bindparam("b_time"))
+        )
+        try:
+            async with self.session_factory() as session:
+                await run_write(session, lambda db: db.execute(statement, params))
+        except Exception as e:
+            self.failed_flushes += 1
+            for token, at in pending.items():
+                current = self._pending.get(token)
+                if current is None or current < at:
+                    self._pending[token] = at
+            logger.error(f"在线会话访问时间写入失败（{len(pending)} 条）: {e}")
+            return 0
+        self.flushes += 1
+        self.written += len(pending)
+        return len(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """获取缓冲统计信息"""
+        return {
+            "pending": len(self._pending),
+            "touches": self.touches,
+            "flushes": self.flushes,
+            "written": self.written,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+# 创建全局最后访问时间缓冲
+last_access_buffer = LastAccessBuffer(flush_interval=settings.ONLINE_ACCESS_FLUSH_INTERVAL)
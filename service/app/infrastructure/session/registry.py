@@ -0,0 +1,392 @@
+"""
+在线会话注册表
+在线会话保存在进程内存中，按用户ID分片；空闲会话由时间轮过期，
+在线列表的计数与分页直接读内存，数据库只接收定期的增量快照用于崩溃恢复
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import delete, select
+
+from app.infrastructure.database.write_queue import run_write
+from app.infrastructure.persistence.sqlalchemy.models.user import UserOnline
+from app.infrastructure.session.last_access import LastAccessBuffer, last_access_buffer
+from shared.kernel.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass
+class OnlineSession:
+    """在线会话"""
+    session_id: str  # 访问令牌 jti
+    user_id: str
+    username: str
+    nickname: str = ""
+    ip: Optional[str] = None
+    location: Optional[str] = None
+    browser: Optional[str] = None
+    os: Optional[str] = None
+    login_time: float = field(default_factory=time.time)
+    last_access_time: float = 0.0
+    sequence: int = 0  # 登记顺序，由注册表分配
+
+    def __post_init__(self):
+        if not self.last_access_time:
+            self.last_access_time = self.login_time
+
+
+class TimingWheel:
+    """时间轮
+
+    每个槽位对应一个 tick，键按到期 tick 放入槽位；超出一圈的到期时间先放在最远的槽位，
+    到期时由调用方检查真实到期时间并重新调度。推进一次的开销与到期键数量成正比。
+    """
+
+    def __init__(self, tick: float, slots: int, now: float):
+        self.tick = tick
+        self._slots: List[Set[str]] = [set() for _ in range(max(slots, 2))]
+        self._slot_of: Dict[str, int] = {}
+        self._current = int(now // tick)
+
+    def schedule(self, key: str, expires_at: float) -> None:
+        """调度键在 expires_at 到期"""
+        self.discard(key)
+        target = int(expires_at // self.tick)
+        target = min(max(target, self._current + 1), self._current + len(self._slots) - 1)
+        index = target % len(self._slots)
+        self._slots[index].add(key)
+        self._slot_of[key] = index
+
+    def discard(self, key: str) -> None:
+        """取消调度"""
+        index = self._slot_of.pop(key, None)
+        if index is not None:
+            self._slots[index].discard(key)
+
+    def advance(self, now: float) -> List[str]:
+        """推进到 now，返回到期槽位中的键"""
+        target = int(now // self.tick)
+        steps = min(target - self._current, len(self._slots))
+        due: List[str] = []
+        for offset in range(1, steps + 1):
+            bucket = self._slots[(self._current + offset) % len(self._slots)]
+            for key in bucket:
+                self._slot_of.pop(key, None)
+            due.extend(bucket)
+            bucket.clear()
+        self._current = max(self._current, target)
+        return due
+
+
+class _Shard:
+    """注册表分片（按登录先后保存会话）"""
+
+    def __init__(self, tick: float, slots: int):
+        self.lock = threading.Lock()
+        self.sessions: "OrderedDict[str, OnlineSession]" = OrderedDict()
+        self.by_user: Dict[str, str] = {}
+        self.wheel = TimingWheel(tick, slots, time.time())
+
+
+class OnlineSessionRegistry:
+    """在线会话注册表
+
+    - 每个用户只保留最近一次登录的会话，登录时替换旧会话
+    - 计数 O(1)；分页按登记顺序倒序多路合并各分片，只遍历到目标页为止
+    - 访问时只更新内存中的最后访问时间（不移动时间轮槽位），并转交写回缓冲
+    - 新增与移除的会话记录为增量，由 snapshot 定期写入 online_users
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        idle_timeout: float = 1800,
+        tick: float = 5,
+        access_buffer: Optional[LastAccessBuffer] = None,
+        session_factory: Optional[Callable[[], Any]] = None
+    ):
+        self.idle_timeout = idle_timeout
+        self.tick = tick
+        slots = int(idle_timeout // tick) + 2
+        self._shards = [_Shard(tick, slots) for _ in range(max(shards, 1))]
+        self._index: Dict[str, int] = {}
+        self._index_lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self.access_buffer = access_buffer
+        self._session_factory = session_factory
+        self._added: Dict[str, OnlineSession] = {}
+        self._removed: Set[str] = set()
+        self._delta_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.expired = 0
+        self.snapshots = 0
+
+    @property
+    def session_factory(self) -> Callable[[], Any]:
+        """懒加载会话工厂，避免导入时创建引擎"""
+        if self._session_factory is None:
+            from app.infrastructure.persistence.sqlalchemy.database import AsyncSessionLocal
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory
+
+    def _shard_for(self, user_id: str) -> int:
+        return hash(str(user_id)) % len(self._shards)
+
+    def _record_added(self, session: OnlineSession) -> None:
+        with self._delta_lock:
+            self._added[session.session_id] = session
+
+    def _record_removed(self, session_id: str) -> None:
+        with self._delta_lock:
+            if self._added.pop(session_id, None) is None:
+                self._removed.add(session_id)
+
+    def _remove_locked(self, shard: _Shard, session_id: str) -> Optional[OnlineSession]:
+        """从分片中移除会话（调用方持有分片锁）"""
+        session = shard.sessions.pop(session_id, None)
+        if session is None:
+            return None
+        if shard.by_user.get(session.user_id) == session_id:
+            del shard.by_user[session.user_id]
+        shard.wheel.discard(session_id)
+        with self._index_lock:
+            self._index.pop(session_id, None)
+        self._record_removed(session_id)
+        return session
+
+    def register(self, session: OnlineSession, track: bool = True) -> None:
+        """登记会话，替换该用户之前的会话"""
+        index = self._shard_for(session.user_id)
+        shard = self._shards[index]
+        session.sequence = next(self._sequence)
+        with shard.lock:
+            previous = shard.by_user.get(session.user_id)
+            if previous is not None:
+                self._remove_locked(shard, previous)
+            shard.sessions[session.session_id] = session
+            shard.by_user[session.user_id] = session.session_id
+            shard.wheel.schedule(session.session_id, session.last_access_time + self.idle_timeout)
+        with self._index_lock:
+            self._index[session.session_id] = index
+        if track:
+            self._record_added(session)
+
+    def _locate(self, session_id: Optional[str]) -> Optional[_Shard]:
+        if not session_id:
+            return None
+        with self._index_lock:
+            index = self._index.get(session_id)
+        return self._shards[index] if index is not None else None
+
+    def touch(self, session_id: Optional[str], now: Optional[float] = None) -> bool:
+        """记录会话访问，会话不存在时返回 False"""
+        shard = self._locate(session_id)
+        if shard is None:
+            return False
+        now = now or time.time()
+        with shard.lock:
+            session = shard.sessions.get(session_id)
+            if session is None:
+                return False
+            session.last_access_time = now
+        if self.access_buffer is not None:
+            self.access_buffer.touch(session_id, datetime.fromtimestamp(now))
+        return True
+
+    def remove(self, session_id: Optional[str]) -> bool:
+        """移除会话（登出、强制下线）"""
+        shard = self._locate(session_id)
+        if shard is None:
+            return False
+        with shard.lock:
+            return self._remove_locked(shard, session_id) is not None
+
+    def rotate(self, old_session_id: Optional[str], new_session_id: str) -> bool:
+        """令牌刷新后将会话切换到新的令牌ID，保留登录时间"""
+        shard = self._locate(old_session_id)
+        if shard is None:
+            return False
+        with shard.lock:
+            session = shard.sessions.get(old_session_id)
+        if session is None:
+            return False
+        self.register(replace(session, session_id=new_session_id, last_access_time=time.time()))
+        return True
+
+    def get(self, session_id: str) -> Optional[OnlineSession]:
+        """获取会话"""
+        shard = self._locate(session_id)
+        if shard is None:
+            return None
+        with shard.lock:
+            return shard.sessions.get(session_id)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """推进时间轮并移除空闲超时的会话，返回移除数量"""
+        now = now or time.time()
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                for session_id in shard.wheel.advance(now):
+                    session = shard.sessions.get(session_id)
+                    if session is None:
+                        continue
+                    expires_at = session.last_access_time + self.idle_timeout
+                    if expires_at <= now:
+                        self._remove_locked(shard, session_id)
+                        removed += 1
+                    else:
+                        shard.wheel.schedule(session_id, expires_at)
+        self.expired += removed
+        return removed
+
+    def count(self) -> int:
+        """在线会话数"""
+        with self._index_lock:
+            return len(self._index)
+
+    def _iter_newest_first(self, limit: Optional[int] = None) -> Iterator[OnlineSession]:
+        """按登记顺序倒序遍历会话（各分片内已按登记先后有序，多路合并）
+
+        合并结果的前 limit 个会话在任一分片中都不会超过该分片最新的 limit 个，
+        因此每个分片只在锁内复制最新的 limit 个会话，开销与页码和页大小相关而与在线总数无关。
+        """
+        snapshots = []
+        for shard in self._shards:
+            with shard.lock:
+                snapshots.append(list(itertools.islice(reversed(shard.sessions.values()), limit)))
+        return heapq.merge(*snapshots, key=lambda session: session.sequence, reverse=True)
+
+    def page(self, page: int = 1, page_size: int = 10) -> Tuple[List[OnlineSession], int]:
+        """分页获取在线会话，最近登记的在前"""
+        page = max(page, 1)
+        offset = (page - 1) * page_size
+        newest = self._iter_newest_first(offset + page_size)
+        items = list(itertools.islice(newest, offset, offset + page_size))
+        return items, self.count()
+
+    async def snapshot(self) -> int:
+        """将上次快照以来新增与移除的会话写入数据库，返回写入的变更数"""
+        with self._delta_lock:
+            added, self._added = self._added, {}
+            removed, self._removed = self._removed, set()
+        if not added and not removed:
+            return 0
+
+        def unit(db):
+            stale = list(removed) + list(added)
+            if stale:
+                db.execute(delete(UserOnline).where(UserOnline.token.in_(stale)))
+            db.add_all([
+                UserOnline(
+                    user_id=int(session.user_id),
+                    username=session.username,
+                    nickname=session.nickname,
+                    token=session.session_id,
+                    ip=session.ip,
+                    location=session.location,
+                    browser=session.browser,
+                    os=session.os,
+                    login_time=datetime.fromtimestamp(session.login_time),
+                    last_access_time=datetime.fromtimestamp(session.last_access_time)
+                )
+                for session in added.values()
+            ])
+
+        try:
+            async with self.session_factory() as db:
+                await run_write(db, unit)
+        except Exception as e:
+            with self._delta_lock:
+                for session_id, session in added.items():
+                    self._added.setdefault(session_id, session)
+                self._removed |= removed - set(self._added)
+            logger.error(f"在线会话快照写入失败: {e}")
+            return 0
+        self.snapshots += 1
+        return len(added) + len(removed)
+
+    async def restore(self) -> int:
+        """启动时从最近的快照恢复未过期的会话，并清理已过期的记录"""
+        cutoff = time.time() - self.idle_timeout
+        async with self.session_factory() as db:
+            rows = (await db.execute(
+                select(UserOnline).order_by(UserOnline.login_time)
+            )).scalars().all()
+            stale = []
+            for row in rows:
+                last_access = row.last_access_time.timestamp()
+                if last_access <= cutoff:
+                    stale.append(row.token)
+                    continue
+                self.register(OnlineSession(
+                    session_id=row.token,
+                    user_id=str(row.user_id),
+                    username=row.username,
+                    nickname=row.nickname or "",
+                    ip=row.ip,
+                    location=row.location,
+                    browser=row.browser,
+                    os=row.os,
+                    login_time=row.login_time.timestamp(),
+                    last_access_time=last_access
+                ), track=False)
+            if stale:
+                await db.execute(delete(UserOnline).where(UserOnline.token.in_(stale)))
+                await db.commit()
+        return self.count()
+
+    async def start(self, snapshot_interval: float) -> None:
+        """启动过期与快照后台任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(snapshot_interval))
+
+    async def stop(self) -> None:
+        """停止后台任务并写入最后一次快照"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.snapshot()
+
+    async def _run(self, snapshot_interval: float) -> None:
+        last_snapshot = time.monotonic()
+        while True:
+            await asyncio.sleep(self.tick)
+            self.expire()
+            if time.monotonic() - last_snapshot >= snapshot_interval:
+                await self.snapshot()
+                last_snapshot = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """获取注册表统计信息"""
+        with self._delta_lock:
+            pending = len(self._added) + len(self._removed)
+        return {
+            "online": self.count(),
+            "shards": len(self._shards),
+            "expired": self.expired,
+            "snapshots": self.snapshots,
+            "pending_changes": pending,
+        }
+
+
+# 创建全局在线会话注册表
+online_sessions = OnlineSessionRegistry(
+    shards=settings.ONLINE_SESSION_SHARDS,
+    idle_timeout=settings.ONLINE_SESSION_IDLE_TIMEOUT,
+    tick=settings.ONLINE_SESSION_WHEEL_TICK,
+    access_buffer=last_access_buffer
+)
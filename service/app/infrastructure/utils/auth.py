@@ -1,11 +1,14 @@
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.config import settings
+from app.infrastructure.auth.hash_pool import password_context, password_hash_pool
+from app.infrastructure.auth.revocation import token_revocation_store
+from shared.kernel.exceptions import TooManyRequestsError
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = password_context
 
 
 class AuthService:
@@ -21,6 +24,19 @@ class AuthService:
             sha256_hash = hashlib.sha256(plain_password.encode()).hexdigest()
             return sha256_hash == hashed_password
 
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        """在哈希工作池中验证密码"""
+        try:
+            return await password_hash_pool.verify(plain_password, hashed_password)
+        except TooManyRequestsError:
+            raise
+        except Exception:
+            # 如果 bcrypt 失败，尝试 SHA256 验证（备用方案）
+            import hashlib
+            sha256_hash = hashlib.sha256(plain_password.encode()).hexdigest()
+            return sha256_hash == hashed_password
+
     @staticmethod
     def get_password_hash(password: str) -> str:
         """获取密码哈希"""
@@ -46,7 +62,7 @@ class AuthService:
             expire = datetime.utcnow() + expires_delta
         else:
             expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
@@ -55,7 +71,7 @@ class AuthService:
         """创建刷新令牌"""
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
-        to_encode.update({"exp": expire})
+        to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
         encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
         return encoded_jwt
 
@@ -67,6 +83,22 @@ class AuthService:
             username = payload.get("sub")
             if username is None:
                 return None
+            jti = payload.get("jti")
+            if jti and token_revocation_store.is_revoked(jti):
+                return None
             return username
         except JWTError:
-            return None
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def revoke_token(token: str) -> bool:
+        """吊销令牌"""
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            return False
+        jti = payload.get("jti")
+        if not jti:
+            return False
+        token_revocation_store.revoke(jti, float(payload["exp"]))
+        return True
\ No newline at end of file
@@ -1,19 +1,36 @@
 from functools import lru_cache
+from typing import AsyncGenerator
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.persistence.sqlalchemy.database import get_db
+from app.infrastructure.persistence.sqlalchemy.database import get_db, get_read_db
+from app.infrastructure.database.unit_of_work import UnitOfWork
 from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
 from app.infrastructure.persistence.sqlalchemy.repositories.role_repo_impl import SQLAlchemyRoleRepository
 from app.application.services.user_service import UserService
 from app.application.services.role_service import RoleService
 from app.infrastructure.auth.jwt_handler import JWTHandler
 from app.infrastructure.auth.password_handler import PasswordHandler
+from app.infrastructure.session.registry import online_sessions
+from app.infrastructure.auth.permission_claims import (
+    AuthPrincipal, load_principal_user, resolve_principal
+)
 
 # JWT安全方案
 security = HTTPBearer()
 
+# 工作单元依赖
+async def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> AsyncGenerator[UnitOfWork, None]:
+    """获取请求级工作单元
+
+    与同一请求中的仓储共用 get_db 会话，仓储写操作不再各自提交。
+    依赖的清理代码在响应发送之后才执行，处理函数应在返回前 await uow.commit()；
+    清理时提交遗漏的写入，处理函数抛出异常时回滚。
+    """
+    async with UnitOfWork(db) as uow:
+        yield uow
+
 # 仓储依赖
 def get_user_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyUserRepository:
     """获取用户仓储实例"""
@@ -23,6 +40,14 @@ def get_role_repository(db: AsyncSession = Depends(get_db)) -> SQLAlchemyRoleRep
     """获取角色仓储实例"""
     return SQLAlchemyRoleRepository(db)
 
+def get_read_user_repository(db: AsyncSession = Depends(get_read_db)) -> SQLAlchemyUserRepository:
+    """获取只读用户仓储实例（配置了只读副本时读取副本）"""
+    return SQLAlchemyUserRepository(db, read_only=True)
+
+def get_read_role_repository(db: AsyncSession = Depends(get_read_db)) -> SQLAlchemyRoleRepository:
+    """获取只读角色仓储实例（配置了只读副本时读取副本）"""
+    return SQLAlchemyRoleRepository(db, read_only=True)
+
 # 服务依赖
 def get_user_service(
     user_repo: SQLAlchemyUserRepository = Depends(get_user_repository)
@@ -49,13 +74,19 @@ def get_password_handler() -> PasswordHandler:
     """获取密码处理器"""
     return PasswordHandler()
 
+def _principal_user_loader(user_repo: SQLAlchemyUserRepository):
+    """按ID加载用户及其角色、菜单（认证依赖在主体缓存未命中时使用）"""
+    async def load(user_id: str):
+        return await user_repo.get_by_id(user_id, hydration="full")
+    return load
+
 # 获取当前用户依赖
 async def get_current_user(
     credentials = Depends(security),
-    user_service: UserService = Depends(get_user_service),
+    user_repo: SQLAlchemyUserRepository = Depends(get_user_repository),
     jwt_handler: JWTHandler = Depends(get_jwt_handler)
 ):
-    """获取当前认证用户"""
+    """获取当前认证用户（完整的领域用户；只需角色与权限时使用 get_current_principal）"""
     try:
         payload = jwt_handler.verify_token(credentials.credentials)
         if not payload:
@@ -69,7 +100,8 @@ async def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="令牌无效"
             )
-        user = await user_service.get_user(user_id)
+        online_sessions.touch(payload.get("jti"))
+        user = await load_principal_user(user_id, _principal_user_loader(user_repo))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -80,4 +112,42 @@ async def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="认证失败"
-        )
\ No newline at end of file
+        )
+
+# 获取当前认证主体依赖（令牌权限声明快速路径）
+async def get_current_principal(
+    credentials = Depends(security),
+    jwt_handler: JWTHandler = Depends(get_jwt_handler),
+    user_repo: SQLAlchemyUserRepository = Depends(get_user_repository)
+) -> AuthPrincipal:
+    """获取当前认证主体
+
+    令牌携带的权限版本仍然有效时直接由令牌得出角色与权限，
+    否则经主体缓存或数据库加载用户角色。
+    """
+    payload = jwt_handler.verify_token(credentials.credentials)
+    if not payload or not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="令牌无效"
+        )
+    online_sessions.touch(payload.get("jti"))
+
+    principal = await resolve_principal(payload, _principal_user_loader(user_repo))
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="用户不存在"
+        )
+    return principal
+
+def require_permission(permission: str):
+    """权限校验依赖工厂"""
+    async def checker(principal: AuthPrincipal = Depends(get_current_principal)) -> AuthPrincipal:
+        if not principal.has_permission(permission):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="权限不足"
+            )
+        return principal
+    return checker
\ No newline at end of file
@@ -1,7 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.infrastructure.database.database import get_db
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 
 router = APIRouter()
 
@@ -9,8 +7,7 @@ router = APIRouter()
 @router.post("/get-card-list")
 async def get_card_list(
     request: dict,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal)
 ):
     """获取卡片列表"""
     try:
@@ -70,14 +67,12 @@ async def get_card_list(
 
 @router.get("/get-async-routes")
 async def get_async_routes(
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal)
 ):
     """获取异步路由"""
     try:
-        # 根据用户角色返回不同的路由
-        user_roles = getattr(current_user, 'user_roles', [])
-        is_admin = any(ur.role.code == 'admin' for ur in user_roles if ur.role)
+        # 根据用户角色返回不同的路由（角色编码来自令牌声明或主体缓存）
+        is_admin = current_user.has_role('admin')
         
         # 系统管理路由
         system_management_router = {
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app.infrastructure.database.database import get_db
-from app.presentation.api.dependencies import get_current_user
+from app.infrastructure.database.database import get_read_db
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.user import TableResponse, PageResponse
 from app.application.services.system_service import SystemService
+from app.infrastructure.session.registry import online_sessions
+from shared.kernel.exceptions import ValidationException
 from datetime import datetime
 
 router = APIRouter()
@@ -12,32 +14,27 @@ router = APIRouter()
 @router.post("/online-logs", response_model=TableResponse)
 async def get_online_logs(
     request: dict,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal)
 ):
-    """获取在线用户列表"""
+    """获取在线用户列表（直接读取内存中的在线会话注册表）"""
     try:
-        system_service = SystemService(db)
         page = request.get("currentPage", 1)
         page_size = request.get("pageSize", 10)
         
-        online_users, total = system_service.get_online_logs(page, page_size)
+        online_users, total = online_sessions.page(page, page_size)
         
         user_list = []
         for online_user in online_users:
-            login_time = getattr(online_user, 'login_time', None)
-            last_access_time = getattr(online_user, 'last_access_time', None)
-            
             user_list.append({
-                "id": getattr(online_user, 'id', ''),
-                "username": getattr(online_user, 'username', ''),
-                "nickname": getattr(online_user, 'nickname', ''),
-                "ip": getattr(online_user, 'ip', ''),
-                "location": getattr(online_user, 'location', None) or "未知",
-                "browser": getattr(online_user, 'browser', None) or "未知",
-                "os": getattr(online_user, 'os', None) or "未知",
-                "loginTime": int(login_time.timestamp() * 1000) if login_time and isinstance(login_time, datetime) else None,
-                "lastAccessTime": int(last_access_time.timestamp() * 1000) if last_access_time and isinstance(last_access_time, datetime) else None
+                "id": online_user.session_id,
+                "username": online_user.username,
+                "nickname": online_user.nickname,
+                "ip": online_user.ip or "",
+                "location": online_user.location or "未知",
+                "browser": online_user.browser or "未知",
+                "os": online_user.os or "未知",
+                "loginTime": int(online_user.login_time * 1000),
+                "lastAccessTime": int(online_user.last_access_time * 1000)
             })
         
         return TableResponse(
@@ -54,10 +51,10 @@ async def get_online_logs(
 
 
 @router.post("/login-logs", response_model=TableResponse)
-async def get_login_logs(
+def get_login_logs(
     request: dict,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """获取登录日志列表"""
     try:
@@ -65,7 +62,14 @@ async def get_login_logs(
         page = request.get("currentPage", 1)
         page_size = request.get("pageSize", 10)
         
-        logs, total = system_service.get_login_logs(page, page_size)
+        # 请求中带 cursor 字段时按游标分页（空值表示第一页），否则沿用页码分页
+        next_cursor = prev_cursor = None
+        if "cursor" in request:
+            result = system_service.get_login_logs_page(request.get("cursor") or None, page_size)
+            logs, total = result.items, None
+            next_cursor, prev_cursor = result.next_cursor, result.prev_cursor
+        else:
+            logs, total = system_service.get_login_logs(page, page_size, request.get("total", "exact"))
         
         log_list = []
         for log in logs:
@@ -89,18 +93,22 @@ async def get_login_logs(
                 list=log_list,
                 total=total,
                 pageSize=page_size,
-                currentPage=page
+                currentPage=page,
+                nextCursor=next_cursor,
+                prevCursor=prev_cursor
             )
         )
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/operation-logs", response_model=TableResponse)
-async def get_operation_logs(
+def get_operation_logs(
     request: dict,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """获取操作日志列表"""
     try:
@@ -108,7 +116,14 @@ async def get_operation_logs(
         page = request.get("currentPage", 1)
         page_size = request.get("pageSize", 10)
         
-        logs, total = system_service.get_operation_logs(page, page_size)
+        # 请求中带 cursor 字段时按游标分页（空值表示第一页），否则沿用页码分页
+        next_cursor = prev_cursor = None
+        if "cursor" in request:
+            result = system_service.get_operation_logs_page(request.get("cursor") or None, page_size)
+            logs, total = result.items, None
+            next_cursor, prev_cursor = result.next_cursor, result.prev_cursor
+        else:
+            logs, total = system_service.get_operation_logs(page, page_size, request.get("total", "exact"))
         
         log_list = []
         for log in logs:
@@ -135,18 +150,22 @@ async def get_operation_logs(
                 list=log_list,
                 total=total,
                 pageSize=page_size,
-                currentPage=page
+                currentPage=page,
+                nextCursor=next_cursor,
+                prevCursor=prev_cursor
             )
         )
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/system-logs", response_model=TableResponse)
-async def get_system_logs(
+def get_system_logs(
     request: dict,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """获取系统日志列表"""
     try:
@@ -154,7 +173,14 @@ async def get_system_logs(
         page = request.get("currentPage", 1)
         page_size = request.get("pageSize", 10)
         
-        logs, total = system_service.get_system_logs(page, page_size)
+        # 请求中带 cursor 字段时按游标分页（空值表示第一页），否则沿用页码分页
+        next_cursor = prev_cursor = None
+        if "cursor" in request:
+            result = system_service.get_system_logs_page(request.get("cursor") or None, page_size)
+            logs, total = result.items, None
+            next_cursor, prev_cursor = result.next_cursor, result.prev_cursor
+        else:
+            logs, total = system_service.get_system_logs(page, page_size, request.get("total", "exact"))
         
         log_list = []
         for log in logs:
@@ -176,18 +202,22 @@ async def get_system_logs(
                 list=log_list,
                 total=total,
                 pageSize=page_size,
-                currentPage=page
+                currentPage=page,
+                nextCursor=next_cursor,
+                prevCursor=prev_cursor
             )
         )
+    except ValidationException as e:
+        raise HTTPException(status_code=400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/system-logs-detail")
-async def get_system_log_detail(
+def get_system_log_detail(
     request: dict,
-    current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_current_principal),
+    db: Session = Depends(get_read_db)
 ):
     """获取系统日志详情"""
     try:
@@ -1,11 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.application.services.system_service import SystemService
 from app.application.services.user_service import UserService
-from app.infrastructure.database.database import get_db
-from app.presentation.api.dependencies import get_current_user, get_user_service, get_role_service
+from app.presentation.api.dependencies import get_current_principal, get_user_service, get_role_service
 from app.presentation.schemas.system import *
 from app.presentation.schemas.user import *
 
@@ -15,7 +13,7 @@ router = APIRouter()
 @router.post("/user", response_model=TableResponse)
 async def get_user_list(
         request: UserListRequest,
-        current_user=Depends(get_current_user),
+        current_user=Depends(get_current_principal),
         user_service: UserService = Depends(get_user_service)
 ):
     """获取用户列表"""
@@ -26,7 +24,8 @@ async def get_user_list(
             skip=(request.currentPage or 1 - 1) * (request.pageSize or 10),
             limit=request.pageSize or 10
         )
-        total = await user_service.count_users()
+        # 用户表没有可用的估算方式，estimate 与 exact 相同（总数经缓存）
+        total = await user_service.count_users() if request.total != "none" else None
 
         # 转换为前端需要的格式
         user_list = []
@@ -62,7 +61,7 @@ async def get_user_list(
 
 @router.get("/list-all-role")
 async def get_all_roles(
-        current_user=Depends(get_current_user),
+        current_user=Depends(get_current_principal),
         role_service = Depends(get_role_service)
 ):
     """获取所有角色列表"""
@@ -87,7 +86,7 @@ async def get_all_roles(
 @router.post("/list-role-ids")
 async def get_user_role_ids(
         request: dict,
-        current_user=Depends(get_current_user),
+        current_user=Depends(get_current_principal),
         role_service = Depends(get_role_service)
 ):
     """根据用户ID获取角色ID列表"""
@@ -111,7 +110,7 @@ async def get_user_role_ids(
 @router.post("/role", response_model=TableResponse)
 async def get_role_list(
         request: RoleListRequest,
-        current_user=Depends(get_current_user),
+        current_user=Depends(get_current_principal),
         role_service = Depends(get_role_service)
 ):
     """获取角色列表"""
@@ -150,7 +149,7 @@ async def get_role_list(
 @router.post("/menu")
 async def get_menu_list(
         request: dict,
-        current_user=Depends(get_current_user)
+        current_user=Depends(get_current_principal)
 ):
     """获取菜单列表"""
     try:
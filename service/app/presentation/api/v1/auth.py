@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.application.services.user_service import UserService
 from app.application.dto.user_dto import UserLogin
 from app.presentation.dto.response_dto import SuccessResponse, TokenResponse
-from app.presentation.api.dependencies import get_user_service, get_jwt_handler, get_password_handler
+from app.presentation.api.dependencies import get_user_service, get_role_repository, get_jwt_handler, get_password_handler
+from app.infrastructure.persistence.sqlalchemy.repositories.role_repo_impl import SQLAlchemyRoleRepository
+from app.infrastructure.auth.permission_claims import build_permission_claims
+from app.infrastructure.auth.login_guard import login_admission
+from app.infrastructure.audit.login_audit import LoginAuditRecord, login_audit_writer, parse_user_agent
+from app.infrastructure.session.registry import OnlineSession, online_sessions
 from app.infrastructure.auth.jwt_handler import JWTHandler
 from app.infrastructure.auth.password_handler import PasswordHandler
-from shared.kernel.exceptions import BusinessException
+from shared.kernel.exceptions import BusinessException, TooManyRequestsError
 
 router = APIRouter(prefix="/api/v1/auth", tags=["认证"])
 security = HTTPBearer()
@@ -15,24 +24,59 @@ security = HTTPBearer()
 @router.post("/login", response_model=SuccessResponse[TokenResponse])
 async def login(
     login_data: UserLogin,
+    request: Request,
+    background_tasks: BackgroundTasks,
     user_service: UserService = Depends(get_user_service),
     jwt_handler: JWTHandler = Depends(get_jwt_handler),
     password_handler: PasswordHandler = Depends(get_password_handler)
 ):
-    """用户登录"""
+    """用户登录
+
+    用户、密码哈希、角色与菜单权限由一次查询加载，
+    在线会话登记在内存注册表，登录日志（含认证失败与准入拒绝）交给后台写入器，
+    需要更新的密码哈希在响应发送后重新计算，校验通过后直接返回令牌。
+    """
+    client_ip = request.client.host if request.client else None
+    agent = request.headers.get("user-agent")
     try:
-        # 用户认证
-        user = await user_service.authenticate_user(login_data.username, login_data.password)
+        # 用户认证（先经过准入控制，超限请求在哈希前被拒绝）
+        async with login_admission.admit(login_data.username, client_ip):
+            user = await user_service.authenticate_user(
+                login_data.username, login_data.password, defer=background_tasks.add_task
+            )
         if not user:
+            _submit_failed_login(login_data.username, client_ip, agent)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="用户名或密码错误"
             )
         
-        # 生成令牌
-        token_data = {"sub": user.id, "username": user.username}
+        # 生成令牌（角色已随用户一并加载）
+        session_id = uuid.uuid4().hex
+        token_data = {"sub": user.id, "username": user.username, "jti": session_id}
+        if jwt_handler.embed_permissions:
+            token_data.update(build_permission_claims(user.id, user.roles))
         access_token = jwt_handler.create_access_token(token_data)
         
+        # 登记在线会话，登录日志延后写入
+        browser, system = parse_user_agent(agent)
+        online_sessions.register(OnlineSession(
+            session_id=session_id,
+            user_id=user.id,
+            username=user.username,
+            nickname=user.nickname,
+            ip=client_ip,
+            browser=browser,
+            os=system
+        ))
+        login_audit_writer.submit(LoginAuditRecord(
+            user_id=user.id,
+            username=user.username,
+            nickname=user.nickname,
+            ip=client_ip,
+            agent=agent
+        ))
+        
         token_response = TokenResponse(
             access_token=access_token,
             token_type="bearer",
@@ -41,23 +85,46 @@ async def login(
         
         return SuccessResponse(data=token_response, message="登录成功")
         
+    except TooManyRequestsError as e:
+        _submit_failed_login(login_data.username, client_ip, agent)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=e.message,
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except BusinessException as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
+def _submit_failed_login(username: str, client_ip: Optional[str], agent: Optional[str]) -> None:
+    """提交失败的登录审计记录，用户ID由写入器按用户名查出"""
+    login_audit_writer.submit(LoginAuditRecord(
+        user_id=None,
+        username=username,
+        ip=client_ip,
+        agent=agent,
+        status=False
+    ))
+
 @router.post("/logout", response_model=SuccessResponse[None])
 async def logout(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    jwt_handler: JWTHandler = Depends(get_jwt_handler)
 ):
     """用户登出"""
-    # 简化实现，实际应该将令牌加入黑名单
+    payload = jwt_handler.verify_token(credentials.credentials)
+    if payload:
+        online_sessions.remove(payload.get("jti"))
+    # 吊销需写持久化后端，放到线程池中执行以免阻塞事件循环
+    await run_in_threadpool(jwt_handler.revoke_token, credentials.credentials)
     return SuccessResponse(message="登出成功")
 
 @router.post("/refresh", response_model=SuccessResponse[TokenResponse])
 async def refresh_token(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+    role_repo: SQLAlchemyRoleRepository = Depends(get_role_repository),
     jwt_handler: JWTHandler = Depends(get_jwt_handler)
 ):
     """刷新令牌"""
@@ -70,9 +137,14 @@ async def refresh_token(
                 detail="令牌无效"
             )
         
-        # 生成新令牌
-        token_data = {"sub": payload["sub"], "username": payload.get("username")}
+        # 生成新令牌，在线会话切换到新的令牌ID
+        session_id = uuid.uuid4().hex
+        token_data = {"sub": payload["sub"], "username": payload.get("username"), "jti": session_id}
+        if jwt_handler.embed_permissions:
+            roles = await role_repo.find_by_user_id(payload["sub"])
+            token_data.update(build_permission_claims(payload["sub"], roles))
         access_token = jwt_handler.create_access_token(token_data)
+        online_sessions.rotate(payload.get("jti"), session_id)
         
         token_response = TokenResponse(
             access_token=access_token,
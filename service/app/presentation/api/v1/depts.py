@@ -5,25 +5,26 @@ from datetime import datetime
 
 from app.infrastructure.database.database import get_db
 from app.domain.organization.entities.department import Department
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.common import BaseResponse, PaginatedResponse, PaginationData
+from app.infrastructure.database.counting import paginate_with_total
 
 router = APIRouter(prefix="/api/v1/depts", tags=["部门管理"])
 
 
 @router.get("", response_model=PaginatedResponse)
-async def list_depts(
+def list_depts(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页记录数"),
+    total_mode: str = Query("exact", alias="total", pattern="^(exact|estimate|none)$", description="总数模式: exact 精确, estimate 估算, none 不统计"),
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """获取部门列表"""
     try:
         # 查询部门列表
         query = db.query(Department)
-        total = query.count()
-        depts = query.offset((page - 1) * page_size).limit(page_size).all()
+        depts, total = paginate_with_total(query, page, page_size, total_mode)
         
         dept_list = []
         for dept in depts:
@@ -38,7 +39,7 @@ async def list_depts(
                 "updated_time": dept.updated_time.isoformat() if dept.updated_time is not None else None
             })
         
-        pages = (total + page_size - 1) // page_size
+        pages = (total + page_size - 1) // page_size if total is not None else None
         pagination_data = PaginationData(
             items=dept_list,
             total=total,
@@ -56,10 +57,10 @@ async def list_depts(
 
 
 @router.get("/{dept_id}", response_model=BaseResponse)
-async def get_dept(
+def get_dept(
     dept_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """获取部门详情"""
     try:
@@ -94,10 +95,10 @@ async def get_dept(
 
 
 @router.post("", response_model=BaseResponse, status_code=status.HTTP_201_CREATED)
-async def create_dept(
+def create_dept(
     dept_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """创建部门"""
     try:
@@ -148,11 +149,11 @@ async def create_dept(
 
 
 @router.put("/{dept_id}", response_model=BaseResponse)
-async def update_dept(
+def update_dept(
     dept_id: str,
     dept_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """更新部门"""
     try:
@@ -197,10 +198,10 @@ async def update_dept(
 
 
 @router.delete("/{dept_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_dept(
+def delete_dept(
     dept_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """删除部门"""
     try:
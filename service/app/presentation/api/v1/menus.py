@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app.infrastructure.database.database import get_db
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.menu import *
 from app.presentation.schemas.common import *
 from app.application.services.menu_service import MenuService
@@ -12,13 +12,14 @@ router = APIRouter(prefix="/api/v1/menus", tags=["菜单管理"])
 
 
 @router.get("", response_model=PaginatedResponse[MenuInList])
-async def get_menus(
+def get_menus(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页记录数"),
     title: Optional[str] = Query(None, description="菜单标题"),
     name: Optional[str] = Query(None, description="菜单名称"),
     menu_type: Optional[int] = Query(None, description="菜单类型"),
-    current_user=Depends(get_current_user),
+    total_mode: str = Query("exact", alias="total", pattern="^(exact|estimate|none)$", description="总数模式: exact 精确, estimate 估算, none 不统计"),
+    current_user=Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """获取菜单列表"""
@@ -29,7 +30,8 @@ async def get_menus(
             page_size=page_size,
             title=title,
             name=name,
-            menu_type=menu_type
+            menu_type=menu_type,
+            total_mode=total_mode
         )
         
         menu_list = []
@@ -61,7 +63,7 @@ async def get_menus(
                 updated_at=getattr(menu, 'updated_at', None)
             ))
         
-        pages = (total + page_size - 1) // page_size
+        pages = (total + page_size - 1) // page_size if total is not None else None
         
         return PaginatedResponse(
             success=True,
@@ -78,8 +80,8 @@ async def get_menus(
 
 
 @router.get("/tree")
-async def get_menu_tree(
-    current_user=Depends(get_current_user),
+def get_menu_tree(
+    current_user=Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """获取菜单树"""
@@ -96,9 +98,9 @@ async def get_menu_tree(
 
 
 @router.get("/{menu_id}", response_model=BaseResponse[MenuDetail])
-async def get_menu(
+def get_menu(
     menu_id: int,
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """获取菜单详情"""
@@ -147,9 +149,9 @@ async def get_menu(
 
 
 @router.post("", response_model=BaseResponse[MenuDetail], status_code=status.HTTP_201_CREATED)
-async def create_menu(
+def create_menu(
     menu_data: MenuCreate,
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """创建菜单"""
@@ -201,10 +203,10 @@ async def create_menu(
 
 
 @router.put("/{menu_id}", response_model=BaseResponse[MenuDetail])
-async def update_menu(
+def update_menu(
     menu_id: int,
     menu_data: MenuUpdate,
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """更新菜单"""
@@ -262,9 +264,9 @@ async def update_menu(
 
 
 @router.delete("/{menu_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_menu(
+def delete_menu(
     menu_id: int,
-    current_user=Depends(get_current_user),
+    current_user=Depends(get_current_principal),
     db: Session = Depends(get_db)
 ):
     """删除菜单"""
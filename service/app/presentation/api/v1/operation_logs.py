@@ -3,27 +3,38 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.infrastructure.database.database import get_db
+from app.infrastructure.database.database import get_db, get_read_db
 from app.domain.audit.entities.log import OperationLog
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.common import BaseResponse, PaginatedResponse, PaginationData
+from app.application.services.system_service import OPERATION_LOG_SORT
+from app.infrastructure.database.counting import paginate_with_total
+from app.infrastructure.database.keyset import paginate_query
+from shared.kernel.exceptions import ValidationException
 
 router = APIRouter(prefix="/api/v1/operation-logs", tags=["操作日志管理"])
 
 
 @router.get("", response_model=PaginatedResponse)
-async def list_operation_logs(
+def list_operation_logs(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页记录数"),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    total_mode: str = Query("exact", alias="total", pattern="^(exact|estimate|none)$", description="总数模式: exact 精确, estimate 估算, none 不统计"),
+    cursor: Optional[str] = Query(None, description="分页游标，传入（空字符串表示第一页）时按游标分页且不统计总数"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_principal)
 ):
     """获取操作日志列表"""
     try:
         # 查询操作日志列表
         query = db.query(OperationLog)
-        total = query.count()
-        logs = query.offset((page - 1) * page_size).limit(page_size).all()
+        next_cursor = prev_cursor = None
+        if cursor is not None:
+            result = paginate_query(query, OPERATION_LOG_SORT, page_size, cursor or None)
+            logs, total = result.items, None
+            next_cursor, prev_cursor = result.next_cursor, result.prev_cursor
+        else:
+            logs, total = paginate_with_total(query, page, page_size, total_mode)
         
         log_list = []
         for log in logs:
@@ -41,28 +52,32 @@ async def list_operation_logs(
                 "updated_time": log.updated_time.isoformat() if log.updated_time is not None else None
             })
         
-        pages = (total + page_size - 1) // page_size
+        pages = (total + page_size - 1) // page_size if total is not None else None
         pagination_data = PaginationData(
             items=log_list,
             total=total,
             page=page,
             page_size=page_size,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
         )
         
         return PaginatedResponse(
             success=True,
             data=pagination_data
         )
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{log_id}", response_model=BaseResponse)
-async def get_operation_log(
+def get_operation_log(
     log_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_principal)
 ):
     """获取操作日志详情"""
     try:
@@ -100,10 +115,10 @@ async def get_operation_log(
 
 
 @router.delete("/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_operation_log(
+def delete_operation_log(
     log_id: int,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """删除操作日志"""
     try:
@@ -4,7 +4,8 @@ from typing import List
 from app.application.services.role_service import RoleService
 from app.application.dto.role_dto import RoleCreate, RoleUpdate, RoleResponse, RoleAssignMenus
 from app.presentation.dto.response_dto import SuccessResponse, PageResponse
-from app.presentation.api.dependencies import get_role_service
+from app.presentation.api.dependencies import get_role_service, get_unit_of_work
+from app.infrastructure.database.unit_of_work import UnitOfWork
 from shared.kernel.exceptions import BusinessException
 
 router = APIRouter(prefix="/api/v1/roles", tags=["角色管理"])
@@ -47,10 +48,12 @@ async def get_role(
 async def create_role(
     role_in: RoleCreate,
     role_service: RoleService = Depends(get_role_service),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """创建角色"""
     try:
         role = await role_service.create_role(role_in)
+        await uow.commit()
         return SuccessResponse(
             data=RoleResponse.from_domain(role),
             message="角色创建成功"
@@ -66,6 +69,7 @@ async def update_role(
     role_id: str,
     role_update: RoleUpdate,
     role_service: RoleService = Depends(get_role_service),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """更新角色"""
     try:
@@ -75,6 +79,7 @@ async def update_role(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="角色不存在"
             )
+        await uow.commit()
         return SuccessResponse(
             data=RoleResponse.from_domain(role),
             message="角色更新成功"
@@ -89,6 +94,7 @@ async def update_role(
 async def delete_role(
     role_id: str,
     role_service: RoleService = Depends(get_role_service),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """删除角色"""
     success = await role_service.delete_role(role_id)
@@ -97,6 +103,7 @@ async def delete_role(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="角色不存在"
         )
+    await uow.commit()
     return SuccessResponse(message="角色删除成功")
 
 @router.put("/{role_id}/menus", response_model=SuccessResponse[None])
@@ -104,6 +111,7 @@ async def assign_role_menus(
     role_id: str,
     menu_data: RoleAssignMenus,
     role_service: RoleService = Depends(get_role_service),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ):
     """分配角色菜单"""
     role = await role_service.assign_menus_to_role(role_id, menu_data.menu_ids)
@@ -112,4 +120,5 @@ async def assign_role_menus(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="角色不存在"
         )
+    await uow.commit()
     return SuccessResponse(message="菜单分配成功")
\ No newline at end of file
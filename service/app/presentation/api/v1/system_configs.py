@@ -5,18 +5,18 @@ from datetime import datetime
 
 from app.infrastructure.database.database import get_db
 from app.domain.audit.entities.log import SystemLog
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.common import BaseResponse, PaginatedResponse, PaginationData
 
 router = APIRouter(prefix="/api/v1/system-configs", tags=["系统配置管理"])
 
 
 @router.get("", response_model=PaginatedResponse)
-async def list_system_configs(
+def list_system_configs(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页记录数"),
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """获取系统配置列表"""
     try:
@@ -56,10 +56,10 @@ async def list_system_configs(
 
 
 @router.get("/{config_id}", response_model=BaseResponse)
-async def get_system_config(
+def get_system_config(
     config_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """获取系统配置详情"""
     try:
@@ -93,10 +93,10 @@ async def get_system_config(
 
 
 @router.post("", response_model=BaseResponse, status_code=status.HTTP_201_CREATED)
-async def create_system_config(
+def create_system_config(
     config_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """创建系统配置"""
     try:
@@ -145,11 +145,11 @@ async def create_system_config(
 
 
 @router.put("/{config_id}", response_model=BaseResponse)
-async def update_system_config(
+def update_system_config(
     config_id: str,
     config_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """更新系统配置"""
     try:
@@ -193,10 +193,10 @@ async def update_system_config(
 
 
 @router.delete("/{config_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_system_config(
+def delete_system_config(
     config_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """删除系统配置"""
     try:
@@ -6,21 +6,21 @@ import uuid
 
 from app.infrastructure.database.database import get_db
 from app.domain.entities.models import TestUser
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.common import BaseResponse, PaginatedResponse, PaginationData
 
 router = APIRouter(prefix="/api/v1/test-users", tags=["测试用户管理"])
 
 
 @router.get("", response_model=PaginatedResponse)
-async def list_test_users(
+def list_test_users(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页记录数"),
     username: str = Query(None, description="用户名搜索"),
     phone: str = Query(None, description="电话搜索"),
     status: int = Query(None, description="状态搜索"),
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """获取测试用户列表"""
     try:
@@ -72,10 +72,10 @@ async def list_test_users(
 
 
 @router.get("/{user_id}", response_model=BaseResponse)
-async def get_test_user(
+def get_test_user(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """获取测试用户详情"""
     try:
@@ -111,10 +111,10 @@ async def get_test_user(
 
 
 @router.post("", response_model=BaseResponse, status_code=status.HTTP_201_CREATED)
-async def create_test_user(
+def create_test_user(
     user_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """创建测试用户"""
     try:
@@ -169,11 +169,11 @@ async def create_test_user(
 
 
 @router.put("/{user_id}", response_model=BaseResponse)
-async def update_test_user(
+def update_test_user(
     user_id: str,
     user_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """更新测试用户"""
     try:
@@ -229,10 +229,10 @@ async def update_test_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_test_user(
+def delete_test_user(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """删除测试用户"""
     try:
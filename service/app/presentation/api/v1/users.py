@@ -3,27 +3,40 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.infrastructure.database.database import get_db
+from app.infrastructure.database.database import get_db, get_read_db
 from app.domain.user.entities.user import User
-from app.presentation.api.dependencies import get_current_user
+from app.presentation.api.dependencies import get_current_principal
 from app.presentation.schemas.common import BaseResponse, PaginatedResponse, PaginationData
+from app.infrastructure.database.counting import paginate_with_total
+from app.infrastructure.database.keyset import SortKey, paginate_query
+from shared.kernel.exceptions import ValidationException
 
 router = APIRouter(prefix="/api/v1/users", tags=["用户管理"])
 
+# 游标分页排序键（与日志接口一致，按创建时间倒序，ID 保证唯一）
+USER_SORT = SortKey([User.created_time, User.id])
+
 
 @router.get("", response_model=PaginatedResponse)
-async def list_users(
+def list_users(
     page: int = Query(1, ge=1, description="页码"),
     page_size: int = Query(10, ge=1, le=100, description="每页记录数"),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    total_mode: str = Query("exact", alias="total", pattern="^(exact|estimate|none)$", description="总数模式: exact 精确, estimate 估算, none 不统计"),
+    cursor: Optional[str] = Query(None, description="分页游标，传入（空字符串表示第一页）时按游标分页且不统计总数"),
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_principal)
 ):
     """获取用户列表"""
     try:
         # 查询用户列表
         query = db.query(User)
-        total = query.count()
-        users = query.offset((page - 1) * page_size).limit(page_size).all()
+        next_cursor = prev_cursor = None
+        if cursor is not None:
+            result = paginate_query(query, USER_SORT, page_size, cursor or None)
+            users, total = result.items, None
+            next_cursor, prev_cursor = result.next_cursor, result.prev_cursor
+        else:
+            users, total = paginate_with_total(query, page, page_size, total_mode)
         
         user_list = []
         for user in users:
@@ -38,28 +51,32 @@ async def list_users(
                 "updated_time": user.updated_time.isoformat() if user.updated_time is not None else None
             })
         
-        pages = (total + page_size - 1) // page_size
+        pages = (total + page_size - 1) // page_size if total is not None else None
         pagination_data = PaginationData(
             items=user_list,
             total=total,
             page=page,
             page_size=page_size,
-            pages=pages
+            pages=pages,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
         )
         
         return PaginatedResponse(
             success=True,
             data=pagination_data
         )
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{user_id}", response_model=BaseResponse)
-async def get_user(
+def get_user(
     user_id: str,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_principal)
 ):
     """获取用户详情"""
     try:
@@ -95,10 +112,10 @@ async def get_user(
 
 
 @router.post("", response_model=BaseResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+def create_user(
     user_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """创建用户"""
     try:
@@ -151,11 +168,11 @@ async def create_user(
 
 
 @router.put("/{user_id}", response_model=BaseResponse)
-async def update_user(
+def update_user(
     user_id: str,
     user_data: dict,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """更新用户"""
     try:
@@ -201,10 +218,10 @@ async def update_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(
+def delete_user(
     user_id: str,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
+    current_user = Depends(get_current_principal)
 ):
     """删除用户"""
     try:
@@ -0,0 +1,36 @@
+"""
+请求级 SQL 统计中间件
+为每个 HTTP 请求开启 SQL 统计，并在响应头中返回 Server-Timing（语句数、数据库总耗时、最慢语句耗时）
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infrastructure.database.query_stats import QueryInstrumentation
+
+
+class SQLTimingMiddleware:
+    """请求级 SQL 统计中间件（纯 ASGI 实现，统计上下文随请求传入线程池中的同步处理函数）"""
+
+    def __init__(self, app: ASGIApp, instrumentation: QueryInstrumentation, server_timing: bool = True):
+        self.app = app
+        self.instrumentation = instrumentation
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.instrumentation.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        token = self.instrumentation.begin()
+        stats = self.instrumentation.current()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.instrumentation.end(token, f"{scope['method']} {scope['path']}")
@@ -16,10 +16,12 @@ class BaseResponse(BaseModel, Generic[T]):
 class PaginationData(BaseModel, Generic[T]):
     """分页数据模型"""
     items: List[T]
-    total: int
+    total: Optional[int] = None  # 游标分页时不统计总数
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
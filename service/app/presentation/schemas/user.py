@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Literal
 from datetime import datetime
 
 
@@ -101,6 +101,7 @@ class UserListRequest(BaseModel):
     deptId: Optional[int] = None
     pageSize: Optional[int] = 10
     currentPage: Optional[int] = 1
+    total: Literal["exact", "estimate", "none"] = "exact"  # none 时不统计总数
 
 
 class UserListResponse(BaseResponse):
@@ -111,9 +112,11 @@ class UserListResponse(BaseResponse):
 class PageResponse(BaseModel):
     """分页响应"""
     list: List[Any]
-    total: int
+    total: Optional[int] = None  # 游标分页时不统计总数
     pageSize: int
     currentPage: int
+    nextCursor: Optional[str] = None
+    prevCursor: Optional[str] = None
 
 
 class TableResponse(BaseResponse):
@@ -214,6 +214,7 @@ CREATE TABLE `system_menu` (
   KEY `system_menu_dept_belong_id_ed403c1c_fk_system_deptinfo_id` (`dept_belong_id`),
   KEY `system_menu_modifier_id_49b4db71_fk_system_userinfo_id` (`modifier_id`),
   KEY `system_menu_parent_id_c715739f_fk_system_menu_id` (`parent_id`),
+  KEY `idx_menu_rank_id` (`rank`, `id`),
   CONSTRAINT `system_menu_ibfk_1` FOREIGN KEY (`creator_id`) REFERENCES `system_userinfo` (`id`),
   CONSTRAINT `system_menu_ibfk_2` FOREIGN KEY (`dept_belong_id`) REFERENCES `system_deptinfo` (`id`),
   CONSTRAINT `system_menu_ibfk_3` FOREIGN KEY (`meta_id`) REFERENCES `system_menumeta` (`id`),
@@ -426,6 +427,7 @@ CREATE TABLE `system_operationlog` (
   KEY `system_operationlog_creator_id_75ee7a2c_fk_system_userinfo_id` (`creator_id`),
   KEY `system_operationlog_dept_belong_id_54a2fdb4_fk_system_de` (`dept_belong_id`),
   KEY `system_operationlog_modifier_id_898ff5c3_fk_system_userinfo_id` (`modifier_id`),
+  KEY `idx_operationlog_created_time_id` (`created_time`, `id`),
   CONSTRAINT `system_operationlog_ibfk_1` FOREIGN KEY (`creator_id`) REFERENCES `system_userinfo` (`id`),
   CONSTRAINT `system_operationlog_ibfk_2` FOREIGN KEY (`dept_belong_id`) REFERENCES `system_deptinfo` (`id`),
   CONSTRAINT `system_operationlog_ibfk_3` FOREIGN KEY (`modifier_id`) REFERENCES `system_userinfo` (`id`)
@@ -523,6 +525,7 @@ CREATE TABLE `system_userinfo` (
   KEY `system_userinfo_modifier_id_439b401f_fk_system_userinfo_id` (`modifier_id`),
   KEY `system_userinfo_phone_87b78cba` (`phone`),
   KEY `system_userinfo_email_bf1d19b4` (`email`),
+  KEY `idx_userinfo_created_time_id` (`created_time`, `id`),
   CONSTRAINT `system_userinfo_ibfk_1` FOREIGN KEY (`creator_id`) REFERENCES `system_userinfo` (`id`),
   CONSTRAINT `system_userinfo_ibfk_2` FOREIGN KEY (`dept_belong_id`) REFERENCES `system_deptinfo` (`id`),
   CONSTRAINT `system_userinfo_ibfk_3` FOREIGN KEY (`dept_id`) REFERENCES `system_deptinfo` (`id`),
@@ -609,6 +612,7 @@ CREATE TABLE `system_userloginlog` (
   KEY `system_userloginlog_creator_id_fb430637_fk_system_userinfo_id` (`creator_id`),
   KEY `system_userloginlog_dept_belong_id_113d206c_fk_system_de` (`dept_belong_id`),
   KEY `system_userloginlog_modifier_id_d7c59c97_fk_system_userinfo_id` (`modifier_id`),
+  KEY `idx_userloginlog_created_time_id` (`created_time`, `id`),
   CONSTRAINT `system_userloginlog_ibfk_1` FOREIGN KEY (`creator_id`) REFERENCES `system_userinfo` (`id`),
   CONSTRAINT `system_userloginlog_ibfk_2` FOREIGN KEY (`dept_belong_id`) REFERENCES `system_deptinfo` (`id`),
   CONSTRAINT `system_userloginlog_ibfk_3` FOREIGN KEY (`modifier_id`) REFERENCES `system_userinfo` (`id`)
@@ -55,6 +55,8 @@ CREATE TABLE system_userinfo (
   FOREIGN KEY (dept_id) REFERENCES system_deptinfo (id),
   FOREIGN KEY (dept_belong_id) REFERENCES system_deptinfo (id)
 );
+CREATE INDEX idx_userinfo_username_lower ON system_userinfo (lower(username));
+CREATE INDEX idx_userinfo_email_lower ON system_userinfo (lower(email));
 
 -- 删除并创建角色表
 DROP TABLE IF EXISTS system_userrole;
@@ -209,6 +211,7 @@ CREATE TABLE system_userloginlog (
   FOREIGN KEY (dept_belong_id) REFERENCES system_deptinfo (id),
   FOREIGN KEY (modifier_id) REFERENCES system_userinfo (id)
 );
+CREATE INDEX idx_userloginlog_created_time_id ON system_userloginlog (created_time, id);
 
 -- 删除并创建操作日志表
 DROP TABLE IF EXISTS system_operationlog;
@@ -234,6 +237,7 @@ CREATE TABLE system_operationlog (
   FOREIGN KEY (dept_belong_id) REFERENCES system_deptinfo (id),
   FOREIGN KEY (modifier_id) REFERENCES system_userinfo (id)
 );
+CREATE INDEX idx_operationlog_created_time_id ON system_operationlog (created_time, id);
 
 -- 删除并创建系统配置表
 DROP TABLE IF EXISTS system_systemconfig;
@@ -1,59 +1,28 @@
--- 创建用户表索引
-CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
-CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_users_phone ON users(phone);
-CREATE INDEX IF NOT EXISTS idx_users_status ON users(status);
-CREATE INDEX IF NOT EXISTS idx_users_dept_id ON users(dept_id);
-CREATE INDEX IF NOT EXISTS idx_users_created_at ON users(created_at);
-
--- 创建角色表索引
-CREATE INDEX IF NOT EXISTS idx_roles_code ON roles(code);
-CREATE INDEX IF NOT EXISTS idx_roles_status ON roles(status);
-
--- 创建菜单表索引
-CREATE INDEX IF NOT EXISTS idx_menus_parent_id ON menus(parent_id);
-CREATE INDEX IF NOT EXISTS idx_menus_menu_type ON menus(menu_type);
-CREATE INDEX IF NOT EXISTS idx_menus_rank ON menus(rank);
-CREATE INDEX IF NOT EXISTS idx_menus_show_link ON menus(show_link);
-
--- 创建部门表索引
-CREATE INDEX IF NOT EXISTS idx_departments_parent_id ON departments(parent_id);
-CREATE INDEX IF NOT EXISTS idx_departments_code ON departments(code);
-CREATE INDEX IF NOT EXISTS idx_departments_status ON departments(status);
-
--- 创建用户角色关联表索引
-CREATE INDEX IF NOT EXISTS idx_user_roles_user_id ON user_roles(user_id);
-CREATE INDEX IF NOT EXISTS idx_user_roles_role_id ON user_roles(role_id);
-CREATE UNIQUE INDEX IF NOT EXISTS idx_user_roles_unique ON user_roles(user_id, role_id);
-
--- 创建角色菜单关联表索引
-CREATE INDEX IF NOT EXISTS idx_role_menus_role_id ON role_menus(role_id);
-CREATE INDEX IF NOT EXISTS idx_role_menus_menu_id ON role_menus(menu_id);
-CREATE UNIQUE INDEX IF NOT EXISTS idx_role_menus_unique ON role_menus(role_id, menu_id);
-
--- 创建登录日志表索引
-CREATE INDEX IF NOT EXISTS idx_login_logs_user_id ON login_logs(user_id);
-CREATE INDEX IF NOT EXISTS idx_login_logs_username ON login_logs(username);
-CREATE INDEX IF NOT EXISTS idx_login_logs_ip ON login_logs(ip);
-CREATE INDEX IF NOT EXISTS idx_login_logs_status ON login_logs(status);
-CREATE INDEX IF NOT EXISTS idx_login_logs_login_time ON login_logs(login_time);
-
--- 创建操作日志表索引
-CREATE INDEX IF NOT EXISTS idx_operation_logs_user_id ON operation_logs(user_id);
-CREATE INDEX IF NOT EXISTS idx_operation_logs_username ON operation_logs(username);
-CREATE INDEX IF NOT EXISTS idx_operation_logs_module ON operation_logs(module);
-CREATE INDEX IF NOT EXISTS idx_operation_logs_ip ON operation_logs(ip);
-CREATE INDEX IF NOT EXISTS idx_operation_logs_status ON operation_logs(status);
-CREATE INDEX IF NOT EXISTS idx_operation_logs_operate_time ON operation_logs(operate_time);
-
--- 创建系统日志表索引
-CREATE INDEX IF NOT EXISTS idx_system_logs_level ON system_logs(level);
-CREATE INDEX IF NOT EXISTS idx_system_logs_module ON system_logs(module);
-CREATE INDEX IF NOT EXISTS idx_system_logs_created_at ON system_logs(created_at);
-
--- 创建在线用户表索引
-CREATE INDEX IF NOT EXISTS idx_online_users_user_id ON online_users(user_id);
-CREATE INDEX IF NOT EXISTS idx_online_users_username ON online_users(username);
-CREATE INDEX IF NOT EXISTS idx_online_users_token ON online_users(token);
-CREATE INDEX IF NOT EXISTS idx_online_users_login_time ON online_users(login_time);
-CREATE INDEX IF NOT EXISTS idx_online_users_last_access_time ON online_users(last_access_time);
\ No newline at end of file
+-- SQLite 索引（与 01_create_tables_sqlite.sql 的表对应）
+-- 每个索引对应仓储/服务中的热点查询，修改后运行 scripts/database/check_query_plans.py 检查执行计划
+-- MySQL 的对应索引在 01_create_tables.sql 的建表语句中
+
+-- 用户表：按邮箱、电话、部门查找，按 (created_time, id) 游标分页
+-- username 已有 UNIQUE 约束，lower(username)/lower(email) 表达式索引在建表脚本中
+CREATE INDEX IF NOT EXISTS idx_userinfo_email ON system_userinfo (email);
+CREATE INDEX IF NOT EXISTS idx_userinfo_phone ON system_userinfo (phone);
+CREATE INDEX IF NOT EXISTS idx_userinfo_dept_id ON system_userinfo (dept_id);
+CREATE INDEX IF NOT EXISTS idx_userinfo_created_time_id ON system_userinfo (created_time, id);
+
+-- 用户角色关联表：按用户加载角色，按角色查找用户
+CREATE UNIQUE INDEX IF NOT EXISTS idx_userinfo_roles_userinfo_id_userrole_id ON system_userinfo_roles (userinfo_id, userrole_id);
+CREATE INDEX IF NOT EXISTS idx_userinfo_roles_userrole_id ON system_userinfo_roles (userrole_id);
+
+-- 角色菜单关联表：按角色加载菜单，删除菜单时查找引用
+CREATE UNIQUE INDEX IF NOT EXISTS idx_userrole_menu_userrole_id_menu_id ON system_userrole_menu (userrole_id, menu_id);
+CREATE INDEX IF NOT EXISTS idx_userrole_menu_menu_id ON system_userrole_menu (menu_id);
+
+-- 菜单表：按 (rank, id) 排序的菜单列表，查找子菜单
+CREATE INDEX IF NOT EXISTS idx_menu_rank_id ON system_menu (rank, id);
+CREATE INDEX IF NOT EXISTS idx_menu_parent_id ON system_menu (parent_id);
+
+-- 部门表：查找子部门（数据权限按部门树展开）
+CREATE INDEX IF NOT EXISTS idx_deptinfo_parent_id ON system_deptinfo (parent_id);
+
+-- 用户会话表：按用户停用会话
+CREATE INDEX IF NOT EXISTS idx_user_sessions_user_id ON user_sessions (user_id);
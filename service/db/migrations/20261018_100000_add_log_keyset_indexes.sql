@@ -0,0 +1,10 @@
+-- 迁移：为登录日志、操作日志添加游标分页使用的 (created_time, id) 复合索引
+-- 日期：2026-10-18
+
+-- 向上迁移
+CREATE INDEX idx_userloginlog_created_time_id ON system_userloginlog (created_time, id);
+CREATE INDEX idx_operationlog_created_time_id ON system_operationlog (created_time, id);
+
+-- 向下迁移（回滚时使用）
+-- DROP INDEX idx_userloginlog_created_time_id ON system_userloginlog;
+-- DROP INDEX idx_operationlog_created_time_id ON system_operationlog;
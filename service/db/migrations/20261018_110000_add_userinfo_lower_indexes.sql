@@ -0,0 +1,11 @@
+-- 迁移：为用户名、邮箱添加 lower() 表达式索引，供忽略大小写查找（iexact）使用
+-- 日期：2026-10-18
+-- 仅适用于 SQLite / PostgreSQL；MySQL 默认排序规则本身忽略大小写，直接使用已有索引
+
+-- 向上迁移
+CREATE INDEX idx_userinfo_username_lower ON system_userinfo (lower(username));
+CREATE INDEX idx_userinfo_email_lower ON system_userinfo (lower(email));
+
+-- 向下迁移（回滚时使用）
+-- DROP INDEX idx_userinfo_username_lower;
+-- DROP INDEX idx_userinfo_email_lower;
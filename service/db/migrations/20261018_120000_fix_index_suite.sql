@@ -0,0 +1,31 @@
+-- 迁移：按实际表名重建热点查询索引（原 03_create_indexes.sql 指向不存在的 users/roles/login_logs 等表，初始化时未创建任何索引）
+-- 日期：2026-10-18
+-- SQLite 执行全部语句；MySQL 建表语句已包含外键、唯一约束对应的索引，只需执行标注 [MySQL] 的两条（去掉 IF NOT EXISTS）
+
+-- 向上迁移
+CREATE INDEX IF NOT EXISTS idx_userinfo_email ON system_userinfo (email);
+CREATE INDEX IF NOT EXISTS idx_userinfo_phone ON system_userinfo (phone);
+CREATE INDEX IF NOT EXISTS idx_userinfo_dept_id ON system_userinfo (dept_id);
+CREATE INDEX IF NOT EXISTS idx_userinfo_created_time_id ON system_userinfo (created_time, id);  -- [MySQL]
+CREATE UNIQUE INDEX IF NOT EXISTS idx_userinfo_roles_userinfo_id_userrole_id ON system_userinfo_roles (userinfo_id, userrole_id);
+CREATE INDEX IF NOT EXISTS idx_userinfo_roles_userrole_id ON system_userinfo_roles (userrole_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_userrole_menu_userrole_id_menu_id ON system_userrole_menu (userrole_id, menu_id);
+CREATE INDEX IF NOT EXISTS idx_userrole_menu_menu_id ON system_userrole_menu (menu_id);
+CREATE INDEX IF NOT EXISTS idx_menu_rank_id ON system_menu (rank, id);  -- [MySQL]
+CREATE INDEX IF NOT EXISTS idx_menu_parent_id ON system_menu (parent_id);
+CREATE INDEX IF NOT EXISTS idx_deptinfo_parent_id ON system_deptinfo (parent_id);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_user_id ON user_sessions (user_id);
+
+-- 向下迁移（回滚时使用）
+-- DROP INDEX idx_userinfo_email;
+-- DROP INDEX idx_userinfo_phone;
+-- DROP INDEX idx_userinfo_dept_id;
+-- DROP INDEX idx_userinfo_created_time_id;
+-- DROP INDEX idx_userinfo_roles_userinfo_id_userrole_id;
+-- DROP INDEX idx_userinfo_roles_userrole_id;
+-- DROP INDEX idx_userrole_menu_userrole_id_menu_id;
+-- DROP INDEX idx_userrole_menu_menu_id;
+-- DROP INDEX idx_menu_rank_id;
+-- DROP INDEX idx_menu_parent_id;
+-- DROP INDEX idx_deptinfo_parent_id;
+-- DROP INDEX idx_user_sessions_user_id;
@@ -0,0 +1,11 @@
+-- 迁移：为角色关联加载补充索引（selectinload 按 role_id 加载字段权限、按 menu_id 加载数据权限时全表扫描）
+-- 日期：2026-10-18
+-- 仅 SQLite：两张表由模型 create_all 创建，已存在的表不会补建新索引；MySQL 建表语句已包含对应索引，无需执行
+
+-- 向上迁移
+CREATE INDEX IF NOT EXISTS idx_fieldpermission_role_id ON system_fieldpermission (role_id);
+CREATE INDEX IF NOT EXISTS idx_datapermission_menu_menu_id ON system_datapermission_menu (menu_id);
+
+-- 向下迁移（回滚时使用）
+-- DROP INDEX idx_fieldpermission_role_id;
+-- DROP INDEX idx_datapermission_menu_menu_id;
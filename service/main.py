@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from contextlib import asynccontextmanager
@@ -10,6 +11,19 @@ from loguru import logger
 from shared.kernel.config import get_settings
 from app.presentation.api import router as api_router
 from app.infrastructure.persistence.sqlalchemy.database import create_tables
+from app.infrastructure.database.engine_registry import engine_registry
+from app.infrastructure.database.loop_guard import event_loop_guard
+from app.infrastructure.database.query_stats import query_instrumentation
+from app.infrastructure.database.warmup import database_warmup
+from app.infrastructure.database.write_queue import sqlite_write_queue
+from app.infrastructure.auth.hash_pool import password_hash_pool
+from app.infrastructure.auth.bcrypt_calibration import configure_bcrypt_cost
+from app.infrastructure.auth.revocation import token_revocation_store
+from app.infrastructure.auth.permission_claims import permission_versions
+from app.infrastructure.audit.login_audit import login_audit_writer
+from app.infrastructure.session.last_access import last_access_buffer
+from app.infrastructure.session.registry import online_sessions
+from app.presentation.middleware.sql_timing import SQLTimingMiddleware
 import uvicorn
 
 settings = get_settings()
@@ -34,6 +48,51 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"数据库初始化失败: {e}")
 
+    # 加载令牌吊销记录
+    try:
+        token_revocation_store.purge()
+        token_revocation_store.load()
+        await token_revocation_store.start(settings.TOKEN_REVOCATION_SYNC_INTERVAL)
+    except Exception as e:
+        logger.error(f"令牌吊销记录加载失败: {e}")
+
+    # 加载权限版本（之后在事件循环中的增量读取都提交到线程池）
+    try:
+        permission_versions.sync()
+    except Exception as e:
+        logger.error(f"权限版本加载失败: {e}")
+
+    # 启动 SQLite 单写入者队列
+    if settings.SQLITE_WRITE_QUEUE_ENABLED:
+        try:
+            await sqlite_write_queue.start()
+        except Exception as e:
+            logger.error(f"单写入者队列启动失败: {e}")
+
+    # 启动登录审计后台写入
+    await login_audit_writer.start()
+    await last_access_buffer.start()
+
+    # 从快照恢复在线会话
+    try:
+        restored = await online_sessions.restore()
+        logger.info(f"已恢复 {restored} 个在线会话")
+    except Exception as e:
+        logger.error(f"在线会话恢复失败: {e}")
+    await online_sessions.start(settings.ONLINE_SESSION_SNAPSHOT_INTERVAL)
+
+    # 按本机性能校准 bcrypt 成本
+    try:
+        configure_bcrypt_cost()
+    except Exception as e:
+        logger.error(f"bcrypt 成本校准失败: {e}")
+
+    # 预热连接池、映射器与热点查询，完成后才开始接收请求
+    try:
+        await database_warmup.run()
+    except Exception as e:
+        logger.error(f"数据库预热失败: {e}")
+
     logger.info(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} started")
     logger.info(f"📍 Server running on http://{settings.HOST}:{settings.PORT}")
     logger.info(f"📚 API Documentation: http://{settings.HOST}:{settings.PORT}/docs")
@@ -41,6 +100,16 @@ async def lifespan(app: FastAPI):
     yield  # 应用运行期间
 
     # 关闭时清理资源
+    await login_audit_writer.stop()
+    await online_sessions.stop()
+    await last_access_buffer.stop()
+    await sqlite_write_queue.stop()
+    await token_revocation_store.stop()
+    password_hash_pool.shutdown()
+    token_revocation_store.close()
+    await permission_versions.drain()
+    permission_versions.close()
+    await engine_registry.dispose()
     logger.info("🛑 Application shutting down...")
 
 def create_app() -> FastAPI:
@@ -67,6 +136,13 @@ def create_app() -> FastAPI:
         allowed_hosts=["*"]  # 生产环境应该配置具体的域名
     )
 
+    # 添加请求级 SQL 统计中间件
+    app.add_middleware(
+        SQLTimingMiddleware,
+        instrumentation=query_instrumentation,
+        server_timing=settings.SQL_SERVER_TIMING
+    )
+
     # 注册 API 路由
     app.include_router(api_router)
 
@@ -84,6 +160,24 @@ def create_app() -> FastAPI:
         """健康检查"""
         return {"status": "healthy", "version": settings.APP_VERSION}
 
+    @app.get("/health/database", tags=["健康检查"])
+    async def database_pool_stats():
+        """数据库连接池状态、事件循环阻塞检测与 SQL 统计"""
+        return {
+            **engine_registry.stats(),
+            "event_loop_guard": event_loop_guard.stats(),
+            "sql": query_instrumentation.stats(),
+            "warmup": database_warmup.stats()
+        }
+
+    @app.get("/health/ready", tags=["健康检查"])
+    async def readiness_check():
+        """就绪检查（启动预热完成前返回 503）"""
+        warmup = database_warmup.stats()
+        if not warmup["ready"]:
+            return JSONResponse(status_code=503, content={"status": "warming_up", "warmup": warmup})
+        return {"status": "ready", "warmup": warmup}
+
     return app
 
 app = create_app()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+SQLite 调优方案基准测试
+对比 default 与 performance 两种方案在多线程并发写入、读取下的吞吐量和锁冲突次数
+
+用法: python scripts/database/benchmark_sqlite_profile.py --threads 8 --ops 500
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.database.sqlite_profile import PROFILES, connect_sqlite, read_pragmas
+
+
+def run_profile(profile: str, threads: int, ops: int, read_ratio: float) -> dict:
+    """在独立的临时数据库上运行一轮并发读写"""
+    workdir = tempfile.mkdtemp(prefix=f"sqlite_{profile}_")
+    path = str(Path(workdir) / "bench.db")
+    with connect_sqlite(path, profile=profile) as conn:
+        conn.execute("CREATE TABLE bench (id INTEGER PRIMARY KEY, username TEXT, payload TEXT)")
+        pragmas = read_pragmas(conn)
+
+    counters = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    reads_per_thread = int(ops * read_ratio)
+
+    def worker(index: int):
+        conn = connect_sqlite(path, profile=profile)
+        writes = reads = locked = 0
+        try:
+            for i in range(ops):
+                try:
+                    if i < reads_per_thread and i % 2 == 0:
+                        conn.execute("SELECT COUNT(*) FROM bench WHERE username = ?", (f"user{index}",)).fetchone()
+                        reads += 1
+                    else:
+                        conn.execute(
+                            "INSERT INTO bench (username, payload) VALUES (?, ?)", (f"user{index}", "x" * 200)
+                        )
+                        conn.commit()
+                        writes += 1
+                except sqlite3.OperationalError:
+                    conn.rollback()
+                    locked += 1
+        finally:
+            conn.close()
+        with lock:
+            counters["writes"] += writes
+            counters["reads"] += reads
+            counters["locked"] += locked
+
+    started_at = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    completed = counters["writes"] + counters["reads"]
+    return {
+        "profile": profile,
+        "journal_mode": pragmas["journal_mode"],
+        "synchronous": pragmas["synchronous"],
+        "elapsed_s": elapsed,
+        "ops_per_s": completed / elapsed if elapsed else 0.0,
+        **counters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 调优方案基准测试")
+    parser.add_argument("--threads", type=int, default=8, help="并发线程数")
+    parser.add_argument("--ops", type=int, default=500, help="每个线程的操作数")
+    parser.add_argument("--read-ratio", type=float, default=0.5, help="读操作占比")
+    args = parser.parse_args()
+
+    print(f"线程数: {args.threads}  每线程操作数: {args.ops}  读操作占比: {args.read_ratio}")
+    print(f"{'方案':<12}{'日志模式':<10}{'耗时(s)':>10}{'ops/s':>12}{'写入':>8}{'读取':>8}{'锁冲突':>8}")
+    for profile in PROFILES[::-1]:
+        result = run_profile(profile, args.threads, args.ops, args.read_ratio)
+        print(
+            f"{result['profile']:<12}{result['journal_mode']:<10}{result['elapsed_s']:>10.2f}"
+            f"{result['ops_per_s']:>12.0f}{result['writes']:>8}{result['reads']:>8}{result['locked']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+热点查询执行计划检查
+按 db/init 的建表与索引脚本创建临时 SQLite 数据库（或使用 --db 指定的数据库），
+对每个热点查询执行 EXPLAIN QUERY PLAN，存在全表扫描或临时排序时以退出码 1 结束。
+关联加载查询在回滚的事务中执行捕获，--db 指定的数据库不会被修改。
+
+用法: python scripts/database/check_query_plans.py [--db db/vue_pure_admin.db] [--verbose]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.infrastructure.database.query_plans import check_query_plans, explain, hot_queries
+
+INIT_SCRIPTS = ("01_create_tables_sqlite.sql", "03_create_indexes.sql")
+
+
+def build_schema_database() -> sqlite3.Connection:
+    """在临时目录中按初始化脚本建表、建索引"""
+    path = Path(tempfile.mkdtemp(prefix="query_plans_")) / "schema.db"
+    conn = sqlite3.connect(str(path))
+    for script in INIT_SCRIPTS:
+        conn.executescript((project_root / "db" / "init" / script).read_text(encoding="utf-8"))
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="热点查询执行计划检查")
+    parser.add_argument("--db", help="要检查的 SQLite 数据库文件，默认按初始化脚本新建")
+    parser.add_argument("--verbose", action="store_true", help="输出每个查询的执行计划")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db) if args.db else build_schema_database()
+    try:
+        with hot_queries(conn) as queries:
+            if args.verbose:
+                for query in queries:
+                    print(f"{query.name:<28}{' | '.join(explain(conn, query.sql, query.params))}")
+            failures = check_query_plans(conn, queries)
+    finally:
+        conn.close()
+
+    if not failures:
+        print(f"{len(queries)} 个热点查询均使用索引")
+        return 0
+    for query, plan in failures:
+        print(f"未使用索引: {query.name}（{query.source}）")
+        for step in plan:
+            print(f"    {step}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -17,11 +17,90 @@ class Settings(BaseSettings):
     # 数据库配置
     DATABASE_URL: str = "sqlite:///./db/vue_pure_admin.db"
     DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: int = 30  # 获取连接的等待上限（秒）
+    DATABASE_POOL_RECYCLE: int = 1800  # 连接最长复用时间（秒）
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_ISOLATION_LEVEL: Optional[str] = None  # 为空时使用驱动默认隔离级别
+    DATABASE_REPLICA_URL: Optional[str] = None  # 只读副本，SQLite 可用 sqlite:///file:./db/x.db?mode=ro&uri=true
+    DATABASE_REPLICA_MAX_LAG: float = 1.0  # 主库提交后该时间内（秒）的只读请求仍走主库
+    DATABASE_BULK_CHUNK_SIZE: int = 1000  # 批量写入每个事务的行数
+    DATABASE_STREAM_BATCH_SIZE: int = 1000  # 流式读取每次取回的行数
+    DATABASE_FILTER_UNINDEXED: str = "warn"  # 无索引可用的过滤/排序条件: allow 放行, warn 记录, reject 拒绝
+    DATABASE_LOOP_GUARD: str = "warn"  # 事件循环中执行同步查询时: off 不检测, warn 记录, raise 抛出异常
+
+    # SQL 统计配置
+    SQL_INSTRUMENTATION_ENABLED: bool = True  # 统计每个请求的语句数与数据库耗时
+    SQL_SERVER_TIMING: bool = True  # 在响应头中返回 Server-Timing
+    SQL_REPEAT_WARN_THRESHOLD: int = 10  # 同一语句形状在一次请求中执行超过该次数时告警
+
+    # 启动预热配置
+    WARMUP_ENABLED: bool = True  # 启动时预开连接、配置映射器并执行一次热点查询，完成后才接收请求
+    WARMUP_CONNECTIONS: int = 5  # 预先打开的连接数，不超过连接池大小
+    WARMUP_TIMEOUT: float = 30.0  # 预热总耗时上限（秒），超时后跳过剩余步骤
+    
+    # SQLite 调优配置
+    SQLITE_PROFILE: str = "performance"  # performance 或 default
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256MB
+    SQLITE_CACHE_SIZE: int = -65536  # 负数表示 KB，即 64MB
+    SQLITE_WRITE_QUEUE_ENABLED: bool = True  # 写操作经单写入者队列组提交
+    SQLITE_WRITE_BATCH_SIZE: int = 100  # 每次组提交的最大工作单元数
+    SQLITE_WRITE_MAX_QUEUE: int = 10000
     
     # JWT配置
     JWT_SECRET_KEY: str = "your-super-secret-jwt-key-here"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_MINUTES: int = 30
+    JWT_TOKEN_CACHE_SIZE: int = 4096  # 已验证令牌缓存容量，0 表示禁用
+    JWT_EMBED_PERMISSIONS: bool = False  # 在访问令牌中嵌入角色、权限摘要和权限版本
+    PERMISSION_VERSION_BACKEND: str = "sqlite:///./db/permission_versions.db"  # 各工作进程共用；memory 表示仅本进程
+    PERMISSION_VERSION_TTL: float = 1.0  # 从存储读取权限版本变更的间隔（秒）
+    
+    # 登录准入控制配置
+    LOGIN_RATE_WINDOW_SECONDS: int = 60
+    LOGIN_MAX_ATTEMPTS_PER_USERNAME: int = 10
+    LOGIN_MAX_ATTEMPTS_PER_IP: int = 50
+    LOGIN_MAX_CONCURRENT_HASHES: int = 8
+    LOGIN_TARGET_LATENCY_MS: int = 500  # 认证耗时超过该值时收紧并发上限
+    
+    # 登录审计后台写入配置
+    LOGIN_AUDIT_BATCH_SIZE: int = 200
+    LOGIN_AUDIT_FLUSH_INTERVAL: float = 0.5  # 秒
+    LOGIN_AUDIT_MAX_QUEUE: int = 10000  # 队列上限，超出后丢弃新记录
+    
+    # 在线会话配置
+    ONLINE_ACCESS_FLUSH_INTERVAL: int = 30  # 最后访问时间批量写回间隔（秒）
+    ONLINE_SESSION_SHARDS: int = 16
+    ONLINE_SESSION_IDLE_TIMEOUT: int = 1800  # 空闲超时（秒）
+    ONLINE_SESSION_WHEEL_TICK: int = 5  # 时间轮刻度（秒）
+    ONLINE_SESSION_SNAPSHOT_INTERVAL: int = 60  # 快照写库间隔（秒）
+    
+    # 令牌吊销配置
+    TOKEN_REVOCATION_BACKEND: str = "sqlite:///./db/revoked_tokens.db"  # memory 表示不持久化
+    TOKEN_REVOCATION_CAPACITY: int = 100000
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 1.0  # 从后端同步其他进程吊销记录的间隔（秒），0 表示不同步
+    
+    # 认证主体缓存配置
+    PRINCIPAL_CACHE_TTL: int = 60  # 用户快照缓存秒数，0 表示禁用
+    PRINCIPAL_CACHE_SIZE: int = 10000
+
+    # 分页总数缓存配置
+    COUNT_CACHE_TTL: int = 30  # 总数缓存秒数，0 表示禁用；写入对应表时立即失效
+    COUNT_CACHE_SIZE: int = 1024
+    
+    # 密码哈希工作池配置
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64  # 排队上限，超出后直接拒绝
+    PASSWORD_HASH_POOL_MODE: str = "thread"  # thread 或 process
+    
+    # bcrypt 成本配置
+    PASSWORD_HASH_TARGET_MS: int = 250  # 启动时按目标校验耗时校准成本，0 表示不校准
+    PASSWORD_BCRYPT_ROUNDS: int = 0  # 固定成本，非 0 时跳过校准
+    PASSWORD_BCRYPT_MIN_ROUNDS: int = 10
+    PASSWORD_BCRYPT_MAX_ROUNDS: int = 15
+    PASSWORD_BCRYPT_ROUNDS_TOLERANCE: int = 1  # 已存哈希成本与目标相差超过该值时登录后重新哈希；按主机校准时至少为 1，设为 0 需固定 PASSWORD_BCRYPT_ROUNDS
     
     # CORS配置
     ALLOWED_ORIGINS: List[str] = ["*"]
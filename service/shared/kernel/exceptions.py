@@ -30,4 +30,15 @@ class UnauthorizedError(BaseException):
 class ForbiddenError(BaseException):
     """禁止访问异常"""
     def __init__(self, message: str = "禁止访问"):
-        super().__init__(message, "FORBIDDEN")
\ No newline at end of file
+        super().__init__(message, "FORBIDDEN")
+
+class TooManyRequestsError(BaseException):
+    """请求过多异常"""
+    def __init__(self, message: str = "请求过于频繁，请稍后再试", retry_after: int = 1):
+        self.retry_after = retry_after
+        super().__init__(message, "TOO_MANY_REQUESTS")
+
+class ReadOnlyError(BaseException):
+    """只读会话写入异常"""
+    def __init__(self, message: str = "只读会话不允许写入"):
+        super().__init__(message, "READ_ONLY")
@@ -0,0 +1,96 @@
+"""
+批量写入测试
+"""
+import asyncio
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.domain.models.role import Role
+from app.infrastructure.database.bulk import chunked, group_by_keys
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.role import UserRole
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from app.infrastructure.persistence.sqlalchemy.repositories.base_repo_impl import SQLAlchemyBaseRepository
+from app.infrastructure.persistence.sqlalchemy.repositories.role_repo_impl import SQLAlchemyRoleRepository
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+
+
+async def setup_database():
+    """创建内存数据库，并记录提交次数"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(1))
+    return engine, commits
+
+
+class TestBulkHelpers:
+    """批量写入辅助函数测试类"""
+
+    def test_chunked_and_group(self):
+        """测试分块与按字段集合分组"""
+        assert [len(chunk) for chunk in chunked(range(7), 3)] == [3, 3, 1]
+        groups = group_by_keys([{"a": 1}, {"a": 2, "b": 1}, {"a": 3}])
+        assert groups == [[{"a": 1}, {"a": 3}], [{"a": 2, "b": 1}]]
+
+
+class TestBulkRepository:
+    """仓储批量写入测试类"""
+
+    def test_user_bulk_operations(self):
+        """测试用户批量创建、更新、插入或更新与删除，每块一个事务"""
+        async def run():
+            engine, commits = await setup_database()
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyUserRepository(session)
+                created = await repo.bulk_create(
+                    [{"id": i, "username": f"user{i}", "password": "x"} for i in range(1, 26)],
+                    chunk_size=10
+                )
+                create_commits = len(commits)
+
+                updated = await repo.bulk_update(
+                    [{"id": i, "nickname": f"n{i}"} for i in (1, 2, 3, 99)], chunk_size=10
+                )
+                upserted = await repo.bulk_upsert(
+                    [{"id": i, "username": f"user{i}", "password": "y"} for i in (24, 25, 26, 27)]
+                )
+                deleted = await repo.bulk_delete([1, 2, 100])
+
+                rows = (await session.execute(select(UserInfo.id, UserInfo.nickname, UserInfo.password))).all()
+            await engine.dispose()
+            return created, create_commits, updated, upserted, deleted, rows
+
+        created, create_commits, updated, upserted, deleted, rows = asyncio.run(run())
+        by_id = {row.id: row for row in rows}
+        assert created == 25 and create_commits == 3
+        assert updated == 3 and by_id[3].nickname == "n3"
+        assert upserted == 4 and by_id[25].password == "y" and by_id[27].password == "y"
+        assert deleted == 2 and 1 not in by_id
+        assert len(rows) == 25
+
+    def test_role_and_base_repository(self):
+        """测试角色仓储接受领域模型，通用仓储接受模型实例"""
+        async def run():
+            engine, _ = await setup_database()
+            async with AsyncSession(engine) as session:
+                roles = SQLAlchemyRoleRepository(session)
+                await roles.bulk_create([
+                    Role(id=f"r{i}", name=f"role{i}", code=f"code{i}", description="", is_active=True)
+                    for i in range(5)
+                ])
+                base = SQLAlchemyBaseRepository(session, UserRole)
+                await base.bulk_create([UserRole(id="r9", name="role9", code="code9")])
+                updated = await base.bulk_update([{"id": "r0", "is_active": False}])
+                count = (await session.execute(select(func.count()).select_from(UserRole))).scalar_one()
+                inactive = (await session.execute(select(UserRole.id).where(UserRole.is_active.is_(False)))).scalars().all()
+            await engine.dispose()
+            return updated, count, inactive
+
+        updated, count, inactive = asyncio.run(run())
+        assert updated == 1
+        assert count == 6
+        assert inactive == ["r0"]
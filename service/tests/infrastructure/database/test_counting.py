@@ -0,0 +1,140 @@
+"""
+分页总数测试
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.cache.count_cache import CountCache, count_cache
+from app.infrastructure.database.counting import estimate_total, paginate_with_total
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserLoginLog
+from shared.kernel.exceptions import ValidationException
+
+
+def make_engine(count: int = 25):
+    """创建带登录日志的内存库，并记录执行过的语句"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    count_cache.install(engine)
+    now = datetime(2026, 1, 1)
+    with Session(engine) as session:
+        session.add_all(
+            UserLoginLog(id=i, status=i % 2 == 0, login_type=0, created_time=now, updated_time=now)
+            for i in range(1, count + 1)
+        )
+        session.commit()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return engine, statements
+
+
+class TestCountCache:
+    """总数缓存测试类"""
+
+    def test_expire_and_evict(self):
+        """测试过期与容量淘汰"""
+        cache = CountCache(ttl=30, maxsize=2)
+        cache.set("a", "", 1)
+        cache.set("b", "", 2)
+        cache.set("c", "", 3)
+        assert cache.get("a") is None
+        assert cache.get("c") == 3
+
+        disabled = CountCache(ttl=0)
+        disabled.set("a", "", 1)
+        assert disabled.get("a") is None
+
+    def test_stale_generation_not_stored(self):
+        """测试计数期间表已失效时结果不写入缓存"""
+        cache = CountCache(ttl=30)
+        generation = cache.generation("a")
+        cache.invalidate("a")
+        cache.set("a", "", 1, generation)
+        assert cache.get("a") is None
+        cache.set("a", "", 2, cache.generation("a"))
+        assert cache.get("a") == 2
+
+
+class TestPaginateWithTotal:
+    """分页总数测试类"""
+
+    def setup_method(self):
+        count_cache.clear()
+
+    def test_single_statement_then_cached(self):
+        """测试首次用窗口函数一条语句取回当前页与总数，再次请求只查当前页"""
+        engine, statements = make_engine()
+        with Session(engine) as session:
+            query = session.query(UserLoginLog).order_by(UserLoginLog.id)
+            items, total = paginate_with_total(query, 2, 10)
+            assert [log.id for log in items] == list(range(11, 21))
+            assert total == 25
+            assert len(statements) == 1 and "OVER" in statements[0]
+
+            statements.clear()
+            items, total = paginate_with_total(query, 3, 10)
+            assert total == 25 and len(items) == 5
+            assert len(statements) == 1 and "OVER" not in statements[0]
+
+    def test_write_invalidates(self):
+        """测试写入对应表后总数缓存失效"""
+        engine, _ = make_engine()
+        with Session(engine) as session:
+            query = session.query(UserLoginLog).filter(UserLoginLog.status.is_(True))
+            assert paginate_with_total(query, 1, 10)[1] == 12
+
+            session.query(UserLoginLog).filter(UserLoginLog.id == 2).delete()
+            session.commit()
+            assert paginate_with_total(query, 1, 10)[1] == 11
+
+    def test_concurrent_reader_before_commit(self, tmp_path):
+        """测试写事务提交前其他连接读出并缓存的旧总数在提交后失效"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'count.db'}")
+        Base.metadata.create_all(engine)
+        count_cache.install(engine)
+        now = datetime(2026, 1, 1)
+        with Session(engine) as session:
+            session.add_all(
+                UserLoginLog(id=i, status=True, login_type=0, created_time=now, updated_time=now)
+                for i in range(1, 6)
+            )
+            session.commit()
+
+        with Session(engine) as writer, Session(engine) as reader:
+            query = reader.query(UserLoginLog)
+            writer.query(UserLoginLog).filter(UserLoginLog.id == 1).delete()
+            # 写入未提交，读到并缓存旧总数
+            assert paginate_with_total(query, 1, 10)[1] == 5
+            reader.rollback()
+            writer.commit()
+            assert paginate_with_total(query, 1, 10)[1] == 4
+        engine.dispose()
+
+    def test_page_out_of_range(self):
+        """测试页码超出范围时仍返回正确总数"""
+        engine, _ = make_engine()
+        with Session(engine) as session:
+            items, total = paginate_with_total(session.query(UserLoginLog), 9, 10)
+        assert items == [] and total == 25
+
+    def test_estimate_and_none(self):
+        """测试估算与不统计模式"""
+        engine, statements = make_engine()
+        with Session(engine) as session:
+            assert estimate_total(session, UserLoginLog) == 25
+            assert paginate_with_total(session.query(UserLoginLog), 1, 10, "estimate")[1] == 25
+
+            statements.clear()
+            items, total = paginate_with_total(session.query(UserLoginLog), 1, 10, "none")
+            assert total is None and len(items) == 10
+            assert len(statements) == 1
+
+            filtered = session.query(UserLoginLog).filter(UserLoginLog.id > 20)
+            assert paginate_with_total(filtered, 1, 10, "estimate")[1] == 5
+
+            with pytest.raises(ValidationException):
+                paginate_with_total(session.query(UserLoginLog), 1, 10, "fast")
@@ -0,0 +1,67 @@
+"""
+数据库引擎注册表测试
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import exc as sa_exc, text
+
+from app.infrastructure.database.engine_registry import EngineRegistry, to_async_url
+
+
+class TestEngineRegistry:
+    """引擎注册表测试类"""
+
+    def test_engines_are_shared(self, tmp_path):
+        """测试同名引擎只创建一次"""
+        registry = EngineRegistry(f"sqlite:///{tmp_path}/app.db")
+        assert registry.get_sync_engine() is registry.get_sync_engine()
+        assert registry.get_async_engine() is registry.get_async_engine()
+        asyncio.run(registry.dispose())
+
+    def test_pool_options_from_settings(self, tmp_path):
+        """测试连接池参数来自配置"""
+        registry = EngineRegistry(f"sqlite:///{tmp_path}/app.db", pool_size=3, max_overflow=1)
+        pool = registry.get_sync_engine().pool
+        assert pool.size() == 3
+        assert registry.engine_options("sqlite://")["pool_pre_ping"] is True
+        assert "pool_size" not in registry.engine_options("sqlite://")
+
+    def test_async_url(self):
+        """测试异步驱动地址转换"""
+        assert to_async_url("sqlite:///./db/app.db") == "sqlite+aiosqlite:///./db/app.db"
+        assert to_async_url("mysql+pymysql://u:p@h/db") == "mysql+aiomysql://u:p@h/db"
+
+    def test_pool_stats_and_timeouts(self, tmp_path):
+        """测试连接池统计检出数量与超时"""
+        registry = EngineRegistry(
+            f"sqlite:///{tmp_path}/app.db", pool_size=1, max_overflow=0, pool_timeout=0.05
+        )
+        engine = registry.get_sync_engine()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert registry.stats()["default:sync"]["checkedout"] == 1
+            with pytest.raises(sa_exc.TimeoutError):
+                engine.connect()
+
+        stats = registry.stats()["default:sync"]
+        assert stats["checkedout"] == 0
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["max_wait_ms"] >= 50 * 0.9
+        engine.dispose()
+
+    def test_async_engine_uses_queue_pool(self, tmp_path):
+        """测试异步引擎使用带统计的连接池"""
+        registry = EngineRegistry(f"sqlite:///{tmp_path}/app.db", pool_size=2)
+
+        async def run():
+            async with registry.get_async_engine().connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            stats = registry.stats()["default:async"]
+            await registry.dispose()
+            return stats
+
+        stats = asyncio.run(run())
+        assert stats["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+        assert stats["checkouts"] == 1
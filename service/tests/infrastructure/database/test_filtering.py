@@ -0,0 +1,137 @@
+"""
+仓储过滤引擎测试
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.database import filtering
+from app.infrastructure.database.filtering import FilterEngine, index_catalog
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.role import UserRole
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from app.infrastructure.persistence.sqlalchemy.repositories.base_repo_impl import SQLAlchemyBaseRepository
+from app.infrastructure.persistence.sqlalchemy.repositories.role_repo_impl import SQLAlchemyRoleRepository
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+from shared.kernel.exceptions import ValidationException
+
+
+def compile_sql(statement, dialect) -> str:
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+async def setup_database():
+    """创建内存数据库并插入用户与角色"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo), [
+            {"id": i, "username": name, "email": f"{name.lower()}@example.com", "password": "x"}
+            for i, name in enumerate(["Alice", "alan", "Bob", "albert", "carol"], start=1)
+        ])
+        await conn.execute(insert(UserRole), [
+            {"id": f"r{i}", "name": f"角色{i}", "code": code, "is_active": True}
+            for i, code in enumerate(["admin", "auditor", "guest"], start=1)
+        ])
+    return engine
+
+
+class TestFilterEngine:
+    """过滤条件转换测试类"""
+
+    def test_index_catalog(self):
+        """测试识别普通索引首列与 lower() 表达式索引"""
+        catalog = index_catalog(UserInfo.__table__, "sqlite")
+        assert {"id", "username", "email", "phone"} <= catalog.leading
+        assert "nickname" not in catalog.leading
+        assert catalog.lowered == {"username", "email"}
+        assert index_catalog(UserInfo.__table__, "mysql").lowered == frozenset()
+
+    def test_startswith_uses_range(self):
+        """测试前缀匹配转换为范围条件"""
+        statement = FilterEngine(UserInfo, "sqlite", "reject").statement({"username__startswith": "al"})
+        sql = compile_sql(statement, sqlite.dialect())
+        assert "system_userinfo.username >= 'al'" in sql
+        assert "system_userinfo.username < 'am'" in sql
+        assert "LIKE" not in sql
+
+    def test_iexact_by_dialect(self):
+        """测试忽略大小写等于在 MySQL 上直接比较，在 SQLite 上使用 lower()"""
+        conditions = {"username__iexact": "Alice"}
+        sql = compile_sql(FilterEngine(UserInfo, "mysql", "reject").statement(conditions), mysql.dialect())
+        assert "system_userinfo.username = 'Alice'" in sql
+        sql = compile_sql(FilterEngine(UserInfo, "sqlite", "reject").statement(conditions), sqlite.dialect())
+        assert "lower(system_userinfo.username) = 'alice'" in sql
+        with pytest.raises(ValidationException):
+            FilterEngine(UserInfo, "sqlite", "reject").statement({"nickname__iexact": "x"})
+
+    def test_unindexed_conditions(self):
+        """测试无索引可用的条件与排序按模式拒绝或只记录一次"""
+        engine = FilterEngine(UserInfo, "sqlite", "reject")
+        with pytest.raises(ValidationException):
+            engine.statement({"username__like": "al"})
+        with pytest.raises(ValidationException):
+            engine.statement({}, order_by=["nickname"])
+        engine.statement({"username": "alan"}, order_by=["-id"])
+
+        warnings = []
+        original = filtering.logger.warning
+        filtering.logger.warning = warnings.append
+        try:
+            filtering._warned.discard(("system_userinfo", "nickname__ne"))
+            warn = FilterEngine(UserInfo, "sqlite", "warn")
+            warn.statement({"nickname__ne": "x"})
+            warn.statement({"nickname__ne": "y"})
+            FilterEngine(UserInfo, "sqlite", "allow").statement({"gender": 1})
+        finally:
+            filtering.logger.warning = original
+        assert len(warnings) == 1 and "nickname__ne" in warnings[0]
+
+    def test_unknown_field_and_operator(self):
+        """测试不存在的字段与操作符抛出校验异常"""
+        engine = FilterEngine(UserInfo, "sqlite", "allow")
+        with pytest.raises(ValidationException):
+            engine.statement({"missing": 1})
+        with pytest.raises(ValidationException):
+            engine.statement({"username__regex": "a.*"})
+        with pytest.raises(ValidationException):
+            engine.statement({}, order_by=["missing"])
+
+
+class TestFilterRepositories:
+    """仓储过滤测试类"""
+
+    def test_filter_queries(self):
+        """测试各仓储的前缀、忽略大小写、排序与分页"""
+        async def run():
+            engine = await setup_database()
+            async with AsyncSession(engine) as session:
+                base = SQLAlchemyBaseRepository(session, UserInfo)
+                prefixed = await base.filter_by(username__startswith="al", order_by=["username"])
+                paged = await base.filter_by(order_by=["-id"], limit=2, offset=1)
+
+                users = SQLAlchemyUserRepository(session)
+                matched = await users.filter_by(username__iexact="ALICE")
+                streamed = [user.username async for user in users.iter_filter(order_by=["-id"], id__in=[1, 3])]
+
+                roles = SQLAlchemyRoleRepository(session)
+                role_codes = [role.code for role in await roles.filter_by(code__startswith="a", order_by=["code"])]
+
+                plan = await session.execute(text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM system_userinfo WHERE lower(username) = 'alice'"
+                ))
+                plan_detail = " ".join(row[-1] for row in plan)
+            await engine.dispose()
+            return prefixed, paged, matched, streamed, role_codes, plan_detail
+
+        prefixed, paged, matched, streamed, role_codes, plan_detail = asyncio.run(run())
+        assert [user.username for user in prefixed] == ["alan", "albert"]
+        assert [user.id for user in paged] == [4, 3]
+        assert [user.username for user in matched] == ["Alice"]
+        assert streamed == ["Bob", "Alice"]
+        assert role_codes == ["admin", "auditor"]
+        assert "idx_userinfo_username_lower" in plan_detail
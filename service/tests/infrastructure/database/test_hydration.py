@@ -0,0 +1,116 @@
+"""
+领域模型装配测试
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.menu import MenuModel
+from app.infrastructure.persistence.sqlalchemy.models.role import (
+    DataPermission,
+    FieldPermission,
+    UserRole,
+    datapermission_menu_association,
+    role_menu_association,
+)
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo, user_role_association
+from app.infrastructure.persistence.sqlalchemy.repositories.role_repo_impl import SQLAlchemyRoleRepository
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+from shared.kernel.exceptions import ValidationException
+
+
+async def setup_database():
+    """创建内存数据库：每个用户都有 admin、editor 两个角色，记录执行的语句数"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": "x"}
+            for i in range(1, 11)
+        ])
+        await conn.execute(insert(UserRole), [
+            {"id": "r1", "name": "admin", "code": "admin"},
+            {"id": "r2", "name": "editor", "code": "editor"},
+        ])
+        await conn.execute(insert(MenuModel), [
+            {"id": "m1", "name": "用户管理", "path": "/system/user", "menu_type": 1, "rank": 1, "meta": {}, "is_active": True},
+            {"id": "m2", "name": "角色管理", "path": "/system/role", "menu_type": 1, "rank": 2, "meta": {}, "is_active": True},
+            {"id": "m3", "name": "停用菜单", "path": "/system/old", "menu_type": 1, "rank": 3, "meta": {}, "is_active": False},
+        ])
+        await conn.execute(insert(role_menu_association), [
+            {"id": i, "userrole_id": role_id, "menu_id": menu_id}
+            for i, (role_id, menu_id) in enumerate([("r1", "m1"), ("r1", "m2"), ("r1", "m3"), ("r2", "m2")], start=1)
+        ])
+        await conn.execute(insert(user_role_association), [
+            {"id": i * 2 + offset, "userinfo_id": i, "userrole_id": role_id}
+            for i in range(1, 11) for offset, role_id in enumerate(("r1", "r2"))
+        ])
+        await conn.execute(insert(DataPermission), [
+            {"id": "d1", "mode_type": 0, "name": "本部门", "rules": [{"field": "dept_id"}]},
+        ])
+        await conn.execute(insert(datapermission_menu_association), [{"id": 1, "datapermission_id": "d1", "menu_id": "m1"}])
+        await conn.execute(insert(FieldPermission), [{"id": "f1", "menu_id": "m2", "role_id": "r2"}])
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return engine, statements
+
+
+class TestHydration:
+    """领域模型装配测试类"""
+
+    def test_user_summary_and_full(self):
+        """测试一页用户的查询数与实体数量无关，summary 不加载菜单"""
+        async def run():
+            engine, statements = await setup_database()
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyUserRepository(session)
+                summary = await repo.get_all(limit=10)
+                summary_count = len(statements)
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyUserRepository(session)
+                statements.clear()
+                full = await repo.filter_by(order_by=["id"], hydration="full")
+                full_count = len(statements)
+            await engine.dispose()
+            return summary, summary_count, full, full_count
+
+        summary, summary_count, full, full_count = asyncio.run(run())
+        assert len(summary) == 10 and summary_count == 2
+        assert sorted(summary[0].get_role_names()) == ["admin", "editor"]
+        assert all(role.menus == [] for role in summary[0].roles)
+
+        # 用户、角色、菜单、菜单数据权限、字段权限、字段权限菜单各一条
+        assert len(full) == 10 and full_count == 6
+        user = full[0]
+        assert user.is_admin()
+        assert user.has_permission("/system/user") and user.has_permission("/system/role")
+        assert not user.has_permission("/system/old")
+        roles = {role.name: role for role in user.roles}
+        assert [rule.name for rule in roles["admin"].data_permissions] == ["本部门"]
+        assert [field.model_name for field in roles["editor"].field_permissions] == ["角色管理"]
+
+    def test_role_hydration(self):
+        """测试角色 summary 不加载关联，full 加载菜单与权限"""
+        async def run():
+            engine, statements = await setup_database()
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyRoleRepository(session)
+                summary = await repo.get_by_id("r1")
+                summary_count = len(statements)
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyRoleRepository(session)
+                full = await repo.get_by_id("r1", hydration="full")
+                with pytest.raises(ValidationException):
+                    await repo.get_by_id("r1", hydration="deep")
+            await engine.dispose()
+            return summary, summary_count, full
+
+        summary, summary_count, full = asyncio.run(run())
+        assert summary.menus == [] and summary_count == 1
+        assert sorted(full.get_menu_ids()) == ["m1", "m2"]
+        assert full.has_permission("/system/user")
@@ -0,0 +1,91 @@
+"""
+游标分页测试
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.database.keyset import SortKey, encode_cursor, paginate_async, paginate_query
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserLoginLog
+from shared.kernel.exceptions import ValidationException
+
+SORT = SortKey([UserLoginLog.created_time, UserLoginLog.id])
+
+
+def make_logs(count: int = 25):
+    """生成登录日志，每 3 条共用同一时间以检验并列排序"""
+    base = datetime(2026, 1, 1)
+    return [
+        UserLoginLog(
+            id=i, status=True, login_type=0,
+            created_time=base + timedelta(minutes=i // 3), updated_time=base
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def expected_order(logs):
+    return [log.id for log in sorted(logs, key=lambda log: (log.created_time, log.id), reverse=True)]
+
+
+class TestKeysetPagination:
+    """游标分页测试类"""
+
+    def test_walk_forward_and_back(self):
+        """测试按游标向后翻页覆盖全部记录，再向前翻页回到上一页"""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        logs = make_logs()
+        with Session(engine) as session:
+            session.add_all(logs)
+            session.commit()
+
+            seen, pages, cursor = [], [], None
+            while True:
+                page = paginate_query(session.query(UserLoginLog), SORT, 10, cursor)
+                pages.append(page)
+                seen.extend(log.id for log in page.items)
+                if not page.has_next:
+                    break
+                cursor = page.next_cursor
+
+            back = paginate_query(session.query(UserLoginLog), SORT, 10, pages[-1].prev_cursor)
+
+        assert seen == expected_order(logs)
+        assert [len(page.items) for page in pages] == [10, 10, 5]
+        assert not pages[0].has_prev
+        assert [log.id for log in back.items] == [log.id for log in pages[1].items]
+        assert back.has_prev and back.has_next
+
+    def test_async_pagination(self):
+        """测试异步会话的游标分页"""
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            async with AsyncSession(engine) as session:
+                session.add_all(make_logs(7))
+                await session.commit()
+                first = await paginate_async(session, select(UserLoginLog), SORT, 4)
+                second = await paginate_async(session, select(UserLoginLog), SORT, 4, first.next_cursor)
+            await engine.dispose()
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert [log.id for log in first.items + second.items] == expected_order(make_logs(7))
+        assert not second.has_next
+
+    def test_invalid_cursor(self):
+        """测试无效游标"""
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            for cursor in ("not-a-cursor", encode_cursor([1])):
+                with pytest.raises(ValidationException):
+                    paginate_query(session.query(UserLoginLog), SORT, 10, cursor)
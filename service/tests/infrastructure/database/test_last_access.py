@@ -0,0 +1,87 @@
+"""
+在线会话最后访问时间写回测试
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo, UserOnline
+from app.infrastructure.session.last_access import LastAccessBuffer
+
+LOGIN_TIME = datetime(2024, 1, 1, 8, 0, 0)
+
+
+async def setup_database():
+    """创建内存数据库并写入两个在线会话"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo).values(id=1, username="admin", password="x"))
+        for token in ("s1", "s2"):
+            await conn.execute(insert(UserOnline).values(
+                user_id=1, username="admin", token=token,
+                login_time=LOGIN_TIME, last_access_time=LOGIN_TIME
+            ))
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestLastAccessBuffer:
+    """最后访问时间写回缓冲测试类"""
+
+    def test_touches_coalesce_into_one_batch(self):
+        """测试多次访问合并为一次批量更新"""
+        async def run():
+            engine, session_factory = await setup_database()
+            updates = []
+            event.listen(engine.sync_engine, "before_cursor_execute",
+                         lambda conn, cursor, statement, *args: updates.append(statement)
+                         if statement.startswith("UPDATE") else None)
+            buffer = LastAccessBuffer(session_factory, flush_interval=60)
+            for minute in range(1, 51):
+                buffer.touch("s1", LOGIN_TIME + timedelta(minutes=minute))
+            buffer.touch("s2", LOGIN_TIME + timedelta(minutes=5))
+            buffer.touch(None)
+            written = await buffer.flush()
+            async with session_factory() as session:
+                rows = (await session.execute(select(UserOnline).order_by(UserOnline.token))).scalars().all()
+            await engine.dispose()
+            return buffer.stats(), written, updates, rows
+
+        stats, written, updates, rows = asyncio.run(run())
+        assert written == 2
+        assert stats["touches"] == 51
+        assert stats["pending"] == 0
+        assert len(updates) == 1
+        assert rows[0].last_access_time == LOGIN_TIME + timedelta(minutes=50)
+        assert rows[1].last_access_time == LOGIN_TIME + timedelta(minutes=5)
+
+    def test_failed_flush_keeps_pending(self):
+        """测试写库失败时保留缓冲以便重试"""
+        def broken_factory():
+            raise RuntimeError("database unavailable")
+
+        buffer = LastAccessBuffer(broken_factory)
+        buffer.touch("s1", LOGIN_TIME)
+        assert asyncio.run(buffer.flush()) == 0
+        stats = buffer.stats()
+        assert stats["pending"] == 1
+        assert stats["failed_flushes"] == 1
+
+    def test_stop_flushes_remaining(self):
+        """测试停止时写完剩余记录"""
+        async def run():
+            engine, session_factory = await setup_database()
+            buffer = LastAccessBuffer(session_factory, flush_interval=60)
+            await buffer.start()
+            buffer.touch("s2", LOGIN_TIME + timedelta(hours=1))
+            await buffer.stop()
+            async with session_factory() as session:
+                row = (await session.execute(select(UserOnline).where(UserOnline.token == "s2"))).scalar_one()
+            await engine.dispose()
+            return row
+
+        assert asyncio.run(run()).last_access_time == LOGIN_TIME + timedelta(hours=1)
@@ -0,0 +1,123 @@
+"""
+登录查询与审计后台写入测试
+"""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.audit.login_audit import LoginAuditRecord, LoginAuditWriter, parse_user_agent
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.menu import MenuModel
+from app.infrastructure.persistence.sqlalchemy.models.role import UserRole, role_menu_association
+from app.infrastructure.persistence.sqlalchemy.models.user import (
+    UserInfo, UserLoginLog, user_role_association
+)
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+
+CHROME_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36"
+
+
+async def setup_database():
+    """创建内存数据库并写入一个带角色和菜单的用户"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo).values(
+            id=1, username="admin", password="hashed", nickname="管理员", email="admin@example.com"
+        ))
+        await conn.execute(insert(UserRole).values(id="r1", name="管理员", code="admin"))
+        await conn.execute(insert(MenuModel).values(id="m1", name="用户管理", path="/system/user", meta={}))
+        await conn.execute(insert(user_role_association).values(id=1, userinfo_id=1, userrole_id="r1"))
+        await conn.execute(insert(role_menu_association).values(id=1, userrole_id="r1", menu_id="m1"))
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestLoginQuery:
+    """登录查询测试类"""
+
+    def test_single_round_trip(self):
+        """测试用户、角色、菜单权限一次查询加载"""
+        async def run():
+            engine, session_factory = await setup_database()
+            statements = []
+            event.listen(engine.sync_engine, "before_cursor_execute",
+                         lambda conn, cursor, statement, *args: statements.append(statement))
+            async with session_factory() as session:
+                found = await SQLAlchemyUserRepository(session).find_for_login("admin")
+                missing = await SQLAlchemyUserRepository(session).find_for_login("nobody")
+            await engine.dispose()
+            return found, missing, statements
+
+        found, missing, statements = asyncio.run(run())
+        user, hashed_password = found
+        assert hashed_password == "hashed"
+        assert [role.code for role in user.roles] == ["admin"]
+        assert user.has_permission("/system/user")
+        assert missing is None
+        assert len(statements) == 2
+
+
+class TestLoginAuditWriter:
+    """登录审计后台写入测试类"""
+
+    def test_parse_user_agent(self):
+        """测试 User-Agent 识别"""
+        assert parse_user_agent(CHROME_AGENT) == ("Chrome", "Windows")
+        assert parse_user_agent(None) == (None, None)
+
+    def test_batched_write_updates_last_login(self):
+        """测试批量写入登录日志并按最后一次登录更新最后登录时间"""
+        async def run():
+            engine, session_factory = await setup_database()
+            writer = LoginAuditWriter(session_factory, batch_size=10, flush_interval=0.01)
+            await writer.start()
+            for hour in (8, 9, 10):
+                writer.submit(LoginAuditRecord(
+                    user_id="1", username="admin", ip="127.0.0.1", agent=CHROME_AGENT,
+                    login_time=datetime(2024, 1, 1, hour)
+                ))
+            await writer.stop()
+            async with session_factory() as session:
+                log_count = (await session.execute(select(func.count()).select_from(UserLoginLog))).scalar_one()
+                browsers = (await session.execute(select(UserLoginLog.browser))).scalars().all()
+                last_login = (await session.execute(select(UserInfo.last_login))).scalar_one()
+            await engine.dispose()
+            return writer.stats(), log_count, browsers, last_login
+
+        stats, log_count, browsers, last_login = asyncio.run(run())
+        assert stats["written"] == 3
+        assert stats["queued"] == 0
+        assert log_count == 3
+        assert set(browsers) == {"Chrome"}
+        assert last_login == datetime(2024, 1, 1, 10)
+
+    def test_failed_login_resolves_user_by_username(self):
+        """测试失败记录按用户名关联用户、不更新最后登录时间，未知用户名的日志不关联用户"""
+        async def run():
+            engine, session_factory = await setup_database()
+            writer = LoginAuditWriter(session_factory, batch_size=10)
+            writer.submit(LoginAuditRecord(user_id=None, username="admin", ip="127.0.0.1", status=False))
+            writer.submit(LoginAuditRecord(user_id=None, username="nobody", ip="127.0.0.1", status=False))
+            written = await writer.flush()
+            async with session_factory() as session:
+                logs = (await session.execute(
+                    select(UserLoginLog.creator_id, UserLoginLog.status).order_by(UserLoginLog.id)
+                )).all()
+                last_login = (await session.execute(select(UserInfo.last_login))).scalar_one()
+            await engine.dispose()
+            return written, logs, last_login
+
+        written, logs, last_login = asyncio.run(run())
+        assert written == 2
+        assert [tuple(row) for row in logs] == [(1, False), (None, False)]
+        assert last_login is None
+
+    def test_drops_when_queue_full(self):
+        """测试队列已满时丢弃记录"""
+        writer = LoginAuditWriter(max_queue=1)
+        assert writer.submit(LoginAuditRecord(user_id="1", username="a"))
+        assert not writer.submit(LoginAuditRecord(user_id="1", username="a"))
+        assert writer.stats()["dropped"] == 1
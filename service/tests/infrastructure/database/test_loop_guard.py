@@ -0,0 +1,60 @@
+"""
+事件循环阻塞检测测试
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.infrastructure.database.loop_guard import BlockingDatabaseCallError, EventLoopGuard
+
+
+def query(engine):
+    """执行同步查询"""
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT 1")).scalar_one()
+
+
+class TestEventLoopGuard:
+    """事件循环阻塞检测测试类"""
+
+    def test_raise_in_event_loop(self):
+        """测试事件循环线程中的同步查询被拒绝，线程池中的查询正常执行"""
+        guard = EventLoopGuard("raise")
+        engine = create_engine("sqlite://")
+        guard.install(engine)
+
+        async def run():
+            with pytest.raises(BlockingDatabaseCallError):
+                query(engine)
+            return await asyncio.to_thread(query, engine)
+
+        assert query(engine) == 1
+        assert asyncio.run(run()) == 1
+        assert guard.stats()["blocking_calls"] == 1
+
+    def test_warn_counts_call_sites(self):
+        """测试记录模式按调用位置统计"""
+        guard = EventLoopGuard("warn")
+        engine = create_engine("sqlite://")
+        guard.install(engine)
+
+        async def run():
+            for _ in range(3):
+                query(engine)
+
+        asyncio.run(run())
+        stats = guard.stats()
+        assert stats["blocking_calls"] == 3
+        assert len(stats["call_sites"]) == 1
+        assert "test_loop_guard.py" in next(iter(stats["call_sites"]))
+
+    def test_off_mode(self):
+        """测试关闭检测"""
+        guard = EventLoopGuard("off")
+        engine = create_engine("sqlite://")
+        guard.install(engine)
+        asyncio.run(asyncio.sleep(0, query(engine)))
+        assert guard.stats()["blocking_calls"] == 0
+        with pytest.raises(ValueError):
+            EventLoopGuard("strict")
@@ -0,0 +1,141 @@
+"""
+在线会话注册表测试
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo, UserOnline
+from app.infrastructure.session.registry import OnlineSession, OnlineSessionRegistry, TimingWheel
+
+
+def make_session(session_id: str, user_id: str, login_time: float = None) -> OnlineSession:
+    """创建测试会话"""
+    return OnlineSession(
+        session_id=session_id, user_id=user_id, username=f"user{user_id}",
+        login_time=login_time or time.time()
+    )
+
+
+async def setup_database():
+    """创建内存数据库"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for user_id in (1, 2, 3):
+            await conn.execute(insert(UserInfo).values(id=user_id, username=f"user{user_id}", password="x"))
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class TestTimingWheel:
+    """时间轮测试类"""
+
+    def test_due_keys(self):
+        """测试推进后返回到期的键"""
+        wheel = TimingWheel(tick=1, slots=10, now=100)
+        wheel.schedule("a", 103)
+        wheel.schedule("b", 105)
+        assert wheel.advance(102) == []
+        assert wheel.advance(103.5) == ["a"]
+        wheel.discard("b")
+        assert wheel.advance(110) == []
+
+
+class TestOnlineSessionRegistry:
+    """在线会话注册表测试类"""
+
+    def test_login_replaces_previous_session(self):
+        """测试同一用户再次登录替换旧会话"""
+        registry = OnlineSessionRegistry(shards=4)
+        registry.register(make_session("s1", "1"))
+        registry.register(make_session("s2", "1"))
+        assert registry.count() == 1
+        assert registry.get("s1") is None
+        assert registry.get("s2").user_id == "1"
+
+    def test_paging_newest_first(self):
+        """测试跨分片分页按登记顺序倒序"""
+        registry = OnlineSessionRegistry(shards=3)
+        for i in range(7):
+            registry.register(make_session(f"s{i}", str(i)))
+
+        first, total = registry.page(1, 3)
+        last, _ = registry.page(3, 3)
+        assert total == 7
+        assert [s.session_id for s in first] == ["s6", "s5", "s4"]
+        assert [s.session_id for s in last] == ["s0"]
+
+    def test_paging_reads_only_newest_sessions(self):
+        """测试分页只从各分片读取最新的 offset + page_size 个会话，而非全部在线会话"""
+        class CountingSessions(OrderedDict):
+            """记录被读出的会话数"""
+            reads = 0
+
+            def values(self):
+                sessions = self
+
+                class Values:
+                    def __reversed__(self):
+                        for value in reversed(OrderedDict.values(sessions)):
+                            CountingSessions.reads += 1
+                            yield value
+                return Values()
+
+        registry = OnlineSessionRegistry(shards=4)
+        for i in range(2000):
+            registry.register(make_session(f"s{i}", str(i)))
+        for shard in registry._shards:
+            shard.sessions = CountingSessions(shard.sessions)
+
+        items, total = registry.page(2, 10)
+        assert total == 2000
+        assert [s.session_id for s in items] == [f"s{i}" for i in range(1989, 1979, -1)]
+        assert CountingSessions.reads <= 4 * 20
+
+    def test_idle_sessions_expire(self):
+        """测试空闲会话过期而活跃会话保留"""
+        registry = OnlineSessionRegistry(shards=2, idle_timeout=10, tick=1)
+        now = time.time()
+        registry.register(make_session("idle", "1", login_time=now))
+        registry.register(make_session("active", "2", login_time=now))
+        registry.touch("active", now + 8)
+
+        assert registry.expire(now + 12) == 1
+        assert registry.get("idle") is None
+        assert registry.get("active") is not None
+        assert registry.expire(now + 19) == 1
+        assert registry.count() == 0
+
+    def test_snapshot_and_restore(self):
+        """测试增量快照写库并在重启后恢复"""
+        async def run():
+            engine, session_factory = await setup_database()
+            registry = OnlineSessionRegistry(shards=2, session_factory=session_factory)
+            registry.register(make_session("s1", "1"))
+            registry.register(make_session("s2", "2"))
+            registry.register(make_session("s3", "3"))
+            registry.remove("s3")
+            first = await registry.snapshot()
+
+            registry.register(make_session("s4", "1"))
+            second = await registry.snapshot()
+            async with session_factory() as db:
+                tokens = sorted((await db.execute(select(UserOnline.token))).scalars().all())
+
+            restored = OnlineSessionRegistry(shards=4, session_factory=session_factory)
+            count = await restored.restore()
+            await engine.dispose()
+            return first, second, tokens, count, restored
+
+        first, second, tokens, count, restored = asyncio.run(run())
+        assert first == 2
+        assert second == 2
+        assert tokens == ["s2", "s4"]
+        assert count == 2
+        assert restored.get("s4").user_id == "1"
+        assert restored.stats()["pending_changes"] == 0
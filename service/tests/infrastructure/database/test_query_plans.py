@@ -0,0 +1,80 @@
+"""
+热点查询执行计划检查测试
+"""
+import sqlite3
+from pathlib import Path
+
+from app.infrastructure.database.query_plans import (
+    HOT_QUERIES,
+    HotQuery,
+    check_query_plans,
+    hot_queries,
+    plan_problems,
+)
+
+INIT_DIR = Path(__file__).resolve().parents[3] / "db" / "init"
+
+
+def build_database(*scripts: str) -> sqlite3.Connection:
+    """按初始化脚本创建内存数据库"""
+    conn = sqlite3.connect(":memory:")
+    for script in scripts:
+        conn.executescript((INIT_DIR / script).read_text(encoding="utf-8"))
+    return conn
+
+
+class TestQueryPlans:
+    """热点查询执行计划检查测试类"""
+
+    def test_plan_problems(self):
+        """测试只把全表扫描和临时排序视为问题"""
+        assert plan_problems(["SCAN system_menu"]) == ["SCAN system_menu"]
+        assert plan_problems(["SCAN system_menu USING INDEX idx_menu_rank_id"]) == []
+        assert plan_problems(["SEARCH system_menu USING INDEX idx_menu_parent_id (parent_id=?)"]) == []
+        assert plan_problems(["SCAN t USING INDEX i", "USE TEMP B-TREE FOR ORDER BY"]) == ["USE TEMP B-TREE FOR ORDER BY"]
+
+    def test_init_scripts_cover_hot_queries(self):
+        """测试初始化脚本建立的索引覆盖全部热点查询"""
+        conn = build_database("01_create_tables_sqlite.sql", "03_create_indexes.sql")
+        try:
+            failures = check_query_plans(conn)
+        finally:
+            conn.close()
+        assert [(query.name, plan) for query, plan in failures] == []
+
+    def test_missing_indexes_detected(self):
+        """测试缺少索引脚本时能发现全表扫描"""
+        conn = build_database("01_create_tables_sqlite.sql")
+        try:
+            failed = {query.name for query, _ in check_query_plans(conn)}
+            unindexed = check_query_plans(conn, [HotQuery("by_nickname", "test", "SELECT * FROM system_userinfo WHERE nickname = 'x'")])
+        finally:
+            conn.close()
+        assert {"user_by_dept", "user_page", "menu_list", "role_menu_ids"} <= failed
+        assert "load system_userrole->system_userrole_menu->menus" in failed
+        assert len(unindexed) == 1
+        assert len(HOT_QUERIES) > len(failed)
+
+    def test_repository_queries_are_compiled(self):
+        """测试仓储查询由过滤、游标与关联加载的实际语句生成"""
+        queries = {query.name: query for query in HOT_QUERIES}
+        assert queries["user_by_username_iexact"].sql.endswith("WHERE lower(system_userinfo.username) = 'admin'")
+        assert "system_userinfo.id < '9'" in queries["user_page_after_cursor"].sql
+        assert queries["user_page"].sql.rstrip().endswith("LIMIT 21 OFFSET 0")
+
+        conn = build_database("01_create_tables_sqlite.sql", "03_create_indexes.sql")
+        try:
+            with hot_queries(conn) as queries:
+                loads = [query for query in queries if query.source == "hydration.user_options(FULL)"]
+            # 样例数据与模型表在检查结束后回滚
+            users = conn.execute("SELECT count(*) FROM system_userinfo").fetchone()[0]
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        finally:
+            conn.close()
+        assert {query.name for query in loads} >= {
+            "load system_userinfo->system_userinfo_roles->system_userrole",
+            "load system_fieldpermission",
+            "load menus->system_datapermission_menu->system_datapermission",
+        }
+        assert all(query.params for query in loads)
+        assert users == 0 and "menus" not in tables
@@ -0,0 +1,91 @@
+"""
+请求级 SQL 统计测试
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.database.query_stats import QueryInstrumentation, fingerprint
+from app.presentation.middleware.sql_timing import SQLTimingMiddleware
+
+
+def make_client(instrumentation: QueryInstrumentation) -> TestClient:
+    """创建带统计中间件的应用：/items 逐条查询（N+1），/batch 一次查询"""
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    instrumentation.install(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO item (id) VALUES (1), (2), (3), (4), (5)"))
+
+    app = FastAPI()
+    app.add_middleware(SQLTimingMiddleware, instrumentation=instrumentation)
+
+    @app.get("/items")
+    def items():
+        with engine.connect() as conn:
+            return [conn.execute(text(f"SELECT id FROM item WHERE id = {i}")).scalar() for i in range(1, 6)]
+
+    @app.get("/batch")
+    def batch():
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT id FROM item WHERE id IN (1, 2, 3)")).scalars().all()
+
+    return TestClient(app)
+
+
+class TestQueryInstrumentation:
+    """请求级 SQL 统计测试类"""
+
+    def test_fingerprint(self):
+        """测试语句指纹忽略字面量与 IN 列表长度"""
+        assert fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a'") == \
+            fingerprint("SELECT * FROM t  WHERE id = 25 AND name = 'b''c'")
+        assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == \
+            fingerprint("SELECT * FROM t WHERE id IN (?)")
+
+    def test_server_timing_and_repeat_warning(self):
+        """测试响应头统计语句数，重复语句超过阈值时计入告警"""
+        instrumentation = QueryInstrumentation(repeat_threshold=3)
+        client = make_client(instrumentation)
+
+        response = client.get("/items")
+        assert response.json() == [1, 2, 3, 4, 5]
+        assert 'desc="5 queries"' in response.headers["server-timing"]
+
+        response = client.get("/batch")
+        assert 'desc="1 queries"' in response.headers["server-timing"]
+
+        stats = instrumentation.stats()
+        assert stats["requests"] == 2
+        assert stats["statements"] == 6
+        assert stats["max_statements"] == 5
+        assert stats["repeat_warnings"] == 1
+        assert list(stats["repeated_shapes"]) == [fingerprint("SELECT id FROM item WHERE id = 1")]
+
+    def test_outside_request_not_counted(self):
+        """测试请求之外执行的语句不计入统计"""
+        instrumentation = QueryInstrumentation()
+        engine = create_engine("sqlite://")
+        instrumentation.install(engine)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        assert instrumentation.stats()["statements"] == 0
+
+    def test_failed_statement_does_not_leak_start_time(self):
+        """测试语句抛出异常后不残留开始时间，后续语句耗时计算正确"""
+        instrumentation = QueryInstrumentation()
+        engine = create_engine("sqlite://", poolclass=StaticPool)
+        instrumentation.install(engine)
+        token = instrumentation.begin()
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            leftover = {key for key in conn.info if "started" in key}
+        stats = instrumentation.end(token)
+        assert stats.statements == 1 and leftover == set()
@@ -0,0 +1,71 @@
+"""
+读写分离路由测试
+"""
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import exc as sa_exc, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.database.engine_registry import EngineRegistry
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+from shared.kernel.exceptions import ReadOnlyError
+
+
+def make_registry(tmp_path, max_lag: float = 0) -> EngineRegistry:
+    """创建主库与只读副本（同一 SQLite 文件的只读 URI）"""
+    path = tmp_path / "app.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    conn.execute("INSERT INTO items VALUES (1)")
+    conn.commit()
+    conn.close()
+    registry = EngineRegistry(f"sqlite:///{path}", replica_max_lag=max_lag)
+    registry.register("replica", f"sqlite:///file:{path}?mode=ro&uri=true")
+    return registry
+
+
+class TestReadReplicaRouting:
+    """读写分离路由测试类"""
+
+    def test_route_by_intent(self, tmp_path):
+        """测试只读请求路由到副本，写请求路由到主库"""
+        registry = make_registry(tmp_path)
+        assert registry.route() == "default"
+        assert registry.route(read_only=True) == "replica"
+        assert EngineRegistry("sqlite://").route(read_only=True) == "default"
+
+    def test_recent_write_reads_primary(self, tmp_path):
+        """测试主库提交后延迟容忍时间内只读请求仍走主库"""
+        registry = make_registry(tmp_path, max_lag=60)
+        assert registry.route(read_only=True) == "replica"
+        with registry.get_sync_engine().begin() as conn:
+            conn.execute(text("INSERT INTO items VALUES (2)"))
+        assert registry.route(read_only=True) == "default"
+        registry.get_sync_engine().dispose()
+
+    def test_replica_rejects_writes(self, tmp_path):
+        """测试副本连接只读"""
+        registry = make_registry(tmp_path)
+        engine = registry.get_sync_engine("replica")
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar_one() == 1
+            with pytest.raises(sa_exc.OperationalError):
+                conn.execute(text("INSERT INTO items VALUES (3)"))
+        engine.dispose()
+
+    def test_read_only_repository(self, tmp_path):
+        """测试只读仓储拒绝写操作"""
+        registry = make_registry(tmp_path)
+
+        async def run():
+            async with AsyncSession(registry.get_async_engine("replica"), info={"read_only": True}) as session:
+                repo = SQLAlchemyUserRepository(session)
+                with pytest.raises(ReadOnlyError):
+                    await repo.update_last_login("1")
+                count = (await session.execute(text("SELECT COUNT(*) FROM items"))).scalar_one()
+            await registry.dispose()
+            return repo.read_only, count
+
+        assert asyncio.run(run()) == (True, 1)
@@ -0,0 +1,56 @@
+"""
+SQLite 调优方案测试
+"""
+import asyncio
+
+import pytest
+
+from app.infrastructure.database.engine_registry import EngineRegistry
+from app.infrastructure.database.sqlite_profile import connect_sqlite, read_pragmas, sqlite_pragmas
+
+
+class TestSQLiteProfile:
+    """SQLite 调优方案测试类"""
+
+    def test_profiles(self):
+        """测试调优方案生成的 PRAGMA"""
+        pragmas = dict(sqlite_pragmas("performance"))
+        assert list(pragmas)[0] == "busy_timeout"
+        assert pragmas["journal_mode"] == "WAL"
+        assert pragmas["synchronous"] == "NORMAL"
+        assert sqlite_pragmas("default") == []
+        with pytest.raises(ValueError):
+            sqlite_pragmas("unknown")
+
+    def test_raw_connection(self, tmp_path):
+        """测试直接使用 sqlite3 的连接应用调优"""
+        conn = connect_sqlite(str(tmp_path / "raw.db"))
+        pragmas = read_pragmas(conn)
+        conn.close()
+        assert pragmas["journal_mode"] == "wal"
+        assert pragmas["synchronous"] == 1
+        assert pragmas["temp_store"] == 2
+
+    def test_sync_engine(self, tmp_path):
+        """测试同步引擎的连接应用调优"""
+        registry = EngineRegistry(f"sqlite:///{tmp_path}/app.db")
+        with registry.get_sync_engine().connect() as conn:
+            pragmas = read_pragmas(conn.connection.dbapi_connection)
+        asyncio.run(registry.dispose())
+        assert pragmas["journal_mode"] == "wal"
+        assert pragmas["busy_timeout"] > 0
+
+    def test_async_engine(self, tmp_path):
+        """测试异步引擎的连接应用调优"""
+        registry = EngineRegistry(f"sqlite:///{tmp_path}/app.db")
+
+        async def run():
+            async with registry.get_async_engine().connect() as conn:
+                result = await conn.exec_driver_sql("PRAGMA journal_mode")
+                journal_mode = result.scalar()
+                result = await conn.exec_driver_sql("PRAGMA synchronous")
+                synchronous = result.scalar()
+            await registry.dispose()
+            return journal_mode, synchronous
+
+        assert asyncio.run(run()) == ("wal", 1)
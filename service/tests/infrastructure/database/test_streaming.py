@@ -0,0 +1,67 @@
+"""
+流式读取测试
+"""
+import asyncio
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from app.infrastructure.persistence.sqlalchemy.repositories.base_repo_impl import SQLAlchemyBaseRepository
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+
+
+async def setup_users(count: int = 25):
+    """创建内存数据库并插入用户，偶数 id 为停用用户"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com", "password": "x", "is_active": i % 2 == 1}
+            for i in range(1, count + 1)
+        ])
+    return engine
+
+
+class TestStreaming:
+    """流式读取测试类"""
+
+    def test_iter_all_and_filter(self):
+        """测试按批遍历全部实体与按条件遍历"""
+        async def run():
+            engine = await setup_users()
+            async with AsyncSession(engine) as session:
+                base = SQLAlchemyBaseRepository(session, UserInfo)
+                all_ids = [user.id async for user in base.iter_all(batch_size=10)]
+                active_ids = [user.id async for user in base.iter_filter(batch_size=4, is_active=True, id__lte=10)]
+
+                users = SQLAlchemyUserRepository(session)
+                usernames = [user.username async for user in users.iter_filter(batch_size=3, username__like="user2")]
+                filtered = await users.filter_by(is_active=False)
+            await engine.dispose()
+            return all_ids, active_ids, usernames, filtered
+
+        all_ids, active_ids, usernames, filtered = asyncio.run(run())
+        assert sorted(all_ids) == list(range(1, 26))
+        assert sorted(active_ids) == [1, 3, 5, 7, 9]
+        assert sorted(usernames) == ["user2"] + [f"user{i}" for i in range(20, 26)]
+        assert len(filtered) == 12 and not any(user.is_active for user in filtered)
+
+    def test_early_exit_releases_connection(self):
+        """测试提前结束遍历后会话仍可继续使用"""
+        async def run():
+            engine = await setup_users()
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyBaseRepository(session, UserInfo)
+                iterator = repo.iter_all(batch_size=5)
+                first = await iterator.__anext__()
+                await iterator.aclose()
+                count = await repo.count()
+            await engine.dispose()
+            return first, count
+
+        first, count = asyncio.run(run())
+        assert first is not None
+        assert count == 25
@@ -0,0 +1,113 @@
+"""
+请求级工作单元测试
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.database.unit_of_work import UnitOfWork, after_commit
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from app.infrastructure.persistence.sqlalchemy.repositories.base_repo_impl import SQLAlchemyBaseRepository
+
+
+async def setup_database():
+    """创建内存数据库并插入三个用户，记录提交次数"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo), [
+            {"id": i, "username": f"user{i}", "password": "x"} for i in (1, 2, 3)
+        ])
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(1))
+    return engine, commits
+
+
+async def nicknames(engine):
+    async with AsyncSession(engine) as session:
+        rows = await session.execute(select(UserInfo.id, UserInfo.nickname).order_by(UserInfo.id))
+        return [nickname for _, nickname in rows]
+
+
+class TestUnitOfWork:
+    """请求级工作单元测试类"""
+
+    def test_single_commit(self):
+        """测试多次写操作只提交一次，提交后才执行回调"""
+        async def run():
+            engine, commits = await setup_database()
+            events = []
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyBaseRepository(session, UserInfo)
+                async with UnitOfWork(session) as uow:
+                    for i in (1, 2, 3):
+                        await repo.update(i, nickname=f"n{i}")
+                    after_commit(session, lambda: events.append("invalidated"))
+                    before = (list(events), len(commits))
+                    await uow.commit()
+            result = await nicknames(engine)
+            await engine.dispose()
+            return before, events, commits, result
+
+        before, events, commits, result = asyncio.run(run())
+        assert before == ([], 0)
+        assert events == ["invalidated"]
+        assert len(commits) == 1
+        assert result == ["n1", "n2", "n3"]
+
+    def test_rollback_on_error(self):
+        """测试处理过程中出错时整体回滚并丢弃回调"""
+        async def run():
+            engine, _ = await setup_database()
+            events = []
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyBaseRepository(session, UserInfo)
+                with pytest.raises(RuntimeError):
+                    async with UnitOfWork(session):
+                        await repo.update(1, nickname="changed")
+                        after_commit(session, lambda: events.append("invalidated"))
+                        raise RuntimeError("中途失败")
+            result = await nicknames(engine)
+            await engine.dispose()
+            return events, result
+
+        events, result = asyncio.run(run())
+        assert events == []
+        assert result == ["", "", ""]
+
+    def test_savepoint(self):
+        """测试保存点内失败只回滚保存点内的写入"""
+        async def run():
+            engine, _ = await setup_database()
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyBaseRepository(session, UserInfo)
+                async with UnitOfWork(session) as uow:
+                    await repo.update(1, nickname="kept")
+                    try:
+                        async with uow.savepoint():
+                            await repo.update(2, nickname="discarded")
+                            raise ValueError
+                    except ValueError:
+                        pass
+            result = await nicknames(engine)
+            await engine.dispose()
+            return result
+
+        assert asyncio.run(run()) == ["kept", "", ""]
+
+    def test_without_unit_of_work(self):
+        """测试不在工作单元中时写操作各自提交"""
+        async def run():
+            engine, commits = await setup_database()
+            async with AsyncSession(engine) as session:
+                repo = SQLAlchemyBaseRepository(session, UserInfo)
+                await repo.update(1, nickname="a")
+                await repo.update(2, nickname="b")
+            await engine.dispose()
+            return commits
+
+        assert len(asyncio.run(run())) == 2
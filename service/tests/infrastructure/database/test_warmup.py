@@ -0,0 +1,136 @@
+"""
+启动预热测试
+"""
+import asyncio
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.infrastructure.database.warmup import DatabaseWarmup
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.role import UserRole
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+
+INIT_SCRIPT = Path(__file__).resolve().parents[3] / "db" / "init" / "01_create_tables_sqlite.sql"
+
+
+async def setup_engine(pool_size: int = 3):
+    """在临时文件数据库上创建带连接池的异步引擎，记录新建的连接数"""
+    path = Path(tempfile.mkdtemp(prefix="warmup_")) / "warmup.db"
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool, pool_size=pool_size, max_overflow=0
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo), [{"id": "u1", "username": "admin", "email": "admin@example.com", "password": "x"}])
+        await conn.execute(insert(UserRole), [{"id": "r1", "name": "admin", "code": "admin"}])
+    await engine.dispose()
+
+    connects = []
+    event.listen(engine.sync_engine, "connect", lambda *args: connects.append(1))
+    return engine, connects
+
+
+def setup_legacy_engines(pool_size: int = 2):
+    """在按初始化脚本建表的临时数据库上创建异步引擎与带连接池的同步引擎"""
+    path = Path(tempfile.mkdtemp(prefix="warmup_sync_")) / "warmup.db"
+    conn = sqlite3.connect(str(path))
+    conn.executescript(INIT_SCRIPT.read_text(encoding="utf-8"))
+    conn.close()
+    sync_engine = create_engine(f"sqlite:///{path}", poolclass=QueuePool, pool_size=pool_size, max_overflow=0)
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    return engine, sync_engine
+
+
+class TestDatabaseWarmup:
+    """启动预热测试类"""
+
+    def test_warmup_opens_connections_and_runs_queries(self):
+        """测试预热后连接池留有空闲连接，热点查询成功且标记为就绪"""
+        async def run():
+            engine, connects = await setup_engine(pool_size=3)
+            statements = []
+            event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            warmup = DatabaseWarmup(connections=5, timeout=10)
+            assert not warmup.ready
+            ok = await warmup.run(engine)
+            idle = engine.sync_engine.pool.checkedin()
+            await engine.dispose()
+            return ok, warmup.stats(), len(connects), idle, statements
+
+        ok, stats, connect_count, idle, statements = asyncio.run(run())
+        assert ok and stats["ready"] and stats["errors"] == []
+        # 连接数以连接池大小为上限
+        assert connect_count == 3 and idle == 3
+        # 未传入同步引擎时不执行同步热点查询
+        assert set(stats["steps_ms"]) == {"connections", "sync_connections", "mappers", "queries"}
+        assert any("FROM system_userinfo" in sql for sql in statements)
+        assert any("FROM system_userrole" in sql for sql in statements)
+
+    def test_failures_do_not_block_readiness(self):
+        """测试步骤失败或预热关闭时仍标记为就绪"""
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite:///file:missing?mode=memory&uri=true")
+            warmup = DatabaseWarmup(connections=1, timeout=10)
+            ok = await warmup.run(engine)
+            await engine.dispose()
+            disabled = DatabaseWarmup(enabled=False)
+            return ok, warmup.stats(), disabled.ready, await disabled.run()
+
+        ok, stats, disabled_ready, disabled_ok = asyncio.run(run())
+        # 空库没有表，热点查询失败
+        assert not ok and stats["ready"]
+        assert [error.split(":")[0] for error in stats["errors"]] == ["queries"]
+        assert disabled_ready and disabled_ok
+
+    def test_failed_connect_releases_held_connections(self):
+        """测试有连接打开失败时其余任务结束并归还连接，连接池不被占满"""
+        async def run():
+            engine, _ = await setup_engine(pool_size=5)
+            attempts = []
+
+            def fail_third(dialect, conn_rec, cargs, cparams):
+                attempts.append(1)
+                if len(attempts) == 3:
+                    raise ConnectionError("injected")
+
+            event.listen(engine.sync_engine, "do_connect", fail_third)
+            warmup = DatabaseWarmup(connections=5, timeout=10)
+            ok = await warmup.run(engine)
+            checked_out = engine.sync_engine.pool.checkedout()
+            pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            await engine.dispose()
+            return ok, warmup.stats(), checked_out, pending
+
+        ok, stats, checked_out, pending = asyncio.run(run())
+        assert not ok and stats["ready"]
+        assert stats["errors"][0].startswith("connections")
+        assert checked_out == 0 and pending == []
+
+    def test_warmup_sync_engines_run_route_queries(self):
+        """测试同步引擎连接池被预热，菜单树与用户列表经同步路由的语句执行"""
+        async def run():
+            engine, sync_engine = setup_legacy_engines(pool_size=2)
+            connects, statements = [], []
+            event.listen(sync_engine, "connect", lambda *args: connects.append(1))
+            event.listen(sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+            warmup = DatabaseWarmup(connections=5, timeout=10)
+            ok = await warmup.run(engine, sync_engines={"default": sync_engine})
+            idle = sync_engine.pool.checkedin()
+            await engine.dispose()
+            sync_engine.dispose()
+            return ok, warmup.stats(), len(connects), idle, statements
+
+        ok, stats, connect_count, idle, statements = asyncio.run(run())
+        assert ok and stats["errors"] == []
+        assert "sync_queries" in stats["steps_ms"]
+        assert connect_count == 2 and idle == 2
+        # 菜单树按 MenuService 的排序查询，用户列表按偏移与游标两种方式各查询一次
+        assert any("FROM system_menu ORDER BY system_menu.rank ASC" in " ".join(sql.split()) for sql in statements)
+        assert sum("FROM system_userinfo" in sql for sql in statements) >= 2
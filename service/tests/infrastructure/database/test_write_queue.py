@@ -0,0 +1,103 @@
+"""
+SQLite 单写入者队列测试
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.infrastructure.database.write_queue import SQLiteWriteQueue, run_write
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+
+
+def insert_user(user_id: int):
+    """生成插入用户的工作单元"""
+    def unit(session):
+        session.execute(insert(UserInfo).values(id=user_id, username=f"user{user_id}", password="x"))
+        return user_id
+    return unit
+
+
+async def setup_file_database(path):
+    """创建文件数据库"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+class TestSQLiteWriteQueue:
+    """单写入者队列测试类"""
+
+    def test_group_commit(self, tmp_path):
+        """测试并发写入合并为少量批次提交"""
+        path = tmp_path / "app.db"
+
+        async def run():
+            engine = await setup_file_database(path)
+            queue = SQLiteWriteQueue(f"sqlite:///{path}", batch_size=50)
+            await queue.start()
+            results = await asyncio.gather(*(queue.submit(insert_user(i)) for i in range(1, 201)))
+            await queue.stop()
+            async with engine.connect() as conn:
+                count = (await conn.execute(select(func.count()).select_from(UserInfo))).scalar_one()
+            await engine.dispose()
+            return results, count, queue.stats()
+
+        results, count, stats = asyncio.run(run())
+        assert results == list(range(1, 201))
+        assert count == 200
+        assert stats["units"] == 200
+        assert stats["batches"] < 200
+        assert stats["max_batch"] <= 50
+
+    def test_failed_unit_is_isolated(self, tmp_path):
+        """测试单个工作单元失败不影响同批其他写入"""
+        path = tmp_path / "app.db"
+
+        async def run():
+            engine = await setup_file_database(path)
+            queue = SQLiteWriteQueue(f"sqlite:///{path}")
+            await queue.start()
+            results = await asyncio.gather(
+                queue.submit(insert_user(1)),
+                queue.submit(insert_user(1)),
+                queue.submit(insert_user(2)),
+                return_exceptions=True
+            )
+            await queue.stop()
+            async with engine.connect() as conn:
+                ids = (await conn.execute(select(UserInfo.id).order_by(UserInfo.id))).scalars().all()
+            await engine.dispose()
+            return results, ids, queue.stats()
+
+        results, ids, stats = asyncio.run(run())
+        assert results[0] == 1 and results[2] == 2
+        assert isinstance(results[1], Exception)
+        assert ids == [1, 2]
+        assert stats["failed_units"] == 1
+
+    def test_run_write_falls_back_to_session(self):
+        """测试队列未启动时在当前会话中执行并提交"""
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with session_factory() as session:
+                result = await run_write(session, insert_user(7))
+            async with session_factory() as session:
+                username = (await session.execute(select(UserInfo.username))).scalar_one()
+            await engine.dispose()
+            return result, username
+
+        assert asyncio.run(run()) == (7, "user7")
+
+    def test_submit_requires_start(self):
+        """测试未启动时提交报错"""
+        queue = SQLiteWriteQueue("sqlite:///unused.db")
+        with pytest.raises(RuntimeError):
+            asyncio.run(queue.submit(insert_user(1)))
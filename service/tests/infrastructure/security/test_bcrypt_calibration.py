@@ -0,0 +1,119 @@
+"""
+bcrypt 成本校准与登录重新哈希测试
+"""
+import asyncio
+from datetime import datetime
+
+from passlib.context import CryptContext
+
+from app.application.services.user_service import UserService
+from app.domain.models import User
+from app.infrastructure.auth.bcrypt_calibration import bcrypt_policy, calibrate_rounds, effective_tolerance
+
+
+class FakeUserRepository:
+    """仅实现认证所需方法的用户仓储"""
+
+    def __init__(self, user: User, hashed_password: str):
+        self.user = user
+        self.hashed_password = hashed_password
+        self.updated = []
+
+    async def find_for_login(self, username: str):
+        if username != self.user.username:
+            return None
+        return self.user, self.hashed_password
+
+    async def update_password(self, user_id: str, hashed_password: str) -> bool:
+        self.updated.append(hashed_password)
+        self.hashed_password = hashed_password
+        return True
+
+
+class TestCalibration:
+    """成本校准测试类"""
+
+    def test_rounds_within_bounds(self):
+        """测试校准结果落在上下限之间"""
+        assert calibrate_rounds(target_ms=0, min_rounds=4, max_rounds=6, samples=1) == 4
+        assert calibrate_rounds(target_ms=10 ** 6, min_rounds=4, max_rounds=6, samples=1) == 6
+
+    def test_policy_marks_other_costs_for_update(self):
+        """测试成本与目标不一致的哈希需要更新"""
+        context = CryptContext(schemes=["bcrypt"], **bcrypt_policy(5))
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+        assert context.needs_update(old_hash)
+        assert not context.needs_update(context.hash("secret"))
+
+        tolerant = CryptContext(schemes=["bcrypt"], **bcrypt_policy(5, tolerance=1))
+        assert not tolerant.needs_update(old_hash)
+
+    def test_calibrated_cost_needs_tolerance(self):
+        """测试按主机校准时容差至少为 1，相邻主机的成本不会互相触发重新哈希"""
+        assert effective_tolerance(0, calibrated=True) == 1
+        assert effective_tolerance(0, calibrated=False) == 0
+        assert effective_tolerance(2, calibrated=True) == 2
+
+        host_a = CryptContext(schemes=["bcrypt"], **bcrypt_policy(6, effective_tolerance(0, calibrated=True)))
+        host_b = CryptContext(schemes=["bcrypt"], **bcrypt_policy(5, effective_tolerance(0, calibrated=True)))
+        assert not host_b.needs_update(host_a.hash("secret"))
+        assert not host_a.needs_update(host_b.hash("secret"))
+
+
+class TestRehashOnLogin:
+    """登录时重新哈希测试类"""
+
+    def make_service(self, hashed_password: str):
+        now = datetime.now()
+        user = User(
+            id="1", username="admin", nickname="admin", email="admin@example.com",
+            phone="", is_active=True, created_time=now, updated_time=now
+        )
+        repo = FakeUserRepository(user, hashed_password)
+        service = UserService(repo)
+        service.password_handler.pwd_context = CryptContext(schemes=["bcrypt"], **bcrypt_policy(5))
+
+        async def hash_password_async(password: str) -> str:
+            return service.password_handler.pwd_context.hash(password)
+
+        async def verify_password_async(plain_password: str, hashed: str) -> bool:
+            return service.password_handler.pwd_context.verify(plain_password, hashed)
+
+        service.password_handler.hash_password_async = hash_password_async
+        service.password_handler.verify_password_async = verify_password_async
+        return service, repo
+
+    def test_outdated_hash_is_rehashed(self):
+        """测试成本不一致的哈希在登录成功后被重新计算"""
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+        service, repo = self.make_service(old_hash)
+
+        assert asyncio.run(service.authenticate_user("admin", "secret")) is not None
+        assert len(repo.updated) == 1
+        assert repo.updated[0].startswith("$2b$05$")
+
+    def test_deferred_rehash_runs_after_authentication(self):
+        """测试传入 defer 时认证不等待重新哈希，延后执行时才更新密码哈希"""
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+        service, repo = self.make_service(old_hash)
+        deferred = []
+
+        async def run():
+            user = await service.authenticate_user("admin", "secret", defer=lambda func, *args: deferred.append((func, args)))
+            pending = list(repo.updated)
+            for func, args in deferred:
+                await func(*args)
+            return user, pending
+
+        user, pending = asyncio.run(run())
+        assert user is not None and pending == []
+        assert len(deferred) == 1
+        assert repo.updated[0].startswith("$2b$05$")
+
+    def test_failed_login_does_not_rehash(self):
+        """测试密码错误时不重新哈希"""
+        old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("secret")
+        service, repo = self.make_service(old_hash)
+
+        assert asyncio.run(service.authenticate_user("admin", "wrong")) is None
+        assert repo.updated == []
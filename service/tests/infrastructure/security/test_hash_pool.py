@@ -0,0 +1,54 @@
+"""
+密码哈希工作池测试
+"""
+import asyncio
+
+import pytest
+
+from app.infrastructure.auth.hash_pool import PasswordHashPool, HashPoolSaturatedError
+
+# 降低测试中的 bcrypt 成本
+FAST_CONTEXT = {"schemes": ["bcrypt"], "deprecated": "auto", "bcrypt__rounds": 4}
+
+
+class TestPasswordHashPool:
+    """密码哈希工作池测试类"""
+
+    def test_hash_and_verify(self):
+        """测试异步哈希与校验"""
+        pool = PasswordHashPool(workers=2, max_pending=4, context_config=FAST_CONTEXT)
+
+        async def run():
+            hashed = await pool.hash("secret")
+            return await pool.verify("secret", hashed), await pool.verify("wrong", hashed)
+
+        try:
+            assert asyncio.run(run()) == (True, False)
+            stats = pool.stats()
+            assert stats["completed"] == 3
+            assert stats["pending"] == 0
+            assert stats["avg_hash_ms"] > 0
+        finally:
+            pool.shutdown()
+
+    def test_rejects_when_saturated(self):
+        """测试排队已满时拒绝新任务"""
+        pool = PasswordHashPool(workers=1, max_pending=2, context_config=FAST_CONTEXT)
+
+        async def run():
+            hashed = await pool.hash("secret")
+            tasks = [pool.verify("secret", hashed) for _ in range(5)]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            results = asyncio.run(run())
+            rejected = [r for r in results if isinstance(r, HashPoolSaturatedError)]
+            assert len(rejected) == 3
+            assert pool.stats()["rejected"] == 3
+        finally:
+            pool.shutdown()
+
+    def test_invalid_mode(self):
+        """测试不支持的工作池模式"""
+        with pytest.raises(ValueError):
+            PasswordHashPool(mode="fiber")
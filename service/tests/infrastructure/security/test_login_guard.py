@@ -0,0 +1,88 @@
+"""
+登录准入控制测试
+"""
+import asyncio
+
+import pytest
+
+from app.infrastructure.auth.login_guard import LoginAdmissionController, SlidingWindowCounter
+from shared.kernel.exceptions import TooManyRequestsError
+
+
+async def attempt(guard: LoginAdmissionController, username: str, ip: str = None):
+    """执行一次空的登录尝试"""
+    async with guard.admit(username, ip):
+        pass
+
+
+class TestSlidingWindowCounter:
+    """滑动窗口计数测试类"""
+
+    def test_window_expires(self):
+        """测试窗口过后计数恢复"""
+        counter = SlidingWindowCounter(limit=2, window=10)
+        counter.hit("a", now=100)
+        counter.hit("a", now=101)
+        assert counter.retry_after("a", now=105) == pytest.approx(5)
+        assert counter.retry_after("a", now=110.5) == 0
+
+    def test_bounded_keys(self):
+        """测试跟踪的键数量有上限"""
+        counter = SlidingWindowCounter(limit=1, window=10, max_keys=2)
+        for key in ("a", "b", "c"):
+            counter.hit(key, now=100)
+        assert len(counter) == 2
+        assert counter.retry_after("a", now=101) == 0
+
+
+class TestLoginAdmissionController:
+    """登录准入控制器测试类"""
+
+    def test_rejects_username_over_limit(self):
+        """测试同一用户名超限后在哈希前被拒绝"""
+        guard = LoginAdmissionController(max_per_username=3, max_per_ip=100)
+
+        async def run():
+            for _ in range(3):
+                await attempt(guard, "admin", "10.0.0.1")
+            with pytest.raises(TooManyRequestsError) as exc_info:
+                await attempt(guard, "admin", "10.0.0.2")
+            assert exc_info.value.retry_after >= 1
+            await attempt(guard, "other", "10.0.0.2")
+
+        asyncio.run(run())
+        stats = guard.stats()
+        assert stats["admitted"] == 4
+        assert stats["shed_username"] == 1
+
+    def test_rejects_ip_over_limit(self):
+        """测试同一 IP 轮换用户名仍然受限"""
+        guard = LoginAdmissionController(max_per_username=100, max_per_ip=2)
+
+        async def run():
+            await attempt(guard, "u1", "10.0.0.1")
+            await attempt(guard, "u2", "10.0.0.1")
+            with pytest.raises(TooManyRequestsError):
+                await attempt(guard, "u3", "10.0.0.1")
+
+        asyncio.run(run())
+        assert guard.stats()["shed_ip"] == 1
+
+    def test_concurrency_cap_and_adaptation(self):
+        """测试并发上限与按耗时自适应收紧"""
+        guard = LoginAdmissionController(max_concurrent=2, target_latency=0.01)
+
+        async def slow(username: str):
+            async with guard.admit(username):
+                await asyncio.sleep(0.05)
+
+        async def run():
+            return await asyncio.gather(*(slow(f"u{i}") for i in range(4)), return_exceptions=True)
+
+        results = asyncio.run(run())
+        rejected = [r for r in results if isinstance(r, TooManyRequestsError)]
+        assert len(rejected) == 2
+        stats = guard.stats()
+        assert stats["shed_concurrency"] == 2
+        assert stats["in_flight"] == 0
+        assert stats["concurrency_limit"] == 1
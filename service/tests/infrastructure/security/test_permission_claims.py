@@ -0,0 +1,194 @@
+"""
+访问令牌权限声明测试
+"""
+import asyncio
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from app.domain.models import Role, Menu, User
+from app.infrastructure.auth.permission_claims import (
+    MemoryPermissionVersionBackend, PermissionVersionRegistry, SQLitePermissionVersionBackend, build_permission_claims,
+    decode_permissions, encode_permissions, permission_versions, principal_from_claims,
+    resolve_principal
+)
+
+
+def make_role(code: str, paths):
+    """创建带菜单的测试角色"""
+    menus = [
+        Menu(id=str(i), name=path, path=path, menu_type=1, rank=0, is_active=True)
+        for i, path in enumerate(paths)
+    ]
+    return Role(id=code, name=code, code=code, description="", is_active=True, menus=menus)
+
+
+class TestPermissionDigest:
+    """权限摘要编解码测试类"""
+
+    def test_round_trip(self):
+        """测试编码后可还原"""
+        permissions = {"/system/user", "/system/role", "/monitor/online"}
+        assert decode_permissions(encode_permissions(permissions)) == permissions
+
+    def test_empty_digest(self):
+        """测试空权限集合"""
+        assert decode_permissions(encode_permissions([])) == frozenset()
+
+
+class TestPermissionVersionRegistry:
+    """权限版本登记测试类"""
+
+    def test_bump_invalidates_older_claims(self):
+        """测试版本递增后旧声明失效"""
+        registry = PermissionVersionRegistry()
+        claimed = registry.current("1")
+        assert registry.is_current("1", claimed)
+
+        registry.bump_user("1")
+        assert not registry.is_current("1", claimed)
+        assert registry.is_current("2", claimed)
+
+        registry.bump()
+        assert not registry.is_current("2", claimed)
+
+    def test_versions_shared_between_workers(self):
+        """测试共用 SQLite 存储的两个进程看到同一版本"""
+        path = str(Path(tempfile.mkdtemp(prefix="permission_versions_")) / "versions.db")
+        worker_a = PermissionVersionRegistry(SQLitePermissionVersionBackend(path), ttl=0)
+        worker_b = PermissionVersionRegistry(SQLitePermissionVersionBackend(path), ttl=0)
+        try:
+            # 先启动的进程签发的令牌在后启动的进程上同样有效
+            claimed = worker_a.current("1")
+            assert worker_b.is_current("1", claimed)
+
+            worker_a.bump()
+            assert not worker_b.is_current("1", claimed)
+            refreshed = worker_b.current("1")
+            worker_b.bump_user("1")
+            assert not worker_a.is_current("1", refreshed)
+            assert worker_a.is_current("2", refreshed)
+        finally:
+            worker_a.close()
+            worker_b.close()
+
+    def test_ttl_limits_backend_reads(self):
+        """测试 ttl 内不重复读取存储"""
+        registry = PermissionVersionRegistry(ttl=60)
+        claimed = registry.current()
+        reads = []
+        original = registry.backend.changes
+        registry.backend.changes = lambda after_seq: reads.append(after_seq) or original(after_seq)
+        assert registry.is_current("1", claimed)
+        assert reads == []
+        # 本进程的递增立即生效
+        registry.bump()
+        assert not registry.is_current("1", claimed)
+
+    def test_event_loop_access_stays_off_loop(self):
+        """测试在事件循环中读取与递增版本时，后端访问都在线程池中执行"""
+        class RecordingBackend(MemoryPermissionVersionBackend):
+            def __init__(self):
+                super().__init__()
+                self.threads = []
+
+            def changes(self, after_seq):
+                self.threads.append(threading.get_ident())
+                return super().changes(after_seq)
+
+            def bump(self, scope):
+                self.threads.append(threading.get_ident())
+                return super().bump(scope)
+
+        backend = RecordingBackend()
+        registry = PermissionVersionRegistry(backend, ttl=0)
+        claimed = registry.current("1")
+        backend.threads.clear()
+
+        async def run():
+            loop_thread = threading.get_ident()
+            registry.current("1")
+            registry.bump_user("1")
+            # 本进程的递增在后端写入完成前已生效
+            rejected = not registry.is_current("1", claimed)
+            await registry.drain()
+            for _ in range(100):
+                if not registry._refreshing:
+                    break
+                await asyncio.sleep(0.01)
+            return loop_thread, rejected
+
+        loop_thread, rejected = asyncio.run(run())
+        assert rejected
+        assert backend.threads and loop_thread not in backend.threads
+        assert "1" in {scope for scope, _, _ in backend.changes(0)}
+
+
+class TestPrincipalFromClaims:
+    """令牌声明构建主体测试类"""
+
+    def test_principal_answered_from_token(self):
+        """测试版本有效时由令牌得出主体"""
+        roles = [make_role("admin", ["/system/user"]), make_role("audit", ["/monitor/logs"])]
+        payload = {"sub": "42", "username": "admin"}
+        payload.update(build_permission_claims("42", roles))
+
+        principal = principal_from_claims(payload)
+        assert principal is not None
+        assert principal.from_token
+        assert principal.has_role("admin")
+        assert principal.has_permission("/monitor/logs")
+        assert not principal.has_permission("/system/role")
+
+    def test_stale_version_falls_back(self):
+        """测试版本过期时返回 None 以回退数据库"""
+        payload = {"sub": "43", "username": "user"}
+        payload.update(build_permission_claims("43", [make_role("user", ["/home"])]))
+        permission_versions.bump_user("43")
+
+        assert principal_from_claims(payload) is None
+
+    def test_token_without_claims(self):
+        """测试未嵌入权限声明的令牌"""
+        assert principal_from_claims({"sub": "1", "username": "a"}) is None
+
+
+class TestResolvePrincipal:
+    """认证主体解析测试类"""
+
+    def make_loader(self, user_id: str, loads: list):
+        """创建记录调用次数的用户加载函数"""
+        async def load(requested_id: str):
+            loads.append(requested_id)
+            return User(
+                id=user_id, username="editor", nickname="editor", email="editor@example.com",
+                phone="", is_active=True, roles=[make_role("editor", ["/system/role"])],
+                created_time=datetime.now(), updated_time=datetime.now()
+            )
+        return load
+
+    def test_claims_skip_loading(self):
+        """测试令牌声明有效时不加载用户"""
+        loads = []
+        payload = {"sub": "51", "username": "admin"}
+        payload.update(build_permission_claims("51", [make_role("admin", ["/system/user"])]))
+
+        principal = asyncio.run(resolve_principal(payload, self.make_loader("51", loads)))
+        assert principal.from_token and principal.has_role("admin")
+        assert loads == []
+
+    def test_fallback_cached_until_version_changes(self):
+        """测试无声明时经主体缓存加载，权限版本变化后重新加载"""
+        loads = []
+        loader = self.make_loader("52", loads)
+        payload = {"sub": "52", "username": "editor"}
+
+        first = asyncio.run(resolve_principal(payload, loader))
+        second = asyncio.run(resolve_principal(payload, loader))
+        assert not first.from_token and first.has_permission("/system/role")
+        assert second == first and loads == ["52"]
+
+        permission_versions.bump()
+        asyncio.run(resolve_principal(payload, loader))
+        assert loads == ["52", "52"]
@@ -0,0 +1,121 @@
+"""
+认证主体缓存测试
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.domain.models.user import User
+from app.infrastructure.auth.permission_claims import load_principal_user, permission_versions
+from app.infrastructure.cache.principal_cache import PrincipalCache, principal_cache
+from app.infrastructure.database.unit_of_work import UnitOfWork
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.infrastructure.persistence.sqlalchemy.models.user import UserInfo
+from app.infrastructure.persistence.sqlalchemy.repositories.user_repo_impl import SQLAlchemyUserRepository
+
+
+def make_user(user_id: str = "u1", nickname: str = "admin") -> User:
+    """构造领域用户"""
+    return User(
+        id=user_id, username=user_id, nickname=nickname, email=f"{user_id}@example.com", phone="",
+        is_active=True, created_time=datetime(2026, 1, 1), updated_time=datetime(2026, 1, 1)
+    )
+
+
+async def setup_database():
+    """创建内存数据库并写入两个用户"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(UserInfo), [
+            {"id": user_id, "username": user_id, "email": f"{user_id}@example.com", "password": "x"}
+            for user_id in ("pc-update", "pc-delete")
+        ])
+    return engine
+
+
+class TestPrincipalCache:
+    """认证主体缓存测试类"""
+
+    def test_hit_returns_copy(self):
+        """测试命中时返回快照副本，修改副本不影响缓存"""
+        cache = PrincipalCache(ttl=60)
+        cache.set("u1", make_user())
+
+        user = cache.get("u1")
+        user.nickname = "changed"
+        assert cache.get("u1").nickname == "admin"
+        assert cache.stats()["hits"] == 2
+
+    def test_entry_expires_after_ttl(self):
+        """测试条目在 ttl 秒后过期并被移除"""
+        cache = PrincipalCache(ttl=0.05)
+        cache.set("u1", make_user())
+        assert cache.get("u1") is not None
+
+        time.sleep(0.1)
+        assert cache.get("u1") is None
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["misses"] == 1
+
+    def test_stale_version_rejected(self):
+        """测试条目的权限版本早于当前版本时不再命中"""
+        cache = PrincipalCache(ttl=60)
+        cache.set("u1", make_user(), version=5)
+
+        assert cache.get("u1", version=5) is not None
+        assert cache.get("u1", version=6) is None
+        # 过期条目已移除，即使按旧版本读取也不再命中
+        assert cache.get("u1", version=5) is None
+
+    def test_bumped_version_reloads_principal(self):
+        """测试递增用户权限版本后，主体经 load_user 重新加载"""
+        loads = []
+
+        async def load_user(user_id):
+            loads.append(user_id)
+            return make_user(user_id, nickname=f"load-{len(loads)}")
+
+        async def run():
+            first = await load_principal_user("pc-stale", load_user)
+            cached = await load_principal_user("pc-stale", load_user)
+            permission_versions.bump_user("pc-stale")
+            reloaded = await load_principal_user("pc-stale", load_user)
+            return first, cached, reloaded
+
+        first, cached, reloaded = asyncio.run(run())
+        assert (first.nickname, cached.nickname, reloaded.nickname) == ("load-1", "load-1", "load-2")
+        assert loads == ["pc-stale", "pc-stale"]
+
+    def test_invalidated_on_user_update_and_delete(self):
+        """测试经仓储更新、删除用户并提交后对应的缓存条目失效，回滚时保留"""
+        async def run():
+            engine = await setup_database()
+            for user_id in ("pc-update", "pc-delete"):
+                principal_cache.set(user_id, make_user(user_id), permission_versions.current(user_id))
+
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                async with UnitOfWork(session) as uow:
+                    await SQLAlchemyUserRepository(session).update("pc-update", nickname="renamed")
+                    await uow.rollback()
+            rolled_back = principal_cache.get("pc-update", permission_versions.current("pc-update"))
+
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                async with UnitOfWork(session):
+                    repo = SQLAlchemyUserRepository(session)
+                    await repo.update("pc-update", nickname="renamed")
+                    await repo.delete("pc-delete")
+                    pending = principal_cache.get("pc-delete", permission_versions.current("pc-delete"))
+            await engine.dispose()
+            return rolled_back, pending
+
+        rolled_back, pending = asyncio.run(run())
+        assert rolled_back is not None
+        # 提交前条目仍然有效
+        assert pending is not None
+        assert principal_cache.get("pc-update") is None
+        assert principal_cache.get("pc-delete") is None
@@ -0,0 +1,134 @@
+"""
+令牌吊销存储测试
+"""
+import asyncio
+import time
+from datetime import timedelta
+
+from app.infrastructure.auth.jwt_handler import JWTHandler
+from app.infrastructure.auth.revocation import (
+    BloomFilter, MemoryRevocationBackend, SQLiteRevocationBackend, TokenRevocationStore
+)
+
+
+class TestBloomFilter:
+    """布隆过滤器测试类"""
+
+    def test_added_items_are_members(self):
+        """测试已添加元素必然命中"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(500)]
+        for item in items:
+            bloom.add(item)
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        """测试误判率在预期范围内"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestTokenRevocationStore:
+    """令牌吊销存储测试类"""
+
+    def test_revoke_and_check(self):
+        """测试吊销与判断"""
+        store = TokenRevocationStore(MemoryRevocationBackend(), capacity=100)
+        store.revoke("a", time.time() + 60)
+
+        assert store.is_revoked("a")
+        assert not store.is_revoked("b")
+
+    def test_expired_revocations_are_purged(self):
+        """测试过期吊销记录被清理"""
+        backend = MemoryRevocationBackend()
+        store = TokenRevocationStore(backend, capacity=100)
+        store.revoke("a", time.time() + 60)
+        store._revoked["a"] = time.time() - 1
+
+        assert store.purge() == 1
+        assert not store.is_revoked("a")
+
+    def test_sqlite_backend_survives_restart(self, tmp_path):
+        """测试 SQLite 后端在重启后保留吊销记录"""
+        path = str(tmp_path / "revoked.db")
+        store = TokenRevocationStore(SQLiteRevocationBackend(path))
+        store.revoke("a", time.time() + 60)
+        store.close()
+
+        restarted = TokenRevocationStore(SQLiteRevocationBackend(path))
+        assert restarted.load() == 1
+        assert restarted.is_revoked("a")
+        restarted.close()
+
+
+class TestJWTHandlerRevocation:
+    """JWT 处理器吊销集成测试类"""
+
+    def test_revoked_token_fails_verification(self):
+        """测试吊销后的令牌验证失败（包括缓存命中的情况）"""
+        handler = JWTHandler()
+        handler.revocation_store = TokenRevocationStore(MemoryRevocationBackend())
+        token = handler.create_access_token({"sub": "1"}, timedelta(minutes=5))
+
+        assert handler.verify_token(token) is not None
+        assert handler.revoke_token(token)
+        assert handler.verify_token(token) is None
+
+    def test_revocations_synced_between_workers(self, tmp_path):
+        """测试一个进程的吊销经后端同步到另一个进程"""
+        path = str(tmp_path / "revoked.db")
+        worker_a = TokenRevocationStore(SQLiteRevocationBackend(path))
+        worker_b = TokenRevocationStore(SQLiteRevocationBackend(path))
+        worker_a.load()
+        worker_b.load()
+
+        worker_a.revoke("a", time.time() + 60)
+        assert not worker_b.is_revoked("a")
+        assert worker_b.sync() == 1
+        assert worker_b.is_revoked("a")
+        # 已同步的记录不会重复读取
+        assert worker_b.sync() == 0
+        worker_a.close()
+        worker_b.close()
+
+    def test_purge_keeps_sequence_monotonic(self, tmp_path):
+        """测试清理最新的过期记录后 seq 不会被重用"""
+        path = str(tmp_path / "revoked.db")
+        backend = SQLiteRevocationBackend(path)
+        reader = TokenRevocationStore(SQLiteRevocationBackend(path))
+        backend.add("old", time.time() + 60)
+        backend.add("expiring", time.time() + 0.01)
+        reader.load()
+        time.sleep(0.02)
+        backend.purge(time.time())
+
+        backend.add("new", time.time() + 60)
+        assert reader.sync() == 1
+        assert reader.is_revoked("new")
+        backend.close()
+        reader.close()
+
+    def test_background_sync(self, tmp_path):
+        """测试后台任务定期同步"""
+        path = str(tmp_path / "revoked.db")
+        writer = SQLiteRevocationBackend(path)
+        store = TokenRevocationStore(SQLiteRevocationBackend(path))
+        store.load()
+
+        async def run():
+            await store.start(0.01)
+            writer.add("a", time.time() + 60)
+            for _ in range(100):
+                if store.is_revoked("a"):
+                    break
+                await asyncio.sleep(0.01)
+            await store.stop()
+            return store.is_revoked("a")
+
+        assert asyncio.run(run())
+        writer.close()
+        store.close()
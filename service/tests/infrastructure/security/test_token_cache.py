@@ -0,0 +1,75 @@
+"""
+已验证令牌缓存测试
+"""
+import time
+from datetime import timedelta
+
+from app.infrastructure.auth.jwt_handler import JWTHandler
+from app.infrastructure.auth.token_cache import VerifiedTokenCache
+
+
+class TestVerifiedTokenCache:
+    """令牌缓存测试类"""
+
+    def test_hit_and_miss_counters(self):
+        """测试命中与未命中计数"""
+        cache = VerifiedTokenCache(maxsize=8)
+        payload = {"sub": "1", "exp": time.time() + 60}
+
+        assert cache.get("token-a") is None
+        cache.put("token-a", payload)
+        assert cache.get("token-a") == payload
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+
+    def test_entry_expires_at_exp(self):
+        """测试条目在 exp 时刻失效"""
+        cache = VerifiedTokenCache(maxsize=8)
+        cache.put("token-a", {"sub": "1", "exp": time.time() - 1})
+
+        assert cache.get("token-a") is None
+        assert cache.stats()["expirations"] == 1
+        assert cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = VerifiedTokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_token_without_exp_not_cached(self):
+        """测试没有 exp 的令牌不缓存"""
+        cache = VerifiedTokenCache(maxsize=8)
+        cache.put("token-a", {"sub": "1"})
+        assert cache.stats()["size"] == 0
+
+
+class TestJWTHandlerCache:
+    """JWT 处理器缓存集成测试类"""
+
+    def test_repeat_verification_hits_cache(self):
+        """测试重复验证命中缓存"""
+        handler = JWTHandler()
+        token = handler.create_access_token({"sub": "1"}, timedelta(minutes=5))
+
+        first = handler.verify_token(token)
+        second = handler.verify_token(token)
+
+        assert first == second
+        assert handler.get_token_cache_stats()["hits"] == 1
+
+    def test_invalid_token_not_cached(self):
+        """测试无效令牌不进入缓存"""
+        handler = JWTHandler()
+        assert handler.verify_token("not-a-token") is None
+        assert handler.get_token_cache_stats()["size"] == 0
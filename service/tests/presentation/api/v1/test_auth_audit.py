@@ -0,0 +1,99 @@
+"""
+登录接口测试（失败审计与延后重新哈希）
+"""
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.models.user import User
+from app.presentation.api.dependencies import get_user_service
+from app.presentation.api.v1 import auth
+from shared.kernel.exceptions import TooManyRequestsError
+
+
+class StubUserService:
+    """认证总是失败的用户服务"""
+
+    async def authenticate_user(self, username, password, defer=None):
+        return None
+
+
+class RehashingUserService:
+    """认证成功且密码哈希需要更新的用户服务，记录重新哈希相对响应的执行顺序"""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def authenticate_user(self, username, password, defer=None):
+        async def rehash(user_id, plain_password):
+            self.events.append(("rehash", user_id))
+
+        defer(rehash, "1", password)
+        self.events.append(("authenticated", username))
+        now = datetime.now()
+        return User(
+            id="1", username=username, nickname=username, email=f"{username}@example.com",
+            phone="", is_active=True, created_time=now, updated_time=now
+        )
+
+
+class RejectingAdmission:
+    """拒绝所有登录尝试的准入控制"""
+
+    @asynccontextmanager
+    async def admit(self, username, ip=None):
+        raise TooManyRequestsError(retry_after=3)
+        yield
+
+
+def setup_client(monkeypatch):
+    """挂载认证路由并记录提交的审计记录"""
+    records = []
+    monkeypatch.setattr(auth.login_audit_writer, "submit", records.append)
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.dependency_overrides[get_user_service] = StubUserService
+    return TestClient(app), records
+
+
+class TestLoginAudit:
+    """登录失败审计测试类"""
+
+    def test_authentication_failure_audited(self, monkeypatch):
+        """测试用户名或密码错误时提交失败的审计记录"""
+        client, records = setup_client(monkeypatch)
+        response = client.post(
+            "/api/v1/auth/login", json={"username": "admin", "password": "wrong-password"},
+            headers={"User-Agent": "pytest"}
+        )
+
+        assert response.status_code == 401
+        assert [(r.user_id, r.username, r.status, r.agent) for r in records] == [(None, "admin", False, "pytest")]
+
+    def test_admission_rejection_audited(self, monkeypatch):
+        """测试被准入控制拒绝时提交失败的审计记录"""
+        client, records = setup_client(monkeypatch)
+        monkeypatch.setattr(auth, "login_admission", RejectingAdmission())
+        response = client.post("/api/v1/auth/login", json={"username": "admin", "password": "wrong-password"})
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "3"
+        assert [(r.username, r.status) for r in records] == [("admin", False)]
+
+
+class TestLoginRehash:
+    """登录延后重新哈希测试类"""
+
+    def test_rehash_deferred_past_handler(self, monkeypatch):
+        """测试重新哈希经后台任务在处理函数返回后执行"""
+        client, _ = setup_client(monkeypatch)
+        events = []
+        # 登录审计在处理函数末尾提交，重新哈希应排在其后
+        monkeypatch.setattr(auth.login_audit_writer, "submit", lambda record: events.append(("audit", record.user_id)))
+        client.app.dependency_overrides[get_user_service] = lambda: RehashingUserService(events)
+        response = client.post("/api/v1/auth/login", json={"username": "admin", "password": "secret-password"})
+
+        assert response.status_code == 200
+        assert events == [("authenticated", "admin"), ("audit", "1"), ("rehash", "1")]
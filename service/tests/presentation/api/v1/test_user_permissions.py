@@ -0,0 +1,148 @@
+"""
+同步用户路由测试（权限失效与游标分页）
+"""
+import sqlite3
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.domain.models.user import User
+from app.domain.role.entities.role import RoleMenu
+from app.infrastructure.auth.permission_claims import build_permission_claims, permission_versions
+from app.infrastructure.cache.principal_cache import principal_cache
+from app.infrastructure.database.database import SessionLocal, get_db
+from app.infrastructure.persistence.sqlalchemy import database as persistence_database
+from app.infrastructure.persistence.sqlalchemy.database import Base
+from app.presentation.api.dependencies import get_jwt_handler
+from app.presentation.api.v1 import users
+
+INIT_SCRIPT = Path(__file__).resolve().parents[4] / "db" / "init" / "01_create_tables_sqlite.sql"
+
+USER_SQL = (
+    "INSERT INTO system_userinfo (id, password, is_superuser, username, first_name, last_name, is_staff, "
+    "is_active, date_joined, mode_type, created_time, updated_time, nickname, gender, phone, email) "
+    "VALUES (?, 'x', 0, ?, '', '', 0, 1, '2026-01-01 00:00:00', 0, '2026-01-01 00:00:00', "
+    "'2026-01-01 00:00:00', ?, 0, '', ?)"
+)
+
+
+def setup_app():
+    """在临时数据库上挂载用户路由，同步与异步会话都指向该数据库"""
+    path = Path(tempfile.mkdtemp(prefix="user_permissions_")) / "app.db"
+    conn = sqlite3.connect(str(path))
+    conn.executescript(INIT_SCRIPT.read_text(encoding="utf-8"))
+    for user_id in ("admin", "victim"):
+        conn.execute(USER_SQL, (user_id, user_id, user_id, f"{user_id}@example.com"))
+    conn.commit()
+    conn.close()
+
+    sync_engine = create_engine(f"sqlite:///{path}", poolclass=NullPool)
+    Base.metadata.create_all(sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+    def override_db():
+        db = SessionLocal(bind=sync_engine)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_async_db():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(users.router)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[users.get_read_db] = override_db
+    app.dependency_overrides[persistence_database.get_db] = override_async_db
+    return app, sync_engine
+
+
+def token_for(user_id: str) -> str:
+    """签发携带当前权限版本声明的访问令牌"""
+    data = {"sub": user_id, "username": user_id, **build_permission_claims(user_id, [])}
+    return get_jwt_handler().create_access_token(data)
+
+
+class TestUserRoutePermissions:
+    """同步用户路由权限失效测试类"""
+
+    def test_deleted_user_principal_rejected(self):
+        """测试经同步路由删除用户后，该用户令牌中的权限声明与缓存的主体不再被接受"""
+        app, _ = setup_app()
+        client = TestClient(app)
+        admin = {"Authorization": f"Bearer {token_for('admin')}"}
+        victim = {"Authorization": f"Bearer {token_for('victim')}"}
+
+        assert client.get("/api/v1/users/victim", headers=victim).status_code == 200
+        assert client.delete("/api/v1/users/victim", headers=admin).status_code == 204
+        response = client.get("/api/v1/users/admin", headers=victim)
+        assert response.status_code == 401
+        assert client.get("/api/v1/users/admin", headers=admin).status_code == 200
+
+    def test_updated_user_cache_invalidated(self):
+        """测试经同步路由更新用户后主体缓存失效、用户权限版本递增"""
+        app, _ = setup_app()
+        client = TestClient(app)
+        admin = {"Authorization": f"Bearer {token_for('admin')}"}
+        version = permission_versions.current("victim")
+        cached = User(
+            id="victim", username="victim", nickname="victim", email="victim@example.com", phone="",
+            is_active=True, created_time=datetime(2026, 1, 1), updated_time=datetime(2026, 1, 1)
+        )
+        principal_cache.set("victim", cached, version)
+
+        response = client.put("/api/v1/users/victim", json={"nickname": "renamed"}, headers=admin)
+        assert response.status_code == 200
+        assert permission_versions.current("victim") > version
+        assert principal_cache.get("victim") is None
+
+    def test_bulk_role_menu_delete_bumps_global_version(self):
+        """测试同步会话批量删除角色菜单关联后递增全局权限版本，回滚时不递增"""
+        _, sync_engine = setup_app()
+        version = permission_versions.current()
+        db = SessionLocal(bind=sync_engine)
+        try:
+            db.query(RoleMenu).filter(RoleMenu.menu_id == "m1").delete()
+            db.rollback()
+            assert permission_versions.current() == version
+            db.query(RoleMenu).filter(RoleMenu.menu_id == "m1").delete()
+            db.commit()
+        finally:
+            db.close()
+        assert permission_versions.current() > version
+
+
+class TestUserRoutePaging:
+    """同步用户列表游标分页测试类"""
+
+    def test_cursor_pages_newest_first(self):
+        """测试游标分页按创建时间倒序返回，翻页不重复不遗漏"""
+        app, sync_engine = setup_app()
+        created = {"admin": "2026-01-01", "victim": "2026-01-01"}
+        with sync_engine.begin() as conn:
+            for day in range(1, 6):
+                user_id = f"u{day}"
+                conn.exec_driver_sql(USER_SQL, (user_id, user_id, user_id, f"{user_id}@example.com"))
+                created[user_id] = f"2026-02-0{day}"
+            # 与 SQLAlchemy 写入的 DateTime 文本格式一致
+            for user_id, day in created.items():
+                conn.execute(text("UPDATE system_userinfo SET created_time = :created WHERE id = :id"),
+                             {"created": f"{day} 00:00:00.000000", "id": user_id})
+        client = TestClient(app)
+        admin = {"Authorization": f"Bearer {token_for('admin')}"}
+
+        seen, cursor = [], ""
+        while cursor is not None:
+            data = client.get("/api/v1/users", params={"page_size": 3, "cursor": cursor}, headers=admin).json()["data"]
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+        # 后创建的用户在前，同一创建时间按 ID 倒序
+        assert seen == ["u5", "u4", "u3", "u2", "u1", "victim", "admin"]